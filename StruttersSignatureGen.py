@@ -1,55 +1,115 @@
-import base64
-import re
-import sys
-
-def sha256_to_base64(sha256_input: str) -> str:
-    """
-    Convert SHA-256 digest (hex) to Base64.
-
-    Supported input formats:
-    - Plain hex (from apksigner)
-    - Colon-separated hex (from keytool)
-    """
-
-    # Remove colons, spaces, and any non-hex characters
-    clean_hex = re.sub(r'[^0-9a-fA-F]', '', sha256_input)
-
-    if len(clean_hex) != 64:
-        raise ValueError("Invalid SHA-256 digest length (expected 64 hex characters).")
-
-    sha256_bytes = bytes.fromhex(clean_hex)
-    return base64.b64encode(sha256_bytes).decode("utf-8")
-
-
-def main():
-    if len(sys.argv) != 2:
-        print("Usage:")
-        print("  python StrutterSignatureGen.py <SHA256_DIGEST>")
-        print()
-        print("Where to get SHA-256 digest:")
-        print()
-        print("1) From APK (apksigner)")
-        print("   Command:")
-        print("     apksigner verify --print-certs <apk>")
-        print("   Take ONLY the value after:")
-        print("     'SHA-256 digest:'")
-        print()
-        print("2) From Keystore (keytool)")
-        print("   Command:")
-        print("     keytool -list -v -keystore <keystore.jks>")
-        print("   Take ONLY the value after:")
-        print("     'SHA256:'")
-        print()
-        sys.exit(1)
-
-    try:
-        base64_signature = sha256_to_base64(sys.argv[1])
-        print("Base64 Signature (SHA-256):")
-        print(base64_signature)
-    except Exception as e:
-        print("Error:", e)
-        sys.exit(1)
-
-
-if __name__ == "__main__":
-    main()
+import os
+import sys
+import json
+import getpass
+
+from strutter.signing import sha256_to_base64, scan_artifacts
+from strutter.keystore import (
+    KeystoreError, PASSWORD_ENV, is_keystore, keystore_entries, signing_digests,
+)
+
+def print_usage():
+    print("Usage:")
+    print("  python StrutterSignatureGen.py <app.apk | app.aab | keystore | folder> [...] [--json | --list]")
+    print("                                 [--password-env VAR]")
+    print("  python StrutterSignatureGen.py <SHA256_DIGEST>")
+    print()
+    print("APK/AAB files are read directly (v3/v2 APK Signing Block, else the v1")
+    print("META-INF certificate); folders are scanned for *.apk and *.aab in parallel.")
+    print("Keystores (.jks/.keystore JKS or JCEKS, .p12/.pfx PKCS#12) list every alias.")
+    print(f"The keystore password is read from ${PASSWORD_ENV} (or the variable named")
+    print("by --password-env), else prompted for. --list prints just the signing")
+    print("digests, one per line, ready for the Integrity tab's signatures box.")
+    print("Note: an AAB is signed with your upload key. With Play App Signing, the")
+    print("installed app carries Google's key; use the APK from Play Console instead.")
+    print()
+    print("Where to get SHA-256 digest:")
+    print()
+    print("1) From APK (apksigner)")
+    print("   Command:")
+    print("     apksigner verify --print-certs <apk>")
+    print("   Take ONLY the value after:")
+    print("     'SHA-256 digest:'")
+    print()
+    print("2) From Keystore (keytool)")
+    print("   Command:")
+    print("     keytool -list -v -keystore <keystore.jks>")
+    print("   Take ONLY the value after:")
+    print("     'SHA256:'")
+    print()
+
+
+def keystore_password(path, env_var):
+    password = os.environ.get(env_var)
+    if password is None and sys.stdin.isatty():
+        password = getpass.getpass(f"Password for {os.path.basename(path)}: ")
+    return password
+
+def keystore_results(path, env_var):
+    try:
+        entries = keystore_entries(path, keystore_password(path, env_var))
+    except (KeystoreError, OSError) as e:
+        return [{"path": path, "error": str(e)}]
+    if not entries:
+        return [{"path": path, "error": "Keystore has no certificate entries"}]
+    return [dict(path=path, **entry) for entry in entries]
+
+
+def main():
+    argv = sys.argv[1:]
+    env_var = PASSWORD_ENV
+    if "--password-env" in argv:
+        index = argv.index("--password-env")
+        if index + 1 >= len(argv):
+            print("Error: --password-env needs a variable name")
+            sys.exit(1)
+        env_var = argv[index + 1]
+        del argv[index:index + 2]
+    args = [a for a in argv if a not in ("--json", "--list")]
+    as_json = "--json" in argv
+    as_list = "--list" in argv
+    if not args:
+        print_usage()
+        sys.exit(1)
+
+    if len(args) == 1 and not os.path.exists(args[0]):
+        try:
+            base64_signature = sha256_to_base64(args[0])
+            print("Base64 Signature (SHA-256):")
+            print(base64_signature)
+        except Exception as e:
+            print("Error:", e)
+            sys.exit(1)
+        return
+
+    keystores = [a for a in args if os.path.isfile(a) and is_keystore(a)]
+    results = scan_artifacts([a for a in args if a not in keystores])
+    for path in keystores:
+        results.extend(keystore_results(path, env_var))
+    if as_json:
+        print(json.dumps(results, indent=2))
+    elif not results:
+        print("No .apk, .aab or keystore files found.")
+    elif as_list:
+        for result in results:
+            if "error" in result:
+                print(f"{result['path']}: {result['error']}", file=sys.stderr)
+        for digest in signing_digests(results):
+            print(digest)
+    for result in results if not (as_json or as_list) else []:
+        if "error" in result:
+            print(f"{result['path']}\n  Error: {result['error']}")
+            continue
+        if "alias" in result:
+            print(f"{result['path']}\n  Alias {result['alias']} ({result['type']}): {result['base64']}")
+            continue
+        print(f"{result['path']}\n  Base64 Signature (SHA-256, {result['scheme']}): {result['base64']}")
+        for scheme, digest in result.get("schemes", {}).items():
+            if scheme != result["scheme"]:
+                print(f"  {scheme} signer: {digest}")
+    if not results or any("error" in r for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Strutter core – headless hardening pipeline for Flutter Android apps.
+
+The GUI (``strutter_v1.py``) and the CLI (``python -m strutter``) both drive
+the functions exported here; nothing in this package imports tkinter.
+"""
+
+from .core import (
+    TOOL_NAME,
+    TOOL_VERSION,
+    CONFIG_FILE,
+    TEMPLATE_ROOT,
+    NDK_VERSION,
+    PLUGIN_KEYS,
+    GUARD_KEY,
+    plugin_name_to_class_name,
+    run_command,
+    detect_flutter_version,
+    check_flutter,
+    validate_flutter_project,
+    is_valid_strict_structure,
+    generate_plugin_identifier,
+    default_selected_plugins,
+    load_config,
+    save_config,
+    record_step,
+    create_plugins,
+    apply_plugin_template,
+    apply_selected_plugins,
+    apply_dependencies_to_pubspec,
+    check_dependencies_applied,
+    update_ndk_version,
+    run_flutter_pub_get,
+)
+from .codegen import generate_root_code, generate_frida_code, generate_integrity_code, generate_combined_code
+from .integrate import integrate_main_dart
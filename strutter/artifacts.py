@@ -0,0 +1,134 @@
+import posixpath
+
+# Device paths whose presence the file checks report, keyed like the check
+# budgets ("<plugin>.<check>"). A "*" in a name matches any directory entry
+# containing the rest of the name. The generated StrutterPaths.kt gets them
+# grouped by parent directory (see artifact_index), so at runtime every
+# directory is listed once and names are looked up in a hash set.
+ARTIFACT_PATHS = {
+    "root.rootFiles": [
+        "/sbin/su",
+        "/system/bin/su",
+        "/system/xbin/su",
+        "/data/local/xbin/su",
+        "/data/local/bin/su",
+        "/system/sd/xbin/su",
+        "/system/bin/failsafe/su",
+        "/data/local/su",
+        "/su/bin/su",
+        "/vendor/bin/su",
+        "/product/bin/su",
+        "/product/xbin/su",
+        "/product/app/Superuser.apk",
+        "/product/app/SuperSU.apk",
+        "/product/app/Magisk.apk",
+        "/product/app/Kinguser.apk",
+        "/system_ext/bin/su",
+        "/system_ext/xbin/su",
+        "/data/adb/magisk",
+        "/data/adb/modules",
+        "/data/adb/magisk.db",
+        "/data/adb/magisk.img",
+        "/data/adb/magisk_merge.img",
+        "/sbin/.magisk",
+        "/debug_ramdisk/.magisk",
+        "/dev/magisk",
+        "/cache/magisk.log",
+        "/data/magisk.log",
+        "/system/app/Superuser.apk",
+        "/system/app/SuperSU.apk",
+        "/system/etc/init.d/99SuperSUDaemon",
+        "/system/xbin/daemonsu",
+        "/system/xbin/sugote",
+        "/system/xbin/sugote-mksh",
+        "/system/xbin/supolicy",
+        "/system/bin/.ext/.su",
+        "/system/usr/we-need-root/su-backup",
+        "/system/xbin/mu",
+        "/system/app/Kinguser.apk",
+        "/data/data-lib/libking_launcher.so",
+        "/system/bin/rt",
+        "/system/bin/ku.sud",
+        "/system/bin/.usr/.ku",
+        "/system/xbin/ku.sud",
+        "/system/usr/iku/isu",
+        "/system/app/RootExplorer.apk",
+        "/dev/com.koushikdutta.superuser.daemon/",
+        "/system/framework/XposedBridge.jar",
+        "/system/bin/app_process_xposed",
+        "/data/data/de.robv.android.xposed.installer/",
+        "/product/framework/XposedBridge.jar",
+    ],
+    "root.xposedFramework": [
+        "/data/adb/lspd",
+        "/data/adb/modules/lsposed",
+        "/system/framework/lspd.dex",
+        "/system/lib/libriru_lspd.so",
+        "/system/lib64/libriru_lspd.so",
+    ],
+    "frida.fridaFiles": [
+        "/data/local/tmp/frida-server",
+        "/data/local/tmp/frida",
+        "/data/local/tmp/re.frida.server",
+        "/data/local/tmp/frida-server-*",
+        "/sdcard/frida-server",
+        "/system/bin/frida-server",
+        "/system/xbin/frida-server",
+        "/data/frida-server",
+        "/data/local/tmp/libfrida-gadget.so",
+        "/sdcard/libfrida-gadget.so",
+        "/system/lib/libfrida-gadget.so",
+        "/system/lib64/libfrida-gadget.so",
+        "/data/local/tmp/frida-agent.js",
+        "/data/local/tmp/_frida.so",
+        "/data/local/tmp/gadget.config",
+        "/dev/frida-server",
+        "/proc/frida",
+        "/data/app/frida*",
+    ],
+    "frida.nativeLibraries": [
+        "/data/adb/lspd",
+        "/data/adb/modules/zygisk_lsposed",
+        "/data/adb/modules/riru_lsposed",
+        "/system/framework/XposedBridge.jar",
+    ],
+}
+
+
+def group_by_directory(paths):
+    """``{directory: [name, ...]}`` for absolute device paths, first-seen order.
+
+    A trailing ``/`` is ignored: ``/dev/x/`` is the entry ``x`` of ``/dev``.
+    """
+    groups = {}
+    for path in paths:
+        path = posixpath.normpath(path)
+        directory, name = posixpath.split(path)
+        if not posixpath.isabs(path) or not name:
+            raise ValueError(f"not an absolute file path: {path}")
+        names = groups.setdefault(directory, [])
+        if name not in names:
+            names.append(name)
+    return groups
+
+def artifact_index(groups=None, paths=None):
+    """Check name -> :func:`group_by_directory` of its paths.
+
+    Only the checks of ``groups`` (``<plugin>.`` prefixes such as ``"root"``)
+    when given.
+    """
+    paths = ARTIFACT_PATHS if paths is None else paths
+    return {check: group_by_directory(check_paths) for check, check_paths in paths.items()
+            if groups is None or check.split(".", 1)[0] in groups}
+
+def _kotlin_string(value):
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"').replace("$", "\\$") + '"'
+
+def kotlin_index(index, indent="        "):
+    """``index`` as Kotlin ``mapOf()`` arguments, one check per line."""
+    entries = []
+    for check, groups in index.items():
+        dirs = ", ".join(f"{_kotlin_string(d)} to setOf({', '.join(_kotlin_string(n) for n in names)})"
+                         for d, names in groups.items())
+        entries.append(f"{_kotlin_string(check)} to mapOf({dirs})")
+    return (",\n" + indent).join(entries)
@@ -0,0 +1,62 @@
+# Minimal DER reader shared by the APK signature and keystore parsers.
+SEQUENCE = 0x30
+SET = 0x31
+INTEGER = 0x02
+OCTET_STRING = 0x04
+OID = 0x06
+BMP_STRING = 0x1E
+CONTEXT_0 = 0xA0
+
+
+class DERError(ValueError):
+    pass
+
+
+def element(buf, offset):
+    """Return ``(tag, content_start, content_end)`` of the element at ``offset``."""
+    if offset + 2 > len(buf):
+        raise DERError("Truncated DER element")
+    tag = buf[offset]
+    length = buf[offset + 1]
+    offset += 2
+    if length == 0x80:
+        raise DERError("Indefinite-length (BER) encoding is not supported")
+    if length & 0x80:
+        count = length & 0x7F
+        length = int.from_bytes(buf[offset:offset + count], "big")
+        offset += count
+    if offset + length > len(buf):
+        raise DERError("Truncated DER element")
+    return tag, offset, offset + length
+
+def children(buf, start, end):
+    """``[(tag, start, content_start, content_end), ...]`` of the elements in a range."""
+    items = []
+    while start < end:
+        tag, content_start, content_end = element(buf, start)
+        items.append((tag, start, content_start, content_end))
+        start = content_end
+    return items
+
+def content(buf, item):
+    return bytes(buf[item[2]:item[3]])
+
+def encoded(buf, item):
+    """The full DER encoding (header included) of a child item."""
+    return bytes(buf[item[1]:item[3]])
+
+def decode_oid(data):
+    values = []
+    value = 0
+    for byte in data:
+        value = (value << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            values.append(value)
+            value = 0
+    if not values:
+        raise DERError("Empty OID")
+    first = min(values[0] // 40, 2)
+    return ".".join(str(v) for v in [first, values[0] - 40 * first] + values[1:])
+
+def decode_int(data):
+    return int.from_bytes(data, "big", signed=True)
@@ -0,0 +1,330 @@
+import os
+import sys
+import time
+import shutil
+import platform
+import subprocess
+import statistics
+import tempfile
+from contextlib import contextmanager
+
+from . import core
+from . import runner
+from . import templates
+from .bundle import build_bundle
+from .fileio import FileWriter
+
+# Stand-in for the Flutter CLI: answers `--version --machine`, `create` and
+# `pub get` the way the pipeline needs, instantly and without network.
+FAKE_FLUTTER = r'''#!{python}
+import os, sys, json, time
+args = sys.argv[1:]
+time.sleep({delay})
+if args[:1] == ["--version"]:
+    if "--machine" in args:
+        print(json.dumps({{"frameworkVersion": "{version}", "channel": "stable", "frameworkRevision": "bench",
+                          "engineRevision": "bench", "dartSdkVersion": "3.8.1", "flutterRoot": {root!r}}}))
+    else:
+        print("Flutter {version} • channel stable\nTools • Dart 3.8.1")
+    sys.exit(0)
+if args[:1] == ["create"]:
+    name = args[-1]
+    base = os.path.basename(name)
+    cls = "".join(p[:1].upper() + p[1:] for p in base.split("_"))
+    kotlin = os.path.join(name, "android", "src", "main", "kotlin", "com", "example", base)
+    os.makedirs(kotlin)
+    os.makedirs(os.path.join(name, "lib"))
+    with open(os.path.join(kotlin, cls + ".kt"), "w") as f:
+        f.write("package com.example.%s\n" % base)
+    with open(os.path.join(name, "lib", base + ".dart"), "w") as f:
+        f.write("class %s {{}}\n" % cls)
+    with open(os.path.join(name, "pubspec.yaml"), "w") as f:
+        f.write("name: %s\n" % base)
+    with open(os.path.join(name, "android", "build.gradle"), "w") as f:
+        f.write("android {{\n}}\n")
+    with open(os.path.join(name, "android", "src", "main", "AndroidManifest.xml"), "w") as f:
+        f.write("<manifest/>\n")
+    sys.exit(0)
+if args[:2] == ["pub", "get"]:
+    with open("pubspec.lock", "w") as f:
+        f.write("packages: {{}}\n")
+    os.makedirs(".dart_tool", exist_ok=True)
+    with open(os.path.join(".dart_tool", "package_config.json"), "w") as f:
+        f.write("{{}}\n")
+    print("Got dependencies!")
+    sys.exit(0)
+sys.exit(64)
+'''
+FAKE_FLUTTER_VERSION = "3.32.8"
+
+# projects: how many apps; dependencies: pubspec entries per app;
+# gradle_blocks: filler blocks in each app's build.gradle.kts.
+SCENARIOS = {
+    "small": {"projects": 1, "dependencies": 10, "gradle_blocks": 10},
+    "large-files": {"projects": 1, "dependencies": 2000, "gradle_blocks": 5000},
+    "many-projects": {"projects": 40, "dependencies": 20, "gradle_blocks": 20},
+    # Fresh interpreters, timed from outside: what the GUI pays before its
+    # window shows, and the first template render from the folder vs bundle.
+    "startup": {"startup": True},
+}
+DEFAULT_REPEAT = 3
+DEFAULT_THRESHOLD = 0.25
+
+MAIN_DART = """import 'package:flutter/material.dart';
+
+void main() => runApp(const MaterialApp(home: HomePage()));
+
+class HomePage extends StatefulWidget {
+  const HomePage({super.key});
+
+  @override
+  State<HomePage> createState() => _HomePageState();
+}
+
+class _HomePageState extends State<HomePage> {
+  @override
+  Widget build(BuildContext context) => const Placeholder();
+}
+"""
+
+
+# === FIXTURES ===
+def install_fake_flutter(bin_dir, delay=0.0):
+    """Write the fake ``flutter`` into ``bin_dir``; returns its path."""
+    os.makedirs(bin_dir, exist_ok=True)
+    path = os.path.join(bin_dir, "flutter")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FAKE_FLUTTER.format(python=sys.executable, delay=float(delay), version=FAKE_FLUTTER_VERSION,
+                                    root=os.path.dirname(bin_dir)))
+    os.chmod(path, 0o755)
+    return path
+
+def make_project(path, name, dependencies=10, gradle_blocks=10):
+    """Create a synthetic Flutter app: pubspec, Kotlin DSL build script and main.dart."""
+    os.makedirs(os.path.join(path, "lib"), exist_ok=True)
+    os.makedirs(os.path.join(path, "android", "app"), exist_ok=True)
+    deps = "".join(f"  # dependency {i}\n  package_{i}: ^{i % 9}.{i % 7}.0\n" for i in range(dependencies))
+    with open(os.path.join(path, "pubspec.yaml"), "w", encoding="utf-8") as f:
+        f.write(f"name: {name}\ndescription: Benchmark app.\nversion: 1.0.0+1\n\n"
+                f"environment:\n  sdk: ^3.8.0\n\ndependencies:\n  flutter:\n    sdk: flutter\n{deps}\n"
+                f"dev_dependencies:\n  flutter_test:\n    sdk: flutter\n\nflutter:\n  uses-material-design: true\n")
+    filler = "".join(
+        f'    create("flavor{i}") {{\n        dimension = "env"\n        // "{{" in a comment\n'
+        f'        applicationIdSuffix = ".f{i}"\n    }}\n'
+        for i in range(gradle_blocks)
+    )
+    with open(os.path.join(path, "android", "app", "build.gradle.kts"), "w", encoding="utf-8") as f:
+        f.write('plugins {\n    id("com.android.application")\n    id("dev.flutter.flutter-gradle-plugin")\n}\n\n'
+                f'android {{\n    namespace = "com.example.{name}"\n    compileSdk = flutter.compileSdkVersion\n'
+                f'    flavorDimensions += "env"\n    productFlavors {{\n{filler}    }}\n}}\n\nflutter {{\n    source = "../.."\n}}\n')
+    with open(os.path.join(path, "lib", "main.dart"), "w", encoding="utf-8") as f:
+        f.write(MAIN_DART)
+    return path
+
+@contextmanager
+def hermetic_env(work_dir, delay=0.0):
+    """Fake flutter first on PATH, scaffold cache and CWD inside ``work_dir``."""
+    bin_dir = os.path.join(work_dir, "flutter", "bin")
+    install_fake_flutter(bin_dir, delay)
+    saved = {key: os.environ.get(key) for key in ("PATH", "STRUTTER_CACHE_DIR")}
+    cwd = os.getcwd()
+    os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
+    os.environ["STRUTTER_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    os.chdir(work_dir)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+# === MEASUREMENT ===
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+def _check(step, result):
+    ok = result[0] if isinstance(result, tuple) else result
+    if not ok:
+        raise RuntimeError(f"{step} failed: {result}")
+
+def _run_once(root, params, log):
+    """One measured pass over a fresh scenario tree; ``{step: seconds}``."""
+    plugins_dir = os.path.join(root, "STRUTTER")
+    os.makedirs(plugins_dir)
+    projects = [make_project(os.path.join(root, f"app{i}"), f"app{i}", params["dependencies"], params["gradle_blocks"])
+                for i in range(params["projects"])]
+    config_path = os.path.join(plugins_dir, core.CONFIG_FILE)
+    selected = core.default_selected_plugins()
+    timings = {}
+    shutil.rmtree(os.environ["STRUTTER_CACHE_DIR"], ignore_errors=True)
+
+    def create(flutter_version):
+        success, config, errors = core.create_plugins(selected, lambda m: None, config_path=config_path,
+                                                      base_dir=plugins_dir, flutter_version=flutter_version)
+        _check("create_plugins", (success, errors))
+        return config
+
+    # Without the scaffold cache, with an empty cache, then with a warm one.
+    # Every call generates new identifiers, so the previous plugins go first.
+    config = None
+    for step, version in (("create_plugins", None), ("create_plugins_cold_cache", FAKE_FLUTTER_VERSION),
+                          ("create_plugins_cached", FAKE_FLUTTER_VERSION)):
+        for name in core.plugin_names(config):
+            shutil.rmtree(os.path.join(plugins_dir, name))
+        timings[step], config = _timed(lambda: create(version))
+
+    def apply_templates():
+        for plugin_type in core.PLUGIN_KEYS:
+            _check("apply_plugin_template", core.apply_plugin_template(
+                config, plugin_type, has_manifest=(plugin_type != "integrity"), writer=FileWriter()))
+    timings["apply_plugin_template"], _ = _timed(apply_templates)
+
+    per_project = [
+        ("apply_dependencies_to_pubspec", lambda cfg: core.apply_dependencies_to_pubspec(cfg, writer=FileWriter())),
+        ("update_ndk_version", lambda cfg: core.update_ndk_version(cfg, writer=FileWriter())),
+        ("run_flutter_pub_get", lambda cfg: core.run_flutter_pub_get(cfg)),
+    ]
+    for step, func in per_project:
+        def all_projects():
+            for project in projects:
+                _check(step, func(dict(config, flutter_project=project)))
+        timings[step], _ = _timed(all_projects)
+
+    # End to end on untouched copies, then a rerun that should change nothing.
+    fresh = [make_project(os.path.join(root, f"e2e{i}"), f"e2e{i}", params["dependencies"], params["gradle_blocks"])
+             for i in range(params["projects"])]
+    from .cli import run_pipeline
+    def pipeline():
+        result = run_pipeline(fresh, selected, config_path=config_path, skip_create=True)
+        _check("pipeline", (result["ok"], [p["steps"] for p in result["projects"] if not p["ok"]]))
+    timings["pipeline"], _ = _timed(pipeline)
+    timings["pipeline_rerun"], _ = _timed(pipeline)
+    log(" ".join(f"{step}={seconds * 1000:.1f}ms" for step, seconds in timings.items()) + "\n")
+    return timings
+
+# Each snippet runs in a new interpreter; `interpreter` is the baseline to
+# subtract. {bundle} is replaced with the bundle path.
+STARTUP_SNIPPETS = {
+    "interpreter": "pass",
+    "import_gui_modules": "from strutter import core, codegen, templates, toolchain, integrate, trace",
+    "import_tkinter": "import tkinter; from tkinter import messagebox, scrolledtext, ttk",
+    "check_templates_folder": "from strutter import templates; assert templates.check_templates()[0]",
+    "check_templates_bundle": (
+        "from strutter import templates; templates.TEMPLATE_ROOT = ''; templates.BUNDLE_PATHS = [{bundle!r}]; "
+        "assert templates.check_templates()[0]"
+    ),
+    "first_render_folder": (
+        "from strutter import templates; "
+        "assert all(templates.render_plugin_templates(k, 'bench_plugin', k != 'integrity')[0] for k in templates.PLUGIN_TYPES)"
+    ),
+    "first_render_bundle": (
+        "from strutter import templates; templates.TEMPLATE_ROOT = ''; templates.BUNDLE_PATHS = [{bundle!r}]; "
+        "assert all(templates.render_plugin_templates(k, 'bench_plugin', k != 'integrity')[0] for k in templates.PLUGIN_TYPES)"
+    ),
+}
+
+def _startup_once(root, params, log):
+    """Time each :data:`STARTUP_SNIPPETS` entry in a fresh interpreter."""
+    os.makedirs(root)
+    bundle_path = os.path.join(root, "strutter_templates.bundle")
+    build_bundle(templates.TEMPLATE_ROOT, bundle_path)
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    timings = {}
+    for step, snippet in STARTUP_SNIPPETS.items():
+        argv = [sys.executable, "-c", snippet.format(bundle=bundle_path)]
+        start = time.perf_counter()
+        proc = subprocess.run(argv, cwd=root, env=env, capture_output=True, text=True)
+        seconds = time.perf_counter() - start
+        if proc.returncode != 0:
+            if step == "import_tkinter":
+                continue  # headless Python without Tk
+            raise RuntimeError(f"{step} failed: {proc.stderr.strip()}")
+        timings[step] = seconds
+    log(" ".join(f"{step}={seconds * 1000:.1f}ms" for step, seconds in timings.items()) + "\n")
+    return timings
+
+def _summary(runs):
+    return {
+        "runs": [round(r, 6) for r in runs],
+        "min": round(min(runs), 6),
+        "median": round(statistics.median(runs), 6),
+        "mean": round(statistics.mean(runs), 6),
+    }
+
+def run_benchmarks(scenarios=None, repeat=DEFAULT_REPEAT, flutter_delay=0.0, work_dir=None, log_callback=None):
+    """Time every pipeline step for each scenario; returns a JSON-serialisable dict.
+
+    Everything happens in a temporary directory with the fake ``flutter``
+    first on PATH, so no SDK, network or existing state is touched. Each
+    repeat builds its projects from scratch.
+    """
+    log = log_callback or (lambda m: None)
+    names = scenarios or list(SCENARIOS)
+    result = {
+        "tool": f"{core.TOOL_NAME} v{core.TOOL_VERSION}",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "flutter_delay": flutter_delay,
+        "scenarios": {},
+    }
+    own_dir = work_dir is None
+    work_dir = os.path.abspath(work_dir or tempfile.mkdtemp(prefix="strutter-bench-"))
+    try:
+        with hermetic_env(work_dir, flutter_delay):
+            for name in names:
+                params = SCENARIOS[name]
+                runs = {}
+                for i in range(repeat):
+                    log(f"[{name} {i + 1}/{repeat}] ")
+                    root = os.path.join(work_dir, name, str(i))
+                    measure = _startup_once if params.get("startup") else _run_once
+                    for step, seconds in measure(root, params, log).items():
+                        runs.setdefault(step, []).append(seconds)
+                    shutil.rmtree(root, ignore_errors=True)
+                result["scenarios"][name] = {
+                    "params": params,
+                    "steps": {step: _summary(values) for step, values in runs.items()},
+                }
+    finally:
+        runner.clear_which_cache()
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+    return result
+
+# === COMPARISON ===
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Rows ``(scenario, step, old, new, ratio, regressed)`` on median times."""
+    rows = []
+    for scenario, data in current["scenarios"].items():
+        old_steps = baseline.get("scenarios", {}).get(scenario, {}).get("steps", {})
+        for step, stats in data["steps"].items():
+            if step not in old_steps:
+                continue
+            old, new = old_steps[step]["median"], stats["median"]
+            ratio = new / old if old else float("inf")
+            rows.append((scenario, step, old, new, ratio, ratio > 1 + threshold))
+    return rows
+
+def format_results(result, comparison=None):
+    """Plain-text table of median step times (and ratios against a baseline)."""
+    ratios = {(row[0], row[1]): row for row in comparison or []}
+    header = ["scenario", "step", "median ms", "min ms"] + (["baseline ms", "ratio"] if comparison is not None else [])
+    rows = []
+    for scenario, data in result["scenarios"].items():
+        for step, stats in data["steps"].items():
+            row = [scenario, step, f"{stats['median'] * 1000:.1f}", f"{stats['min'] * 1000:.1f}"]
+            if comparison is not None:
+                match = ratios.get((scenario, step))
+                row += [f"{match[2] * 1000:.1f}", f"{match[4]:.2f}x" + (" REGRESSED" if match[5] else "")] if match else ["-", "-"]
+            rows.append(row)
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    fmt = lambda row: "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+    return "\n".join([fmt(header), fmt(["-" * w for w in widths])] + [fmt(row) for row in rows]) + "\n"
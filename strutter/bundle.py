@@ -0,0 +1,139 @@
+import os
+import json
+import mmap
+import struct
+import hashlib
+
+from .fileio import atomic_write_bytes
+
+# strutter_templates.bundle: a fixed header, a JSON index and the file
+# contents back to back. The header carries the SHA-256 of the index and the
+# index carries the SHA-256 of every file, so opening a bundle only reads and
+# checks the index; a file's pages are touched (and verified) on first use.
+BUNDLE_NAME = "strutter_templates.bundle"
+MAGIC = b"STRUTPL\x00"
+FORMAT_VERSION = 1
+HEADER = struct.Struct(">8sHI32s")  # magic, format version, index length, index SHA-256
+
+
+class BundleError(Exception):
+    pass
+
+
+def collect_tree(root):
+    """``[(name, bytes), ...]`` for every file under ``root``, in digest order.
+
+    Names use ``/`` separators. The order (sorted directories, sorted files
+    per directory, as ``os.walk`` visits them) is the one the scaffold cache
+    key has always been computed in.
+    """
+    files = []
+    for current, dirs, names in os.walk(root):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(current, name)
+            with open(path, "rb") as f:
+                files.append((os.path.relpath(path, root).replace("\\", "/"), f.read()))
+    return files
+
+def tree_digest(files):
+    digest = hashlib.sha256()
+    for name, data in files:
+        digest.update(name.encode("utf-8"))
+        digest.update(data)
+    return digest.hexdigest()
+
+def build_bundle(source_dir, output_path, tool_version=None):
+    """Pack every file under ``source_dir`` into one bundle; returns its index."""
+    files = collect_tree(source_dir)
+    if not files:
+        raise BundleError(f"No templates found in {source_dir}")
+    entries = {}
+    offset = 0
+    for name, data in files:
+        entries[name] = [offset, len(data), hashlib.sha256(data).hexdigest()]
+        offset += len(data)
+    index = {
+        "format": FORMAT_VERSION,
+        "tool_version": tool_version,
+        "digest": tree_digest(files),
+        "order": [name for name, _ in files],
+        "files": entries,
+    }
+    index_bytes = json.dumps(index, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, len(index_bytes), hashlib.sha256(index_bytes).digest())
+    atomic_write_bytes(output_path, b"".join([header, index_bytes] + [data for _, data in files]))
+    return index
+
+
+class TemplateBundle:
+    """Read-only, memory-mapped view of a template bundle.
+
+    Only the header and index are read when the bundle is opened; each file
+    is checked against its SHA-256 the first time it is read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Empty files (and some filesystems) cannot be mapped.
+                self._data = f.read()
+        self._verified = set()
+        if len(self._data) < HEADER.size:
+            raise BundleError(f"{os.path.basename(path)}: not a template bundle")
+        magic, version, index_size, index_hash = HEADER.unpack_from(self._data, 0)
+        if magic != MAGIC:
+            raise BundleError(f"{os.path.basename(path)}: not a template bundle")
+        if version != FORMAT_VERSION:
+            raise BundleError(f"{os.path.basename(path)}: unsupported bundle format {version}")
+        index_bytes = bytes(self._data[HEADER.size:HEADER.size + index_size])
+        if hashlib.sha256(index_bytes).digest() != index_hash:
+            raise BundleError(f"{os.path.basename(path)}: index is corrupt")
+        self.index = json.loads(index_bytes)
+        self._base = HEADER.size + index_size
+        self._files = self.index["files"]
+
+    @property
+    def digest(self):
+        """Digest of the packed tree, equal to hashing the source folder."""
+        return self.index["digest"]
+
+    def names(self):
+        return list(self.index["order"])
+
+    def __contains__(self, name):
+        return name in self._files
+
+    def entry_hash(self, name):
+        if name not in self._files:
+            raise BundleError(f"{name} is not in {os.path.basename(self.path)}")
+        return self._files[name][2]
+
+    def read(self, name):
+        """Contents of ``name``, verified against the index."""
+        if name not in self._files:
+            raise BundleError(f"{name} is not in {os.path.basename(self.path)}")
+        offset, size, digest = self._files[name]
+        start = self._base + offset
+        if start + size > len(self._data):
+            raise BundleError(f"{os.path.basename(self.path)}: truncated at {name}")
+        data = bytes(self._data[start:start + size])
+        if name not in self._verified:
+            if hashlib.sha256(data).hexdigest() != digest:
+                raise BundleError(f"{os.path.basename(self.path)}: {name} is corrupt")
+            self._verified.add(name)
+        return data
+
+    def verify(self):
+        """Read every file once; raises :class:`BundleError` on the first bad one."""
+        files = [(name, self.read(name)) for name in self.index["order"]]
+        if len(files) != len(self._files) or tree_digest(files) != self.digest:
+            raise BundleError(f"{os.path.basename(self.path)}: digest mismatch")
+        return len(files)
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
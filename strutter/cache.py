@@ -0,0 +1,193 @@
+import os
+import sys
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+
+from .templates import plugin_name_to_class_name, templates_digest
+
+# flutter create output only depends on the Flutter version and the plugin
+# name, so the cache stores one scaffold per version under a canonical name
+# and renames it on copy. The canonical name has no inner underscores so that
+# Flutter's camel-casing and plugin_name_to_class_name agree.
+CANONICAL_NAME = "strutterscaffold_plugin"
+CANONICAL_CLASS = plugin_name_to_class_name(CANONICAL_NAME)
+CREATE_ARGS = ["--template=plugin", "--platforms=android", "--no-pub"]
+META_FILE = ".strutter_cache.json"
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+# Files that later steps rewrite in place; these are always copied, never
+# hardlinked, so an edit cannot leak back into the cache.
+MUTABLE_FILES = ("AndroidManifest.xml", "pubspec.yaml", "build.gradle", "build.gradle.kts")
+MUTABLE_SUFFIXES = (".kt", ".dart")
+
+
+def default_cache_dir():
+    if os.environ.get("STRUTTER_CACHE_DIR"):
+        return os.environ["STRUTTER_CACHE_DIR"]
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "strutter", "scaffolds")
+
+def cache_key(flutter_version):
+    seed = f"{flutter_version}\0{' '.join(CREATE_ARGS)}\0{CANONICAL_NAME}\0{templates_digest()}"
+    return hashlib.sha256(seed.encode("utf-8")).hexdigest()[:32]
+
+def _tree_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def _read_meta(entry_path):
+    try:
+        with open(os.path.join(entry_path, META_FILE), "r") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+def _write_meta(entry_path, meta):
+    tmp = os.path.join(entry_path, META_FILE + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(entry_path, META_FILE))
+
+def list_entries(cache_dir=None):
+    """Return cache entries as dicts, most recently used first."""
+    cache_dir = cache_dir or default_cache_dir()
+    entries = []
+    if not os.path.isdir(cache_dir):
+        return entries
+    for key in os.listdir(cache_dir):
+        entry_path = os.path.join(cache_dir, key)
+        meta = _read_meta(entry_path) if os.path.isdir(entry_path) else None
+        if meta:
+            meta["path"] = entry_path
+            entries.append(meta)
+    entries.sort(key=lambda m: m.get("last_used", 0), reverse=True)
+    return entries
+
+def prune(cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Evict least recently used entries until the cache fits in ``max_bytes``.
+
+    Incomplete entries (no metadata, e.g. left by a crashed run) are removed
+    as well. Returns the list of removed paths.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    removed = []
+    if not os.path.isdir(cache_dir):
+        return removed
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        if os.path.isdir(path) and _read_meta(path) is None:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    entries = list_entries(cache_dir)
+    total = sum(e.get("size", 0) for e in entries)
+    while entries and total > max_bytes:
+        victim = entries.pop()
+        shutil.rmtree(victim["path"], ignore_errors=True)
+        total -= victim.get("size", 0)
+        removed.append(victim["path"])
+    return removed
+
+def ensure_scaffold(flutter_version, run_command, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+    """Return the path of the cached canonical scaffold, creating it if needed.
+
+    On a miss, ``flutter create`` runs once in a temporary directory inside
+    the cache and the result is renamed into place, so parallel CI jobs never
+    see a half-written entry. Returns ``(path, None)`` or ``(None, error)``.
+    """
+    cache_dir = cache_dir or default_cache_dir()
+    key = cache_key(flutter_version)
+    entry_path = os.path.join(cache_dir, key)
+    meta = _read_meta(entry_path)
+    if meta:
+        meta["last_used"] = time.time()
+        try:
+            _write_meta(entry_path, meta)
+        except OSError:
+            pass
+        return entry_path, None
+    os.makedirs(cache_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        out, err, code = run_command(["flutter", "create"] + CREATE_ARGS + [CANONICAL_NAME], cwd=staging)
+        if code != 0:
+            return None, err or out or f"exit code {code}"
+        scaffold = os.path.join(staging, CANONICAL_NAME)
+        now = time.time()
+        _write_meta(scaffold, {
+            "key": key,
+            "flutter_version": flutter_version,
+            "created": now,
+            "last_used": now,
+            "size": _tree_size(scaffold)
+        })
+        try:
+            os.rename(scaffold, entry_path)
+        except OSError:
+            # Another process populated the same key first; use theirs.
+            if _read_meta(entry_path) is None:
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    prune(cache_dir, max_bytes)
+    return entry_path, None
+
+def _is_mutable(name):
+    return name in MUTABLE_FILES or name.endswith(MUTABLE_SUFFIXES)
+
+def copy_scaffold(entry_path, plugin_name, dest_dir, hardlink=True):
+    """Materialize a cached scaffold as ``dest_dir/plugin_name``.
+
+    Paths and text contents are rewritten from the canonical package/class
+    names to the plugin's own. Files that need no rewrite are hardlinked when
+    possible (unless later steps edit them), otherwise copied.
+    """
+    new_class = plugin_name_to_class_name(plugin_name)
+    target_root = os.path.join(dest_dir, plugin_name)
+
+    def rename(part):
+        return part.replace(CANONICAL_NAME, plugin_name).replace(CANONICAL_CLASS, new_class)
+
+    for root, _, files in os.walk(entry_path):
+        rel_root = os.path.relpath(root, entry_path)
+        out_root = target_root if rel_root == "." else os.path.join(target_root, rename(rel_root))
+        os.makedirs(out_root, exist_ok=True)
+        for name in files:
+            if name == META_FILE:
+                continue
+            src = os.path.join(root, name)
+            dst = os.path.join(out_root, rename(name))
+            if os.path.lexists(dst):
+                # Never write through a link left by an earlier copy.
+                os.remove(dst)
+            with open(src, "rb") as f:
+                data = f.read()
+            canonical = (CANONICAL_NAME.encode("utf-8"), CANONICAL_CLASS.encode("utf-8"))
+            if any(token in data for token in canonical):
+                try:
+                    text = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    text = None
+                if text is not None:
+                    with open(dst, "w", encoding="utf-8", newline="") as f:
+                        f.write(rename(text))
+                    continue
+            if hardlink and not _is_mutable(name):
+                try:
+                    os.link(src, dst)
+                    continue
+                except OSError:
+                    pass
+            shutil.copy2(src, dst)
+    return target_root
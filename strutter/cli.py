@@ -0,0 +1,476 @@
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import core
+from . import integrate
+from . import bench as bench_module
+from . import bundle as template_bundle
+from . import cache as scaffold_cache
+from . import runner
+from . import state
+from . import templates
+from . import toolchain
+from . import trace
+from . import workspace
+from .fileio import FileWriter
+
+
+def _step(ok, msg):
+    return {"ok": bool(ok), "message": msg}
+
+def run_pipeline(projects, selected_plugins, config_path=core.CONFIG_FILE, skip_create=False,
+                 skip_pub_get=False, strict_structure=False, log_callback=None,
+                 jobs=core.MAX_CREATE_WORKERS, offline=False, use_cache=True, dry_run=False,
+                 force_pub_get=False, guard_modes=None, signatures=(), identity=None, check_budgets=None,
+                 combine=False, pub_get_timeout=None):
+    """Run steps 1–5 for every project and return a JSON-serialisable result.
+
+    ``dry_run`` reuses the existing plugins, writes nothing and reports a
+    unified diff per project instead. ``flutter pub get`` only runs when the
+    project's package config is stale, unless ``force_pub_get`` is set.
+    With ``guard_modes`` (plugin type -> exit/popup/log) the guards are also
+    inserted into each project's lib/main.dart. ``identity`` selects
+    deterministic plugin identifiers (see :func:`core.create_plugins`).
+    ``check_budgets`` (check name or "default" -> ms) is merged into the
+    config's detection check budgets before the templates are applied.
+    ``combine`` generates one combined guard plugin instead of one plugin
+    per type. ``pub_get_timeout`` (seconds) overrides the runner's policy
+    for ``flutter pub get``.
+    """
+    if dry_run:
+        skip_create = skip_pub_get = True
+    log = log_callback or (lambda m: None)
+    result = {"tool": f"{core.TOOL_NAME} v{core.TOOL_VERSION}", "ok": False, "plugins": {},
+              "steps": {}, "projects": [], "commands": []}
+    def record(command):
+        result["commands"].append(command.to_dict())
+
+    runner.add_listener(record)
+    try:
+        with trace.span("pipeline", projects=len(projects)) as span_args:
+            _run_steps(result, projects, selected_plugins, config_path, skip_create, skip_pub_get,
+                       strict_structure, log, jobs, offline, use_cache, dry_run, force_pub_get,
+                       guard_modes, signatures, identity, check_budgets, combine, pub_get_timeout)
+            span_args["ok"] = result["ok"]
+    finally:
+        runner.remove_listener(record)
+    return result
+
+def _run_steps(result, projects, selected_plugins, config_path, skip_create, skip_pub_get,
+               strict_structure, log, jobs, offline, use_cache, dry_run, force_pub_get,
+               guard_modes, signatures, identity, check_budgets, combine, pub_get_timeout):
+    # Step 1: generate plugins (once for the whole batch)
+    if skip_create:
+        config = core.load_config(config_path)
+        if not config or not config.get("plugins"):
+            result["steps"]["create"] = _step(False, f"No usable config at {config_path}. Run without --skip-create first.")
+            return
+        result["steps"]["create"] = _step(True, "Skipped; reusing existing plugins.")
+    else:
+        flutter_version = None
+        if not offline:
+            try:
+                with trace.span("flutter"):
+                    info = toolchain.probe()
+            except toolchain.ToolchainError as e:
+                log(f"{str(e)}\n")
+                result["steps"]["flutter"] = _step(False, str(e))
+                return
+            result["toolchain"] = info
+            msg = core.describe_toolchain(info)
+            log(msg + "\n")
+            result["steps"]["flutter"] = _step(True, msg)
+            if use_cache:
+                flutter_version = info["version"]
+        with trace.span("create") as span_args:
+            success, config, errors = core.create_plugins(selected_plugins, log, config_path=config_path,
+                                                          max_workers=jobs, offline=offline,
+                                                          flutter_version=flutter_version, identity=identity,
+                                                          combine=combine)
+            span_args["ok"] = success
+        result["steps"]["create"] = _step(success, "Plugin generation completed." if success
+                                          else "One or more plugins failed to generate.")
+        result["steps"]["create"]["failed"] = errors
+        if not success:
+            return
+    result["plugins"] = dict(config["plugins"])
+    if check_budgets:
+        config["check_budgets"] = dict(config.get("check_budgets") or {}, **check_budgets)
+        if not dry_run:
+            core.save_config(config, config_path)
+
+    # Step 2: apply plugin templates (plugins are shared by every project)
+    writer = FileWriter(dry_run)
+    with trace.span("apply_plugins") as span_args:
+        applied, errors = core.apply_selected_plugins(config, writer=writer)
+        span_args["ok"] = not errors
+    result["steps"]["apply_plugins"] = _step(not errors and bool(applied),
+                                             "\n".join(errors) or f"Plugins applied: {', '.join(applied)}")
+    result["steps"]["apply_plugins"]["changed"] = [c["path"] for c in writer.changed()]
+    if dry_run:
+        result["steps"]["apply_plugins"]["diff"] = "".join(writer.diffs)
+    else:
+        core.record_step(config_path, None, "apply_plugins", not errors, "", writer.changes)
+    if errors or not applied:
+        return
+    log(f"✓ All selected plugins applied: {', '.join(applied)}\n")
+
+    # Steps 3–5 per project, several projects at a time. Each project's log
+    # is buffered and written out in one piece when it finishes.
+    options = (strict_structure, skip_pub_get, force_pub_get, dry_run, config_path, guard_modes, signatures,
+               pub_get_timeout)
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        futures = [pool.submit(_process_project, os.path.abspath(project), config, options)
+                   for project in projects]
+        for future in as_completed(futures):
+            log("".join(future.result()[1]))
+    result["projects"] = [future.result()[0] for future in futures]
+    result["ok"] = bool(result["projects"]) and all(entry["ok"] for entry in result["projects"])
+
+def _process_project(abs_path, config, options):
+    (strict_structure, skip_pub_get, force_pub_get, dry_run, config_path, guard_modes, signatures,
+     pub_get_timeout) = options
+    lines = [f"--- {abs_path}\n"]
+    log = lines.append
+    entry = {"project": abs_path, "ok": False, "steps": {}}
+    checks = [core.validate_flutter_project(abs_path)]
+    if strict_structure:
+        checks.append(core.is_valid_strict_structure(abs_path))
+    failed = [msg for ok, msg in checks if not ok]
+    entry["steps"]["validate"] = _step(not failed, "\n".join(failed) or "Valid Flutter project.")
+    if failed:
+        log(f"✗ {failed[0]}\n")
+        return entry, lines
+    project_config = dict(config, flutter_project=abs_path)
+    writer = FileWriter(dry_run)
+    steps = [
+        ("dependencies", lambda cfg: core.apply_dependencies_to_pubspec(cfg, writer=writer)),
+        ("ndk", lambda cfg: core.update_ndk_version(cfg, writer=writer)),
+    ]
+    if guard_modes is not None:
+        steps.append(("integrate", lambda cfg: integrate.integrate_main_dart(cfg, guard_modes, signatures, writer=writer)))
+    if not skip_pub_get:
+        steps.append(("pub_get", lambda cfg: core.run_flutter_pub_get(cfg, log_callback=log, timeout=pub_get_timeout)
+                      if force_pub_get or core.pub_get_needed(abs_path)
+                      else (True, "✓ flutter pub get: Skipped (packages up to date)")))
+    for name, func in steps:
+        written = len(writer.changes)
+        with trace.span(name, project=abs_path) as span_args:
+            ok, msg = func(project_config)
+            span_args["ok"] = ok
+        entry["steps"][name] = _step(ok, msg)
+        if not dry_run:
+            core.record_step(config_path, abs_path, name, ok, msg, writer.changes[written:])
+        log(msg + "\n" if ok else f"✗ {msg}\n")
+        if not ok:
+            break
+    else:
+        entry["ok"] = True
+    entry["changed"] = [c["path"] for c in writer.changed()]
+    if dry_run:
+        entry["diff"] = "".join(writer.diffs)
+        log(entry["diff"])
+    return entry, lines
+
+def format_table(result):
+    """Plain-text summary with one row per project and one column per step."""
+    columns = ["validate", "dependencies", "ndk", "integrate", "pub_get"]
+    marks = lambda step: "-" if step is None else ("ok" if step["ok"] else "FAIL")
+    rows = [[entry["project"]] + [marks(entry["steps"].get(c)) for c in columns] + [str(len(entry.get("changed", [])))]
+            for entry in result["projects"]]
+    header = ["project"] + columns + ["changed"]
+    widths = [max(len(row[i]) for row in rows + [header]) for i in range(len(header))]
+    fmt = lambda row: "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+    ok_count = sum(1 for entry in result["projects"] if entry["ok"])
+    lines = [fmt(header), fmt(["-" * w for w in widths])] + [fmt(row) for row in rows]
+    lines.append(f"{ok_count}/{len(result['projects'])} project(s) hardened")
+    return "\n".join(lines) + "\n"
+
+def plugin_dirs(config_path=core.CONFIG_FILE):
+    """The saved config's plugins folder, if any, for workspace scans to skip.
+
+    Plugins elsewhere still classify as plugins, and their example apps are
+    skipped by the scan itself.
+    """
+    config = core.load_config(config_path) if os.path.exists(config_path) else None
+    return [config["plugins_dir"]] if config and config.get("plugins_dir") else []
+
+def collect_projects(projects, workspaces, log, exclude=()):
+    """Explicit project folders plus every Android-capable app found in ``workspaces``.
+
+    The workspace scan skips the folders in ``exclude`` (see :func:`plugin_dirs`).
+    """
+    collected = [os.path.abspath(p) for p in projects]
+    for root in workspaces:
+        found = workspace.scan_workspace(root, exclude=exclude)
+        apps = workspace.android_apps(found)
+        log(f"Workspace {os.path.abspath(root)}: {len(found)} package(s), {len(apps)} Android app(s)\n")
+        collected.extend(apps)
+    return list(dict.fromkeys(collected))
+
+def parse_plugins(value):
+    selected = {key: False for key in core.PLUGIN_KEYS}
+    for name in value.split(","):
+        name = name.strip().lower()
+        if name not in selected:
+            raise argparse.ArgumentTypeError(f"unknown plugin '{name}' (choose from {', '.join(core.PLUGIN_KEYS)})")
+        selected[name] = True
+    return selected
+
+def parse_guard_modes(value):
+    """``exit`` for every guard, or per plugin: ``root=exit,frida=log``."""
+    modes = {}
+    for item in value.split(","):
+        plugin, _, mode = item.strip().rpartition("=")
+        if mode not in ("exit", "popup", "log"):
+            raise argparse.ArgumentTypeError(f"unknown guard mode '{mode}' (choose from exit, popup, log)")
+        if plugin and plugin not in core.PLUGIN_KEYS:
+            raise argparse.ArgumentTypeError(f"unknown plugin '{plugin}' (choose from {', '.join(core.PLUGIN_KEYS)})")
+        for key in [plugin] if plugin else core.PLUGIN_KEYS:
+            modes[key] = mode
+    return modes
+
+def resolve_identity(args, projects):
+    """``identity`` for :func:`run_pipeline` from the run options, or None."""
+    if not args.deterministic_ids:
+        return None
+    secret = core.load_identity_secret(args.id_secret_file)
+    app_id = args.app_id
+    if not app_id:
+        found = {core.application_id(project) for project in projects}
+        if len(found) != 1 or None in found:
+            raise core.IdentityError(
+                "Cannot derive one applicationId from the projects; pass --app-id "
+                "(plugins are shared by every project in a run)."
+            )
+        app_id = found.pop()
+    return {"secret": secret, "app_id": app_id, "rotation": args.rotation}
+
+def parse_check_budget(value):
+    """``MS`` for every check, or ``root.suCommand=MS`` for one."""
+    name, _, ms = value.rpartition("=")
+    try:
+        budget = {name.strip() or "default": int(ms)}
+        templates.check_budgets(budget)
+    except (ValueError, templates.TemplateError) as e:
+        raise argparse.ArgumentTypeError(f"invalid check budget '{value}': {str(e)}")
+    return budget
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="strutter",
+        description=f"{core.TOOL_NAME} v{core.TOOL_VERSION} – headless Flutter hardening pipeline"
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="generate plugins and apply them to one or more projects (steps 1–5)")
+    run.add_argument("projects", nargs="*", metavar="PROJECT", help="Flutter project folder(s)")
+    run.add_argument("--workspace", action="append", default=[], metavar="DIR",
+                     help="also harden every Android-capable Flutter app found under DIR (repeatable)")
+    run.add_argument("--plugins", type=parse_plugins, default=core.default_selected_plugins(),
+                     help="comma-separated subset of root,frida,integrity (default: all)")
+    run.add_argument("--combine", action="store_true",
+                     help="generate one guard plugin for all selected checks (one method channel, "
+                          "one batched runAll call) instead of one plugin per type")
+    run.add_argument("--config", default=core.CONFIG_FILE,
+                     help="state database, or a legacy .json config (default: %(default)s)")
+    run.add_argument("--skip-create", action="store_true", help="reuse plugins from an existing config")
+    run.add_argument("--skip-pub-get", action="store_true", help="do not run 'flutter pub get'")
+    run.add_argument("--dry-run", action="store_true",
+                     help="show what steps 2-4 would change as a diff, without writing (implies --skip-create, --skip-pub-get)")
+    run.add_argument("--force-pub-get", action="store_true",
+                     help="run 'flutter pub get' even if the package config is up to date")
+    run.add_argument("--integrate", action="store_true",
+                     help="also insert the guards into each project's lib/main.dart")
+    run.add_argument("--guard-mode", type=parse_guard_modes, default="exit",
+                     help="what a failed check does: exit, popup or log, for all guards or "
+                          "per plugin as root=exit,frida=log (default: exit)")
+    run.add_argument("--signature", action="append", default=[], metavar="BASE64",
+                     help="valid APK signature for the integrity guard (repeatable; see StruttersSignatureGen.py --list)")
+    run.add_argument("--check-budget", type=parse_check_budget, action="append", default=[], metavar="[CHECK=]MS",
+                     help="time budget of the detection checks, or of one (e.g. root.suCommand=2000); "
+                          "a check over budget is reported inconclusive (repeatable, kept in the config)")
+    run.add_argument("--deterministic-ids", action="store_true",
+                     help="derive plugin identifiers from a project secret, the app id and --rotation "
+                          "so they stay stable between runs (secret from $%s or --id-secret-file)"
+                          % core.IDENTITY_SECRET_ENV)
+    run.add_argument("--id-secret-file", metavar="FILE", help="file holding the identifier secret")
+    run.add_argument("--app-id", help="app id for --deterministic-ids (default: the projects' applicationId)")
+    run.add_argument("--rotation", type=int, default=0,
+                     help="bump to rotate deterministic identifiers (default: %(default)s)")
+    run.add_argument("--strict-structure", action="store_true",
+                     help="require each project to be a sibling of the STRUTTER folder, like the GUI")
+    run.add_argument("--offline", action="store_true",
+                     help="write plugin projects from bundled templates instead of running 'flutter create'")
+    run.add_argument("--no-cache", action="store_true",
+                     help="always run 'flutter create' instead of copying from the scaffold cache")
+    run.add_argument("--jobs", type=int, default=core.MAX_CREATE_WORKERS,
+                     help="parallel 'flutter create' runs and projects processed at once (default: %(default)s)")
+    run.add_argument("--pub-get-timeout", type=float, default=runner.TIMEOUT_POLICIES["pub"],
+                     help="seconds before 'flutter pub get' is killed (default: %(default)s)")
+    run.add_argument("--output", help="write the JSON result to this file instead of stdout")
+    run.add_argument("--trace", metavar="FILE",
+                     help="write a Chrome trace_event JSON of every step and subprocess to FILE "
+                          "(open in chrome://tracing or ui.perfetto.dev); timings also go into the result")
+    run.add_argument("--quiet", action="store_true", help="suppress progress output on stderr")
+
+    status = sub.add_parser("status", help="show plugins, projects and step status from the state database")
+    status.add_argument("--config", default=core.CONFIG_FILE, help="state database (default: %(default)s)")
+
+    probe = sub.add_parser("toolchain", help="show the Flutter SDK found on PATH (cached probe)")
+    probe.add_argument("--refresh", action="store_true", help="run 'flutter --version' again instead of using the cache")
+
+    scan = sub.add_parser("scan", help="list the Dart/Flutter packages under a folder and classify them")
+    scan.add_argument("root", metavar="DIR")
+    scan.add_argument("--apps-only", action="store_true", help="only list Android-capable Flutter apps")
+
+    bench = sub.add_parser("bench", help="time every pipeline step on synthetic projects with a fake flutter")
+    bench.add_argument("--scenario", action="append", choices=sorted(bench_module.SCENARIOS), default=None,
+                       help="scenario to run (repeatable; default: all)")
+    bench.add_argument("--repeat", type=int, default=bench_module.DEFAULT_REPEAT,
+                       help="runs per scenario (default: %(default)s)")
+    bench.add_argument("--flutter-delay", type=float, default=0.0,
+                       help="seconds the fake flutter sleeps per call, to model a real SDK (default: 0)")
+    bench.add_argument("--output", help="write the JSON results to this file")
+    bench.add_argument("--compare", metavar="BASELINE", help="compare median times against an earlier JSON result")
+    bench.add_argument("--threshold", type=float, default=bench_module.DEFAULT_THRESHOLD,
+                       help="with --compare, fail if a step is this much slower (default: %(default)s = 25%%)")
+    bench.add_argument("--keep", metavar="DIR", help="run in DIR and keep the generated projects")
+
+    pack = sub.add_parser("bundle", help="pack strutter_plugin_config/ into one verified template bundle")
+    pack.add_argument("--source", default=templates.TEMPLATE_ROOT, help="template folder (default: %(default)s)")
+    pack.add_argument("--output", default=template_bundle.BUNDLE_NAME, help="bundle file (default: %(default)s)")
+    pack.add_argument("--verify", metavar="BUNDLE", help="check every file of an existing bundle instead")
+
+    cache = sub.add_parser("cache", help="inspect or prune the flutter create scaffold cache")
+    cache.add_argument("action", choices=["list", "prune"])
+    cache.add_argument("--cache-dir", default=None, help="cache location (default: %s)" % scaffold_cache.default_cache_dir())
+    cache.add_argument("--max-mb", type=float, default=scaffold_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                       help="prune least recently used entries above this size (default: %(default)s)")
+    cache.add_argument("--all", action="store_true", help="prune every entry")
+    return parser
+
+def run_bench_command(args):
+    result = bench_module.run_benchmarks(args.scenario, args.repeat, args.flutter_delay, args.keep,
+                                         log_callback=lambda m: (sys.stderr.write(m), sys.stderr.flush()))
+    payload = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    comparison = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            comparison = bench_module.compare(json.load(f), result, args.threshold)
+    sys.stderr.write(bench_module.format_results(result, comparison))
+    if not args.output:
+        print(payload)
+    return 1 if comparison and any(row[5] for row in comparison) else 0
+
+def run_bundle_command(args):
+    try:
+        if args.verify:
+            bundle = template_bundle.TemplateBundle(args.verify)
+            count = bundle.verify()
+            info = {"path": os.path.abspath(args.verify), "files": count, "digest": bundle.digest,
+                    "tool_version": bundle.index.get("tool_version")}
+            bundle.close()
+        else:
+            index = template_bundle.build_bundle(args.source, args.output,
+                                                 f"{core.TOOL_NAME} v{core.TOOL_VERSION}")
+            info = {"path": os.path.abspath(args.output), "files": len(index["files"]),
+                    "digest": index["digest"], "bytes": os.path.getsize(args.output)}
+    except (OSError, template_bundle.BundleError) as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        return 1
+    print(json.dumps(info, indent=2))
+    return 0
+
+def run_cache_command(args):
+    if args.action == "prune":
+        max_bytes = 0 if args.all else int(args.max_mb * 1024 * 1024)
+        removed = scaffold_cache.prune(args.cache_dir, max_bytes)
+        print(json.dumps({"removed": removed}, indent=2))
+    else:
+        print(json.dumps(scaffold_cache.list_entries(args.cache_dir), indent=2))
+    return 0
+
+def run_status_command(args):
+    if args.config.endswith(".json") or not os.path.exists(args.config):
+        print(json.dumps({"config": core.load_config(args.config)}, indent=2))
+        return 0
+    store = state.open_store(args.config)
+    projects = {path: store.step_status(path) for path in store.projects()}
+    print(json.dumps({"config": store.config(), "projects": projects}, indent=2, ensure_ascii=False))
+    return 0
+
+def run_toolchain_command(args):
+    try:
+        info = toolchain.probe(refresh=args.refresh)
+    except toolchain.ToolchainError as e:
+        print(json.dumps({"error": str(e)}, indent=2))
+        return 1
+    print(json.dumps(info, indent=2))
+    return 0
+
+def run_scan_command(args):
+    found = workspace.scan_workspace(args.root, exclude=plugin_dirs())
+    if args.apps_only:
+        found = [p for p in found if p["android"]]
+    print(json.dumps(found, indent=2, ensure_ascii=False))
+    return 0
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "cache":
+        return run_cache_command(args)
+    if args.command == "bundle":
+        return run_bundle_command(args)
+    if args.command == "bench":
+        return run_bench_command(args)
+    if args.command == "scan":
+        return run_scan_command(args)
+    if args.command == "status":
+        return run_status_command(args)
+    if args.command == "toolchain":
+        return run_toolchain_command(args)
+    log = None if args.quiet else (lambda m: (sys.stderr.write(m), sys.stderr.flush()))
+    projects = collect_projects(args.projects, args.workspace, log or (lambda m: None),
+                                exclude=plugin_dirs(args.config))
+    if not projects:
+        parser.error("no projects given and no Android apps found in --workspace")
+    try:
+        identity = resolve_identity(args, projects)
+    except core.IdentityError as e:
+        parser.error(str(e))
+    tracer = trace.Tracer().start() if args.trace else None
+    try:
+        result = run_pipeline(
+            projects, args.plugins, config_path=args.config, skip_create=args.skip_create,
+            skip_pub_get=args.skip_pub_get, strict_structure=args.strict_structure, log_callback=log,
+            jobs=args.jobs, offline=args.offline, use_cache=not args.no_cache, dry_run=args.dry_run,
+            force_pub_get=args.force_pub_get, guard_modes=args.guard_mode if args.integrate else None,
+            signatures=args.signature, identity=identity,
+            check_budgets={k: v for budget in args.check_budget for k, v in budget.items()},
+            combine=args.combine, pub_get_timeout=args.pub_get_timeout
+        )
+    finally:
+        if tracer:
+            tracer.stop()
+    if tracer:
+        tracer.write_chrome_trace(args.trace)
+        result["timings"] = tracer.summary()
+    payload = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(payload + "\n")
+    else:
+        print(payload)
+    if log and result["projects"]:
+        log(format_table(result))
+    if log and tracer:
+        log(trace.format_summary(result["timings"]))
+        log(f"Trace written to {args.trace}\n")
+    return 0 if result["ok"] else 1
@@ -0,0 +1,256 @@
+from .core import GUARD_KEY, PLUGIN_KEYS, plugin_name_to_class_name
+
+# Method each guard defines and initState calls.
+GUARD_METHODS = {
+    "root": "_checkRoot",
+    "frida": "_checkFrida",
+    "integrity": "_checkIntegrity",
+    GUARD_KEY: "_checkGuard",
+}
+# exit(0) comes from dart:io.
+EXIT_MODES = ("exit", "popup")
+
+def guard_checks(config):
+    """Check types the combined guard plugin acts on: the selected ones."""
+    selected = config.get("selected_plugins") or {}
+    return [key for key in PLUGIN_KEYS if selected.get(key)]
+
+def plugin_for(config, plugin_type):
+    """Name of the plugin that provides ``plugin_type``'s check, or None.
+
+    That is its own plugin, or the combined guard plugin when it covers it.
+    """
+    plugins = (config or {}).get("plugins") or {}
+    if plugin_type in plugins:
+        return f"{plugins[plugin_type]}_plugin"
+    if GUARD_KEY in plugins and plugin_type in guard_checks(config):
+        return f"{plugins[GUARD_KEY]}_plugin"
+    return None
+
+# === INTEGRATION CODE GENERATORS ===
+def _root_action(mode):
+    if mode == "exit":
+        action = "        exit(0);"
+    elif mode == "popup":
+        action = '''        WidgetsBinding.instance.addPostFrameCallback((_) {
+          showDialog(
+            context: context,
+            barrierDismissible: false,
+            builder: (_) => AlertDialog(
+              title: Text("DEVICE ROOTED"),
+              content: Text("Device is rooted or compromised. The app will close."),
+              actions: [
+                TextButton(onPressed: () => exit(0), child: Text("OK"))
+              ],
+            ),
+          );
+        });'''
+    else:
+        action = '        print("❌ Root detected");'
+    return action
+
+def generate_root_code(config, mode="exit"):
+    plugin_name = plugin_for(config, "root")
+    if not plugin_name:
+        return "", "", ""
+    class_name = plugin_name_to_class_name(plugin_name)
+    import_code = f"import 'package:{plugin_name}/{plugin_name}.dart';"
+    action = _root_action(mode)
+    method_code = f'''Future<void> _checkRoot() async {{
+  try {{
+    final rooted = await {class_name}.isDeviceRooted;
+    if (rooted) {{
+{action}
+    }} else {{
+      print("✅ No root detected");
+    }}
+  }} catch (e) {{
+    print("⚠️ Error during root check: $e");
+  }}
+}}'''
+    init_code = '''@override
+void initState() {
+  super.initState();
+  _checkRoot();
+}'''
+    return import_code, method_code, init_code
+
+def _frida_action(mode):
+    if mode == "exit":
+        action = "        exit(0);"
+    elif mode == "popup":
+        action = '''        WidgetsBinding.instance.addPostFrameCallback((_) {
+          showDialog(
+            context: context,
+            barrierDismissible: false,
+            builder: (_) => AlertDialog(
+              title: Text("FRIDA DETECTED"),
+              content: Text("Frida or instrumentation detected. The app will close."),
+              actions: [
+                TextButton(onPressed: () => exit(0), child: Text("OK"))
+              ],
+            ),
+          );
+        });'''
+    else:
+        action = '        print("❌ FRIDA detected");'
+    return action
+
+def generate_frida_code(config, mode="exit"):
+    plugin_name = plugin_for(config, "frida")
+    if not plugin_name:
+        return "", "", ""
+    class_name = plugin_name_to_class_name(plugin_name)
+    import_code = f"import 'package:{plugin_name}/{plugin_name}.dart';"
+    action = _frida_action(mode)
+    method_code = f'''Future<void> _checkFrida() async {{
+  try {{
+    final detected = await {class_name}.isFridaDetected;
+    if (detected) {{
+{action}
+    }} else {{
+      print("✅ Frida not detected");
+    }}
+  }} catch (e) {{
+    print("⚠️ Error during frida check: $e");
+  }}
+}}'''
+    init_code = '''@override
+void initState() {
+  super.initState();
+  _checkFrida();
+}'''
+    return import_code, method_code, init_code
+
+def _signature_list(signatures):
+    sig_lines = ",\n  ".join(f'"{s.strip()}"' for s in signatures if s.strip())
+    return f"final List<String> validSignatures = [\n  {sig_lines}\n];"
+
+def _integrity_actions(mode):
+    """``(on invalid signature, on error)``."""
+    if mode == "exit":
+        action_invalid = "        exit(0);"
+        action_error = "      exit(0);"
+    elif mode == "popup":
+        action_invalid = '''        WidgetsBinding.instance.addPostFrameCallback((_) {
+          showDialog(
+            context: context,
+            barrierDismissible: false,
+            builder: (_) => AlertDialog(
+              title: Text("SIGNATURE NOT VALID"),
+              actions: [TextButton(onPressed: () => exit(0), child: Text("OK"))]
+            )
+          );
+        });'''
+        action_error = '''      WidgetsBinding.instance.addPostFrameCallback((_) {
+        showDialog(
+          context: context,
+          barrierDismissible: false,
+          builder: (_) => AlertDialog(
+            title: Text("INTEGRITY CHECK ERROR"),
+            actions: [TextButton(onPressed: () => exit(0), child: Text("OK"))]
+          )
+        );
+      });'''
+    else:
+        action_invalid = '        print("❌ SIGNATURE NOT VALID: $sig");'
+        action_error = '      print("⚠️ Error during integrity check: $e");'
+    return action_invalid, action_error
+
+def generate_integrity_code(config, signatures, mode="exit"):
+    plugin_name = plugin_for(config, "integrity")
+    if not plugin_name:
+        return "", "", ""
+    class_name = plugin_name_to_class_name(plugin_name)
+    import_code = f"import 'package:{plugin_name}/{plugin_name}.dart';"
+    sig_list = _signature_list(signatures)
+    action_invalid, action_error = _integrity_actions(mode)
+    method_code = f'''{sig_list}
+
+Future<void> _checkIntegrity() async {{
+  try {{
+    final sig = await {class_name}.getApkSignature();
+    final valid = validSignatures.contains(sig);
+    if (!valid) {{
+{action_invalid}
+    }} else {{
+      print("✅ SIGNATURE VALID");
+    }}
+  }} catch (e) {{
+{action_error}
+  }}
+}}'''
+    init_code = '''@override
+void initState() {
+  super.initState();
+  _checkIntegrity();
+}'''
+    return import_code, method_code, init_code
+
+def generate_combined_code(config, modes, signatures=()):
+    """Snippets for the combined guard plugin: one ``runAll`` round trip.
+
+    ``modes`` maps each check type to exit, popup or log (default exit);
+    only the types in :func:`guard_checks` are requested and acted on.
+    """
+    if not config or GUARD_KEY not in (config.get("plugins") or {}):
+        return "", "", ""
+    checks = guard_checks(config)
+    plugin_name = f'{config["plugins"][GUARD_KEY]}_plugin'
+    class_name = plugin_name_to_class_name(plugin_name)
+    import_code = f"import 'package:{plugin_name}/{plugin_name}.dart';"
+    arguments = ", ".join(f"{key}: {'true' if key in checks else 'false'}" for key in ("root", "frida", "integrity"))
+    blocks = []
+    if "root" in checks:
+        blocks.append(f'''    if (verdicts.rooted) {{
+{_root_action(modes.get("root", "exit"))}
+    }} else {{
+      print("✅ No root detected");
+    }}''')
+    if "frida" in checks:
+        blocks.append(f'''    if (verdicts.fridaDetected) {{
+{_frida_action(modes.get("frida", "exit"))}
+    }} else {{
+      print("✅ Frida not detected");
+    }}''')
+    action_error = '    print("⚠️ Error during guard check: $e");'
+    prefix = ""
+    if "integrity" in checks:
+        action_invalid, action_error = _integrity_actions(modes.get("integrity", "exit"))
+        prefix = _signature_list(signatures) + "\n\n"
+        blocks.append(f'''    final sig = verdicts.signature;
+    if (!validSignatures.contains(sig)) {{
+{action_invalid}
+    }} else {{
+      print("✅ SIGNATURE VALID");
+    }}''')
+    body = "\n".join(blocks)
+    method_code = f'''{prefix}Future<void> _checkGuard() async {{
+  try {{
+    final verdicts = await {class_name}.runAll({arguments});
+{body}
+  }} catch (e) {{
+{action_error}
+  }}
+}}'''
+    init_code = '''@override
+void initState() {
+  super.initState();
+  _checkGuard();
+}'''
+    return import_code, method_code, init_code
+
+def generate_guard_code(config, plugin_type, mode="exit", signatures=()):
+    """``(import, method, init)`` snippets for one plugin type.
+
+    For the combined guard plugin ``mode`` may also be a dict of check type
+    -> mode.
+    """
+    if plugin_type == GUARD_KEY:
+        modes = mode if isinstance(mode, dict) else {key: mode for key in PLUGIN_KEYS}
+        return generate_combined_code(config, modes, signatures)
+    if plugin_type == "root":
+        return generate_root_code(config, mode)
+    if plugin_type == "frida":
+        return generate_frida_code(config, mode)
+    return generate_integrity_code(config, signatures, mode)
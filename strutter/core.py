@@ -0,0 +1,534 @@
+import os
+import re
+import json
+import hmac
+import hashlib
+import time
+import random
+import string
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .templates import TEMPLATE_ROOT, PLUGIN_TYPES, plugin_name_to_class_name, render_plugin_templates
+from .scaffold import write_plugin_scaffold, plugin_file_layout
+from . import cache as scaffold_cache
+from . import runner
+from . import state
+from . import toolchain
+from . import trace
+from .toolchain import ToolchainError
+from .fileio import FileWriter, UNCHANGED
+from .gradle import GradleScript, GradleError, app_gradle_file
+from .pubspec import Pubspec, PubspecError, relative_dependency_path
+
+# Strutter v0.1 – Hardening Tools for Flutter Android
+TOOL_NAME = "Strutter"
+TOOL_VERSION = "0.1"
+CONFIG_FILE = state.STATE_FILE
+NDK_VERSION = "27.0.12077973"
+PLUGIN_KEYS = ["frida", "root", "integrity"]
+# With combine=True, Step 1 generates this one plugin holding the checks of
+# every selected type instead of one plugin per type.
+GUARD_KEY = "guard"
+GENERATED_KEYS = PLUGIN_KEYS + [GUARD_KEY]
+IDENTITY_SECRET_ENV = "STRUTTER_ID_SECRET"
+# Package names of generated plugins: generate_plugin_identifier() + "_plugin"
+PLUGIN_NAME_PATTERN = re.compile(r"^[a-z][0-9a-f]{32}_plugin$")
+
+
+class IdentityError(Exception):
+    pass
+
+
+def run_command(argv, cwd=None, cancel_event=None, on_line=None, timeout=None):
+    """Run ``argv`` through the streaming runner; returns ``(stdout, stderr, returncode)``.
+
+    On timeout or cancellation the returncode is -1 and stderr carries the
+    reason. See :func:`strutter.runner.run` for the other arguments.
+    """
+    result = runner.run(argv, cwd=cwd, timeout=timeout, cancel_event=cancel_event, on_line=on_line)
+    return result.stdout, result.error or result.stderr, result.returncode
+
+def detect_flutter_version():
+    """Return ``(True, version)`` or ``(False, error message)``."""
+    try:
+        return True, toolchain.probe()["version"]
+    except ToolchainError as e:
+        return False, str(e)
+
+def check_flutter():
+    try:
+        info = toolchain.probe()
+    except ToolchainError as e:
+        return False, str(e)
+    return True, describe_toolchain(info)
+
+def describe_toolchain(info):
+    details = [f"channel {info['channel']}" if info.get("channel") else None,
+               f"Dart {info['dart_version']}" if info.get("dart_version") else None]
+    details = ", ".join(d for d in details if d)
+    return f"Flutter version {info['version']}{f' ({details})' if details else ''} detected."
+
+def validate_flutter_project(path):
+    if not os.path.isdir(path):
+        return False, "Path is not a directory."
+    pubspec = os.path.join(path, "pubspec.yaml")
+    if not os.path.exists(pubspec):
+        return False, "pubspec.yaml not found. Not a valid Flutter project."
+    return True, "Valid Flutter project."
+
+def is_valid_strict_structure(project_path):
+    current_dir = os.path.abspath(os.getcwd())
+    current_name = os.path.basename(current_dir)
+    if current_name != "STRUTTER":
+        return False, "This tool must be run from a folder named exactly 'STRUTTER'."
+    parent_dir = os.path.dirname(current_dir)
+    project_abs = os.path.abspath(project_path)
+    project_parent = os.path.dirname(project_abs)
+    if os.path.normpath(parent_dir) != os.path.normpath(project_parent):
+        expected = os.path.basename(parent_dir)
+        return False, (
+            f"Project must be a direct sibling of 'STRUTTER'.\n\n"
+            f"Expected structure:\n"
+            f"  {expected}/\n"
+            f"    ├── STRUTTER/\n"
+            f"    └── <YourProject>/\n\n"
+            f"Selected project is not in the same parent folder."
+        )
+    return True, "Structure is valid."
+
+def generate_plugin_identifier(seed_input):
+    hash_hex = hashlib.md5(seed_input.encode("utf-8")).hexdigest()
+    letter_index = int(hash_hex[:2], 16) % 26
+    prefix_letter = string.ascii_lowercase[letter_index]
+    return prefix_letter + hash_hex
+
+def identity_seed(secret, app_id, rotation=0):
+    """Base seed for deterministic identifiers.
+
+    HMAC-SHA256 of the app id and rotation counter under the project secret:
+    the same inputs always give the same plugin names, a new ``rotation``
+    gives unrelated ones, and without the secret the names can't be linked
+    back to the app.
+    """
+    if isinstance(secret, str):
+        secret = secret.encode("utf-8")
+    message = f"{app_id}\n{int(rotation)}".encode("utf-8")
+    return "strutter_" + hmac.new(secret, message, hashlib.sha256).hexdigest()
+
+def load_identity_secret(path=None):
+    """The project secret from ``path``, else from ``$STRUTTER_ID_SECRET``."""
+    if path:
+        try:
+            with open(path, "rb") as f:
+                secret = f.read().strip()
+        except OSError as e:
+            raise IdentityError(f"Cannot read identifier secret: {str(e)}")
+    else:
+        secret = os.environ.get(IDENTITY_SECRET_ENV, "").strip().encode("utf-8")
+    if len(secret) < 16:
+        raise IdentityError(
+            f"Deterministic identifiers need a secret of at least 16 bytes "
+            f"(set {IDENTITY_SECRET_ENV} or pass a secret file)."
+        )
+    return secret
+
+def application_id(project_path):
+    """``applicationId`` from the app's Gradle ``defaultConfig``, or None."""
+    gradle_path = app_gradle_file(project_path)
+    if not gradle_path:
+        return None
+    try:
+        value = GradleScript.load(gradle_path).property(("android", "defaultConfig"), "applicationId")
+    except (OSError, GradleError):
+        return None
+    if value and value[0] in "'\"" and value[-1] == value[0]:
+        return value[1:-1]
+    return None
+
+# === CONFIG ===
+def default_selected_plugins():
+    return {"root": True, "frida": True, "integrity": True}
+
+def load_config(config_path=CONFIG_FILE):
+    """Return the saved config dict, or None when missing or unreadable.
+
+    ``config_path`` is the state database, or a legacy ``.json`` config.
+    """
+    if config_path.endswith(".json"):
+        if not os.path.exists(config_path):
+            return None
+        try:
+            with open(config_path, "r") as f:
+                return json.load(f)
+        except Exception:
+            return None
+    try:
+        return state.open_store(config_path).config()
+    except Exception:
+        return None
+
+def save_config(config, config_path=CONFIG_FILE):
+    if config_path.endswith(".json"):
+        with open(config_path, "w") as f:
+            json.dump(config, f, indent=2)
+        return
+    state.open_store(config_path).save_config(config)
+
+def record_step(config_path, project, step, ok, message, changes=()):
+    """Store a step's outcome and written-file hashes (state database only)."""
+    if config_path.endswith(".json"):
+        return
+    try:
+        state.open_store(config_path).record_step(project, step, ok, message, changes)
+    except Exception:
+        pass
+
+def plugins_dir(config):
+    # Configs written before plugins_dir existed always used the CWD.
+    return config.get("plugins_dir") or os.getcwd()
+
+def plugin_names(config):
+    plugins = config.get("plugins", {}) if config else {}
+    return [f"{plugins[key]}_plugin" for key in GENERATED_KEYS if plugins.get(key)]
+
+# === STEP 1: GENERATE PLUGINS ===
+MAX_CREATE_WORKERS = 3
+
+def scaffold_plugin(plugin_type, name, base_dir, offline=False, cache_entry=None, cancel_event=None):
+    if cancel_event is not None and cancel_event.is_set():
+        return "Cancelled."
+    if offline:
+        with trace.span("write_plugin_scaffold", "phase", plugin=plugin_type):
+            return write_plugin_scaffold(plugin_type, name, base_dir)
+    if cache_entry:
+        with trace.span("copy_scaffold", "phase", plugin=plugin_type):
+            scaffold_cache.copy_scaffold(cache_entry, name, base_dir)
+        return None
+    argv = ["flutter", "create", "--template=plugin", "--platforms=android", name]
+    out, err, code = run_command(argv, cwd=base_dir, cancel_event=cancel_event)
+    return None if code == 0 else (err or out or f"exit code {code}")
+
+def scaffold_plugins(config, log_callback, max_workers=MAX_CREATE_WORKERS, offline=False,
+                     flutter_version=None, cache_dir=None, cancel_event=None):
+    """Scaffold every configured plugin in a bounded worker pool.
+
+    When ``flutter_version`` is given (and not offline), ``flutter create``
+    runs at most once per Flutter version and template set; each plugin is
+    then copied from the scaffold cache. Progress is reported through
+    ``log_callback`` from the calling thread as each job finishes. Returns
+    ``{name: error}`` for the plugins that failed.
+
+    With deterministic identifiers an existing plugin project of the same
+    name is left untouched, so its build outputs stay valid; Step 2 brings
+    its sources up to date.
+    """
+    errors = {}
+    jobs = [(key, f"{config['plugins'][key]}_plugin") for key in GENERATED_KEYS if config["plugins"].get(key)]
+    base_dir = plugins_dir(config)
+    if (config.get("identity") or {}).get("mode") == "deterministic":
+        existing = [name for _, name in jobs if os.path.exists(os.path.join(base_dir, name, "pubspec.yaml"))]
+        for name in existing:
+            log_callback(f"✓ Reusing: {name}\n")
+        jobs = [(key, name) for key, name in jobs if name not in existing]
+    if not jobs:
+        return errors
+    cache_entry = None
+    if flutter_version and not offline:
+        try:
+            cache_entry, err = scaffold_cache.ensure_scaffold(
+                flutter_version, lambda argv, cwd=None: run_command(argv, cwd, cancel_event), cache_dir
+            )
+        except Exception as e:
+            cache_entry, err = None, str(e)
+        if cache_entry:
+            log_callback(f"Using cached scaffold for Flutter {flutter_version}.\n")
+        else:
+            log_callback(f"⚠️ Scaffold cache unavailable, running flutter create per plugin.\nError: {err}\n")
+    for _, name in jobs:
+        log_callback(f"Creating plugin: {name} ...\n")
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = {
+            pool.submit(scaffold_plugin, key, name, base_dir, offline, cache_entry, cancel_event): name
+            for key, name in jobs
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                err = future.result()
+            except Exception as e:
+                err = str(e)
+            if err is None:
+                log_callback(f"✓ Success: {name}\n")
+            else:
+                log_callback(f"✗ Failed: {name}\nError: {err}\n")
+                errors[name] = err
+    return errors
+
+def create_plugins(selected_plugins, log_callback, config_path=CONFIG_FILE, base_dir=None,
+                   max_workers=MAX_CREATE_WORKERS, offline=False, flutter_version=None, cache_dir=None,
+                   cancel_event=None, identity=None, combine=False):
+    """Generate identifiers, save the config and scaffold each selected plugin.
+
+    With ``offline=True`` the plugin projects are written directly from the
+    bundled templates instead of running ``flutter create``. Passing the
+    detected ``flutter_version`` enables the scaffold cache.
+
+    Identifiers are random unless ``identity`` (``{"secret", "app_id",
+    "rotation"}``) is given; then they are derived with :func:`identity_seed`
+    and stay the same on every run until the rotation counter changes. Only
+    the app id and rotation are saved, never the secret.
+
+    With ``combine=True`` a single ``guard`` plugin is generated instead: one
+    method channel, one batched ``runAll`` call and one installed-package
+    enumeration for every selected check; ``selected_plugins`` records which
+    of its verdicts the app acts on.
+
+    Returns ``(success, config, errors)`` where ``errors`` maps each plugin
+    that failed to scaffold to its error output. The config is saved even on
+    failure so the identifiers stay stable for a retry.
+    """
+    base_dir = os.path.abspath(base_dir or os.getcwd())
+    if identity:
+        base_seed = identity_seed(identity["secret"], identity["app_id"], identity.get("rotation", 0))
+        identity_info = {"mode": "deterministic", "app_id": identity["app_id"],
+                         "rotation": int(identity.get("rotation", 0))}
+    else:
+        base_seed = f"strutter_{int(time.time())}_{random.randint(100000, 999999)}"
+        identity_info = {"mode": "random"}
+    config = {
+        "tool": f"{TOOL_NAME} v{TOOL_VERSION}",
+        "selected_plugins": selected_plugins,
+        "plugins_dir": base_dir,
+        "identity": identity_info,
+        "plugins": {}
+    }
+    if combine:
+        keys = [GUARD_KEY] if any(selected_plugins.get(key, False) for key in PLUGIN_KEYS) else []
+    else:
+        keys = [key for key in PLUGIN_KEYS if selected_plugins.get(key, False)]
+    for key in keys:
+        config["plugins"][key] = generate_plugin_identifier(base_seed + PLUGIN_TYPES[key]["seed"])
+    save_config(config, config_path)
+    errors = scaffold_plugins(config, log_callback, max_workers, offline, flutter_version, cache_dir,
+                              cancel_event)
+    return not errors, config, errors
+
+# === STEP 2: APPLY PLUGIN TEMPLATES ===
+def apply_plugin_template(config, plugin_type, has_manifest=True, writer=None, budgets=None):
+    """Render a plugin's templates into its project.
+
+    ``budgets`` (``{"root.suCommand": 1500, "default": 500, ...}`` in ms)
+    sets the detection checks' time budgets; it defaults to the config's
+    ``check_budgets`` over :data:`strutter.templates.CHECK_BUDGETS_MS`.
+    """
+    if not config or "plugins" not in config:
+        return False, "No configuration found. Run Step 1 first."
+    if plugin_type not in config["plugins"]:
+        return False, f"{plugin_type.capitalize()} plugin not selected."
+    plugin_id = config["plugins"][plugin_type]
+    plugin_name = f"{plugin_id}_plugin"
+    plugin_path = os.path.join(plugins_dir(config), plugin_name)
+    if not os.path.exists(plugin_path):
+        return False, f"{plugin_type.capitalize()} plugin directory not found: {plugin_path}"
+    kt_file = os.path.join(plugin_path, plugin_file_layout(plugin_name)[0])
+    kt_search_dir = os.path.join(plugin_path, "android", "src", "main", "kotlin")
+    support_names = set(PLUGIN_TYPES[plugin_type]["support"])
+    if not os.path.exists(kt_file):
+        kt_file = None
+        for root, _, files in os.walk(kt_search_dir):
+            kt_file = next((os.path.join(root, f) for f in sorted(files)
+                            if f.endswith(".kt") and f not in support_names), None)
+            if kt_file:
+                break
+    if not kt_file:
+        return False, f"Kotlin file not found for {plugin_type} plugin."
+    dart_file = os.path.join(plugin_path, "lib", f"{plugin_name}.dart")
+    if not os.path.exists(dart_file):
+        return False, f"Dart file not found: {dart_file}"
+    with trace.span("render_templates", "phase", plugin=plugin_type):
+        ok, rendered = render_plugin_templates(plugin_type, plugin_name, has_manifest,
+                                               config.get("check_budgets") if budgets is None else budgets)
+    if not ok:
+        return False, rendered
+    writer = writer or FileWriter()
+    try:
+        statuses = [writer.write_text(kt_file, rendered["kt"]), writer.write_text(dart_file, rendered["dart"])]
+        for name, source in rendered["support"].items():
+            statuses.append(writer.write_text(os.path.join(os.path.dirname(kt_file), name), source))
+        if has_manifest:
+            manifest_file = os.path.join(plugin_path, "android", "src", "main", "AndroidManifest.xml")
+            statuses.append(writer.write_text(manifest_file, rendered["manifest"]))
+    except Exception as e:
+        return False, f"Failed to write {plugin_type} files: {str(e)}"
+    if all(status == UNCHANGED for status in statuses):
+        return True, f"{plugin_type.capitalize()} template already up to date."
+    return True, f"{plugin_type.capitalize()} template applied successfully."
+
+def apply_selected_plugins(config, writer=None):
+    """Apply every configured plugin template; returns ``(applied, errors)``."""
+    writer = writer or FileWriter()
+    applied = []
+    errors = []
+    for plugin_type in ["root", "frida", "integrity", GUARD_KEY]:
+        if config and "plugins" in config and plugin_type in config["plugins"]:
+            success, msg = apply_plugin_template(config, plugin_type,
+                                                 has_manifest=PLUGIN_TYPES[plugin_type]["manifest"] is not None,
+                                                 writer=writer)
+            if success:
+                applied.append(plugin_type)
+            else:
+                errors.append(msg)
+    return applied, errors
+
+# === STEP 3: PUBSPEC DEPENDENCIES ===
+def hardening_dependencies(config):
+    """``(plugin_name, relative_path)`` for every plugin in the config."""
+    project_path = config["flutter_project"]
+    return [
+        (plugin_name, relative_dependency_path(os.path.join(plugins_dir(config), plugin_name), project_path))
+        for plugin_name in plugin_names(config)
+    ]
+
+def retired_dependencies(config, pubspec):
+    """Generated plugins in ``pubspec``'s dependencies that the config no longer has.
+
+    Only path dependencies with a generated name pointing into the config's
+    plugins folder count, so packages added by hand are never touched.
+    """
+    project_path = config["flutter_project"]
+    base = os.path.normcase(os.path.abspath(plugins_dir(config)))
+    current = set(plugin_names(config))
+    retired = []
+    for name, entry in pubspec.entries["dependencies"].items():
+        if name in current or entry.path is None or not PLUGIN_NAME_PATTERN.match(name):
+            continue
+        target = os.path.abspath(os.path.join(project_path, entry.path.rstrip("/")))
+        if os.path.normcase(os.path.dirname(target)) == base:
+            retired.append(name)
+    return retired
+
+def apply_dependencies_to_pubspec(config, writer=None):
+    if not config or "flutter_project" not in config:
+        return False, "Flutter project not set. Please set it first."
+    project_path = config["flutter_project"]
+    pubspec_path = os.path.join(project_path, "pubspec.yaml")
+    if not os.path.exists(pubspec_path):
+        return False, "pubspec.yaml not found in project."
+    plugins_to_add = hardening_dependencies(config)
+    if not plugins_to_add:
+        return False, "No plugins generated yet."
+    with trace.span("parse_pubspec", "phase"):
+        try:
+            pubspec = Pubspec.load(pubspec_path)
+        except Exception as e:
+            return False, f"Failed to read pubspec.yaml: {str(e)}"
+        try:
+            pubspec.set_path_dependencies(plugins_to_add)
+            # e.g. the separate plugins after switching to the combined guard
+            removed = pubspec.remove_dependencies(retired_dependencies(config, pubspec))
+        except PubspecError as e:
+            return False, f"Cannot edit pubspec.yaml: {str(e)}"
+    writer = writer or FileWriter()
+    try:
+        status = writer.write_text(pubspec_path, pubspec.text())
+    except Exception as e:
+        return False, f"Failed to write pubspec.yaml: {str(e)}"
+    if status == UNCHANGED:
+        return True, f"✓ Dependencies already up to date in:\n  {pubspec_path}"
+    if removed:
+        return True, f"✓ Dependencies added to:\n  {pubspec_path}\n  ({removed} retired plugin(s) removed)"
+    return True, f"✓ Dependencies added to:\n  {pubspec_path}"
+
+def check_dependencies_applied(config):
+    if not config or "flutter_project" not in config:
+        return False, "Flutter project not set."
+    project_path = config["flutter_project"]
+    pubspec_path = os.path.join(project_path, "pubspec.yaml")
+    if not os.path.exists(pubspec_path):
+        return False, "pubspec.yaml not found."
+    try:
+        pubspec = Pubspec.load(pubspec_path)
+    except Exception:
+        return False, "Failed to read pubspec.yaml."
+    expected = hardening_dependencies(config)
+    applied_count = sum(1 for name, path in expected if pubspec.has_path_dependency(name, path))
+    return applied_count == len(expected), f"{applied_count}/{len(expected)} applied"
+
+# === STEP 4: NDK VERSION ===
+def update_gradle_properties(config, settings, writer=None):
+    """Set ``(block_path, key, value)`` entries in the app module's build script.
+
+    Works on ``android/app/build.gradle.kts`` or, failing that, the Groovy
+    ``build.gradle``; all settings are applied in one write. Returns
+    ``(ok, message, changed_count)``.
+    """
+    return _edit_gradle(config, settings, writer)[:3]
+
+def _edit_gradle(config, settings, writer=None):
+    # update_gradle_properties, plus the script as parsed before the edit
+    # (None on failure) for callers that also look values up.
+    if not config or "flutter_project" not in config:
+        return False, "Flutter project not set.", 0, None
+    gradle_path = app_gradle_file(config["flutter_project"])
+    if gradle_path is None:
+        return False, "android/app/build.gradle(.kts) not found.", 0, None
+    gradle_name = os.path.basename(gradle_path)
+    try:
+        with trace.span("parse_gradle", "phase", file=gradle_name):
+            script = GradleScript.load(gradle_path)
+            content, changed = script.set_properties(settings)
+    except GradleError as e:
+        return False, f"Cannot edit {gradle_name}: {str(e)}", 0, None
+    except Exception as e:
+        return False, f"Failed to read {gradle_name}: {str(e)}", 0, None
+    writer = writer or FileWriter()
+    try:
+        writer.write_text(gradle_path, content)
+    except Exception as e:
+        return False, f"Failed to write {gradle_name}: {str(e)}", 0, None
+    return True, gradle_path, changed, script
+
+def update_ndk_version(config, writer=None):
+    # One parse: the script read for the edit also tells whether the
+    # property was there before.
+    ok, msg, changed, script = _edit_gradle(
+        config, [(("android",), "ndkVersion", f'"{NDK_VERSION}"')], writer=writer
+    )
+    if not ok:
+        return False, msg
+    if not changed:
+        return True, "✓ NDK version already set."
+    previous = script.property(("android",), "ndkVersion")
+    return True, "✓ NDK version updated." if previous is not None else "✓ NDK version added."
+
+# === STEP 5: FLUTTER PUB GET ===
+def pub_get_needed(project_path):
+    """True unless .dart_tool/package_config.json is newer than pubspec.yaml/.lock."""
+    package_config = os.path.join(project_path, ".dart_tool", "package_config.json")
+    try:
+        resolved = os.path.getmtime(package_config)
+    except OSError:
+        return True
+    for name in ("pubspec.yaml", "pubspec.lock"):
+        try:
+            if os.path.getmtime(os.path.join(project_path, name)) > resolved:
+                return True
+        except OSError:
+            if name == "pubspec.yaml":
+                return True
+    return False
+
+def run_flutter_pub_get(config, cancel_event=None, log_callback=None, timeout=None):
+    """Run ``flutter pub get`` in the project, streaming output to ``log_callback``.
+
+    ``timeout`` (seconds) overrides the runner's policy for pub.
+    """
+    if not config or "flutter_project" not in config:
+        return False, "Flutter project not set."
+    project_path = config["flutter_project"]
+    on_line = (lambda stream, line: log_callback(line)) if log_callback else None
+    out, err, code = run_command(["flutter", "pub", "get"], cwd=project_path,
+                                 cancel_event=cancel_event, on_line=on_line, timeout=timeout)
+    if code == 0:
+        return True, "✓ flutter pub get: Success"
+    return False, f"flutter pub get failed:\n{err}"
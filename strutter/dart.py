@@ -0,0 +1,265 @@
+import string
+
+# Just enough of Dart's lexical grammar to find directives, top-level classes
+# and class members without being fooled by comments or string literals.
+IDENT_START = frozenset(string.ascii_letters + "_$")
+IDENT_CHARS = IDENT_START | frozenset(string.digits)
+DIRECTIVES = ("library", "import", "export", "part")
+TRIPLE_QUOTES = ("'''", '"""')
+
+
+class DartError(Exception):
+    pass
+
+
+def _skip_block_comment(text, i):
+    depth = 0
+    n = len(text)
+    while i < n:
+        if text.startswith("/*", i):
+            depth += 1
+            i += 2
+        elif text.startswith("*/", i):
+            depth -= 1
+            i += 2
+            if depth == 0:
+                return i
+        else:
+            i += 1
+    raise DartError("Unterminated block comment")
+
+def _skip_string(text, i, raw):
+    quote = text[i:i + 3] if text[i:i + 3] in TRIPLE_QUOTES else text[i]
+    j = i + len(quote)
+    n = len(text)
+    while j < n:
+        if text.startswith(quote, j):
+            return j + len(quote)
+        c = text[j]
+        if c == "\n" and len(quote) == 1:
+            break
+        if not raw and c == "\\":
+            j += 2
+        elif not raw and text.startswith("${", j):
+            _, j = _lex(text, j + 2, nested=True)
+        else:
+            j += 1
+    raise DartError(f"Unterminated string literal at line {text.count(chr(10), 0, i) + 1}")
+
+def _lex(text, i, nested=False):
+    tokens = []
+    depth = 0
+    n = len(text)
+    while i < n:
+        c = text[i]
+        if c.isspace():
+            i += 1
+        elif text.startswith("//", i):
+            end = text.find("\n", i)
+            i = n if end == -1 else end
+        elif text.startswith("/*", i):
+            i = _skip_block_comment(text, i)
+        elif c in "'\"":
+            end = _skip_string(text, i, raw=False)
+            tokens.append(("string", i, end))
+            i = end
+        elif c in IDENT_CHARS:
+            j = i + 1
+            while j < n and text[j] in IDENT_CHARS:
+                j += 1
+            if j - i == 1 and c == "r" and j < n and text[j] in "'\"":
+                j = _skip_string(text, j, raw=True)
+                tokens.append(("string", i, j))
+            else:
+                tokens.append(("ident", i, j))
+            i = j
+        else:
+            if nested and c == "{":
+                depth += 1
+            elif nested and c == "}":
+                if depth == 0:
+                    return tokens, i + 1
+                depth -= 1
+            tokens.append(("punct", i, i + 1))
+            i += 1
+    if nested:
+        raise DartError("Unterminated string interpolation")
+    return tokens, n
+
+def tokenize(text):
+    """``[(kind, start, end), ...]`` with kind ident, string or punct.
+
+    Comments and whitespace are dropped; a string literal (interpolations
+    included) is a single token.
+    """
+    return _lex(text, 0)[0]
+
+
+class DartFile:
+    """Directives, top-level classes and members of one Dart library.
+
+    ``imports`` holds ``{"uri", "prefix", "show", "start", "end"}`` per import;
+    ``classes`` holds ``{"name", "superclass", "start", "body_open",
+    "body_close"}`` per top-level class, offsets pointing at the braces.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = tokenize(text)
+        self.imports = []
+        self.directives_end = 0
+        self.imports_end = None
+        self.classes = []
+        self._index()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def value(self, k):
+        _, start, end = self.tokens[k]
+        return self.text[start:end]
+
+    def _match(self, k, open_char, close_char):
+        """Index of the token closing the bracket opened at token ``k``."""
+        depth = 0
+        for j in range(k, len(self.tokens)):
+            kind, start, _ = self.tokens[j]
+            if kind != "punct":
+                continue
+            c = self.text[start]
+            if c == open_char:
+                depth += 1
+            elif c == close_char:
+                depth -= 1
+                if depth == 0:
+                    return j
+        raise DartError(f"Unbalanced '{open_char}' at line {self.line_of(self.tokens[k][1])}")
+
+    def line_of(self, offset):
+        return self.text.count("\n", 0, offset) + 1
+
+    def _statement_end(self, k):
+        while k < len(self.tokens) and self.value(k) != ";":
+            k += 1
+        if k == len(self.tokens):
+            raise DartError("Unterminated directive")
+        return k
+
+    def _index(self):
+        k = 0
+        in_directives = True
+        while k < len(self.tokens):
+            kind, start, _ = self.tokens[k]
+            word = self.value(k)
+            if in_directives and kind == "ident" and word in DIRECTIVES:
+                end = self._statement_end(k)
+                if word == "import":
+                    uri = self.value(k + 1)[1:-1] if self.tokens[k + 1][0] == "string" else None
+                    words = [self.value(j) for j in range(k + 2, end)]
+                    prefix = words[words.index("as") + 1] if "as" in words[:-1] else None
+                    self.imports.append({"uri": uri, "prefix": prefix, "show": "show" in words,
+                                         "start": start, "end": self.tokens[end][2]})
+                if word in ("import", "export"):
+                    self.imports_end = self.tokens[end][2]
+                self.directives_end = self.tokens[end][2]
+                k = end + 1
+                continue
+            if kind == "punct" and word == "@" and in_directives:
+                # Metadata may precede a library directive.
+                k += 1
+                continue
+            in_directives = False
+            if kind == "punct" and word == "{":
+                k = self._match(k, "{", "}") + 1
+                continue
+            if kind == "ident" and word == "class" and not (k and self.value(k - 1) == "."):
+                k = self._index_class(k)
+                continue
+            k += 1
+
+    def _index_class(self, k):
+        name = self.value(k + 1)
+        superclass = None
+        j = k + 2
+        while j < len(self.tokens) and self.value(j) not in ("{", ";"):
+            if self.value(j) == "extends":
+                superclass = self.value(j + 1)
+            j += 1
+        if j == len(self.tokens) or self.value(j) == ";":
+            return j + 1  # class alias: `class A = B with C;`
+        close = self._match(j, "{", "}")
+        self.classes.append({
+            "name": name,
+            "superclass": superclass,
+            "start": self.tokens[k][1],
+            "body_open": self.tokens[j][1],
+            "body_close": self.tokens[close][1],
+            "first_token": j + 1,
+            "last_token": close,
+        })
+        return close + 1
+
+    def state_class(self):
+        """The first top-level ``class ... extends State<...>``, or None."""
+        return next((c for c in self.classes if c["superclass"] == "State"), None)
+
+    def members(self, cls):
+        """``{name: {"start", "body_open", "body_close"}}`` of a class's methods.
+
+        ``body_open``/``body_close`` are None for ``=>`` and abstract methods.
+        """
+        methods = {}
+        k = cls["first_token"]
+        statement_start = k
+        while k < cls["last_token"]:
+            kind, start, _ = self.tokens[k]
+            word = self.value(k)
+            if word == ";":
+                statement_start = k + 1
+            elif word == "{":
+                k = self._match(k, "{", "}") + 1
+                statement_start = k
+                continue
+            elif (kind == "ident" and k + 1 < cls["last_token"] and self.value(k + 1) == "("
+                    and self.value(k - 1) not in (".", "=", "?", "!")):
+                close = self._match(k + 1, "(", ")")
+                j = close + 1
+                while self.tokens[j][0] == "ident" or self.value(j) == "*":
+                    j += 1  # async, sync*, async*
+                body = None
+                if self.value(j) == "{":
+                    end = self._match(j, "{", "}")
+                    body = (self.tokens[j][1], self.tokens[end][1])
+                    next_k = end + 1
+                elif self.value(j) == "=" and self.value(j + 1) == ">":
+                    next_k = self._statement_end(j) + 1
+                else:
+                    next_k = j + 1 if self.value(j) == ";" else j
+                methods.setdefault(word, {
+                    "start": self.tokens[statement_start][1],
+                    "body_open": body[0] if body else None,
+                    "body_close": body[1] if body else None,
+                })
+                k = statement_start = next_k
+                continue
+            k += 1
+        return methods
+
+    def calls(self, start, end, name):
+        """True if ``name(`` is called between two offsets."""
+        for k, (kind, tok_start, _) in enumerate(self.tokens):
+            if start <= tok_start < end and kind == "ident" and self.value(k) == name:
+                if k + 1 < len(self.tokens) and self.value(k + 1) == "(":
+                    return True
+        return False
+
+    def statement_after(self, start, end, words):
+        """Offset just past the first statement starting with ``words`` in a range."""
+        for k, (_, tok_start, _) in enumerate(self.tokens):
+            if not start <= tok_start < end:
+                continue
+            if all(k + i < len(self.tokens) and self.value(k + i) == w for i, w in enumerate(words)):
+                return self.tokens[self._statement_end(k)][2]
+        return None
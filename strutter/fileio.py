@@ -0,0 +1,102 @@
+import os
+import stat
+import difflib
+import hashlib
+import tempfile
+
+from . import trace
+
+UNCHANGED = "unchanged"
+CREATED = "created"
+UPDATED = "updated"
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_sha256(path):
+    """Hex SHA-256 of a file, or None if it does not exist."""
+    try:
+        with open(path, "rb") as f:
+            return sha256_bytes(f.read())
+    except FileNotFoundError:
+        return None
+
+def atomic_write_bytes(path, data):
+    """Write ``data`` to ``path`` via a temp file in the same directory + rename.
+
+    Readers see either the old or the new file, never a partial one. The
+    original file mode is kept, and hardlinks to the old inode are broken
+    rather than written through.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix="." + os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class FileWriter:
+    """Write layer shared by the plugin, pubspec and Gradle steps.
+
+    Content is compared by SHA-256 against what is on disk and only written
+    when it differs, so a rerun leaves mtimes (and Gradle/pub caches) alone.
+    With ``dry_run=True`` nothing is written and a unified diff is collected
+    for every file that would change.
+    """
+
+    def __init__(self, dry_run=False):
+        self.dry_run = dry_run
+        self.changes = []
+        self.diffs = []
+
+    def write_text(self, path, content, encoding="utf-8", newline=None):
+        """Write ``content`` if it differs from the file; returns the status.
+
+        ``newline=None`` translates ``\\n`` to ``os.linesep`` like text-mode
+        ``open()``; pass ``""`` to write the content as is.
+        """
+        if newline is None and os.linesep != "\n":
+            content = content.replace("\n", os.linesep)
+        elif newline:
+            content = content.replace("\n", newline)
+        data = content.encode(encoding)
+        new_hash = sha256_bytes(data)
+        try:
+            with open(path, "rb") as f:
+                old = f.read()
+        except FileNotFoundError:
+            old = None
+        if old is not None and sha256_bytes(old) == new_hash:
+            status = UNCHANGED
+        else:
+            status = CREATED if old is None else UPDATED
+            if self.dry_run:
+                old_lines = old.decode(encoding, "replace").splitlines(True) if old is not None else []
+                self.diffs.append("".join(difflib.unified_diff(
+                    old_lines, content.splitlines(True),
+                    fromfile="/dev/null" if old is None else path, tofile=path
+                )))
+            else:
+                atomic_write_bytes(path, data)
+                trace.count("bytes_written", len(data))
+                trace.count("files_written")
+        self.changes.append({"path": path, "status": status, "sha256": new_hash})
+        return status
+
+    def changed(self):
+        return [c for c in self.changes if c["status"] != UNCHANGED]
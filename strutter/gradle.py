@@ -0,0 +1,268 @@
+import os
+import re
+
+# One alternation, tried left to right: comments and strings are consumed
+# whole so braces, '=' and keys inside them are never seen as structure.
+TOKEN_PATTERN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/)
+  | (?P<string>\"\"\"[\s\S]*?\"\"\"|'''[\s\S]*?'''|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*')
+  | (?P<newline>\n)
+  | (?P<open>\{)
+  | (?P<close>\})
+  | (?P<lparen>[(\[])
+  | (?P<rparen>[)\]])
+  | (?P<ident>[A-Za-z_][\w.]*)
+  | (?P<assign>=)
+  | (?P<semi>;)
+  | (?P<space>[ \t\r]+)
+  | (?P<other>.)
+""", re.S | re.X)
+
+STATEMENT_BOUNDARIES = ("newline", "open", "semi", None)
+# `getByName("release") {` names the same block as Groovy's `release {`.
+NAMED_ELEMENT_CALLS = ("getByName", "create", "maybeCreate", "named", "register")
+
+
+class GradleError(Exception):
+    pass
+
+
+class Block:
+    """A ``name { ... }`` block: offsets of its braces, children and properties."""
+
+    def __init__(self, name, parent, open_start, open_end):
+        self.name = name
+        self.parent = parent
+        self.open_start = open_start
+        self.open_end = open_end
+        self.close_start = None
+        self.children = []
+        self.properties = {}
+        self.child_indent = None
+
+
+class Property:
+    """A ``key = value`` / ``key value`` statement directly inside a block."""
+
+    def __init__(self, key, start):
+        self.key = key
+        self.start = start
+        self.end = start
+        self.assign = False
+
+
+def tokenize(text):
+    """Yield ``(kind, start, end)`` for every token except whitespace."""
+    for match in TOKEN_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind != "space":
+            yield kind, match.start(), match.end()
+
+def _line_indent(text, offset):
+    line_start = text.rfind("\n", 0, offset) + 1
+    line = text[line_start:offset]
+    return line[:len(line) - len(line.lstrip(" \t"))]
+
+
+class GradleScript:
+    """Structural editor for Gradle build scripts (Kotlin DSL and Groovy).
+
+    The script is tokenized once into a tree of blocks with the properties
+    assigned directly inside each of them; strings and comments are skipped
+    as whole tokens. Edits are collected as text splices against the
+    original and applied together, so everything that is not edited stays
+    byte-identical.
+    """
+
+    def __init__(self, text, dialect="kts"):
+        self.source = text
+        self.dialect = dialect
+        self.root = Block(None, None, 0, 0)
+        self._parse()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read(), "kts" if path.endswith(".kts") else "groovy")
+
+    # === PARSE ===
+    def _parse(self):
+        text = self.source
+        block = self.root
+        stack = []
+        depth = 0
+        parens = []
+        pending = None
+        length = 0
+        previous = None
+        last_ident = None
+        call_name = None
+        for kind, start, end in tokenize(text):
+            if kind == "comment":
+                continue
+            if block.child_indent is None and block is not self.root and depth == 0 \
+                    and previous == "newline" and kind not in ("newline", "close"):
+                block.child_indent = _line_indent(text, start)
+            if kind == "lparen":
+                parens.append([last_ident if previous == "ident" else None, None])
+                depth += 1
+            elif kind == "rparen":
+                call, argument = parens.pop() if parens else (None, None)
+                call_name = argument if call in NAMED_ELEMENT_CALLS and argument else call
+                depth = max(depth - 1, 0)
+            elif kind == "string" and parens and parens[-1][1] is None:
+                parens[-1][1] = text[start + 1:end - 1]
+            elif kind == "open":
+                # `name {`, `name("arg") {` or a lambda; a statement that runs
+                # into a brace is a block call, not a property.
+                name = last_ident if previous == "ident" else call_name if previous == "rparen" else None
+                child = Block(name, block, start, end)
+                block.children.append(child)
+                stack.append((block, depth, parens))
+                block, depth, parens, pending = child, 0, [], None
+            elif kind == "close":
+                if not stack:
+                    raise GradleError(f"Unbalanced '}}' at offset {start}")
+                if pending is not None:
+                    block.properties.setdefault(pending.key, pending)
+                block.close_start = start
+                block, depth, parens = stack.pop()
+                pending = None
+            elif depth == 0 and kind in ("newline", "semi"):
+                if pending is not None:
+                    block.properties.setdefault(pending.key, pending)
+                pending = None
+            elif kind == "ident" and depth == 0 and previous in STATEMENT_BOUNDARIES:
+                pending = Property(text[start:end], start)
+                length = 0
+            elif kind == "assign" and pending is not None and length == 1:
+                pending.assign = True
+            if pending is not None and kind not in ("newline", "semi"):
+                pending.end = end
+                length += 1
+            if kind == "ident":
+                last_ident = text[start:end]
+            previous = kind
+        if pending is not None:
+            block.properties.setdefault(pending.key, pending)
+        if stack:
+            raise GradleError(f"Unclosed '{block.name or '{'}' block")
+
+    # === LOOKUPS ===
+    def find_block(self, path):
+        """First block matching the name path, e.g. ``("android", "defaultConfig")``."""
+        block = self.root
+        for name in path:
+            block = next((child for child in block.children if child.name == name), None)
+            if block is None:
+                return None
+        return block
+
+    def property(self, path, key):
+        """Source text of the value of ``key`` in the block at ``path``, or None."""
+        block = self.find_block(path)
+        prop = block.properties.get(key) if block else None
+        if prop is None:
+            return None
+        statement = self.source[prop.start:prop.end]
+        value = statement[len(key):].lstrip()
+        return value[1:].lstrip() if prop.assign else value
+
+    # === EDITS ===
+    def _statement(self, key, value, existing=None):
+        if self.dialect == "groovy" and existing is not None and not existing.assign:
+            return f"{key} {value}"
+        return f"{key} = {value}"
+
+    def _indent_for(self, block):
+        if block.child_indent is not None:
+            return block.child_indent
+        return _line_indent(self.source, block.open_start) + "    "
+
+    def _open_tail(self, block, indent):
+        """Splice that must follow statements inserted after ``block``'s ``{``.
+
+        On a one-line block (``android { compileSdk = 34 }``) the rest of the
+        line moves to a line of its own, so the insert stays a statement.
+        None when nothing but a comment follows the brace.
+        """
+        line_end = self.source.find("\n", block.open_end)
+        line = self.source[block.open_end:len(self.source) if line_end < 0 else line_end]
+        rest = line.lstrip(" \t")
+        if not rest.strip() or rest.startswith("//"):
+            return None
+        end = block.open_end + len(line) - len(rest)
+        if rest.startswith("}"):
+            return block.open_end, end, "\n" + _line_indent(self.source, block.open_start)
+        return block.open_end, end, "\n" + indent
+
+    def set_properties(self, settings):
+        """Set every ``(path, key, value)`` in one batch; ``value`` is Gradle source.
+
+        Existing statements are rewritten in place (keeping the Groovy
+        ``key value`` form where used), missing ones are added at the top of
+        their block, and missing nested blocks under an existing top-level
+        block are created. Returns the text with all edits applied and the
+        number of properties that changed.
+        """
+        splices = []
+        tails = {}
+        missing = {}
+        changed = 0
+        for path, key, value in settings:
+            block = self.find_block(path)
+            if block is None:
+                missing.setdefault(tuple(path), []).append((key, value))
+                continue
+            existing = block.properties.get(key)
+            statement = self._statement(key, value, existing)
+            if existing is not None:
+                if self.source[existing.start:existing.end] != statement:
+                    splices.append((existing.start, existing.end, statement))
+                    changed += 1
+            else:
+                indent = self._indent_for(block)
+                splices.append((block.open_end, block.open_end, f"\n{indent}{statement}"))
+                tails[block.open_end] = self._open_tail(block, indent)
+                changed += 1
+        for path, entries in missing.items():
+            depth = len(path) - 1
+            while depth > 0 and self.find_block(path[:depth]) is None:
+                depth -= 1
+            parent = self.find_block(path[:depth]) if depth else None
+            if parent is None:
+                raise GradleError(f"'{path[0]}' block not found")
+            indent = self._indent_for(parent)
+            step = indent[len(_line_indent(self.source, parent.open_start)):] or "    "
+            lines = []
+            for level, name in enumerate(path[depth:]):
+                lines.append(f"{indent}{step * level}{name} {{")
+            inner = indent + step * (len(path) - depth)
+            lines.extend(f"{inner}{self._statement(key, value)}" for key, value in entries)
+            for level in reversed(range(len(path) - depth)):
+                lines.append(f"{indent}{step * level}}}")
+            splices.append((parent.open_end, parent.open_end, "\n" + "\n".join(lines)))
+            tails[parent.open_end] = self._open_tail(parent, indent)
+            changed += len(entries)
+        # Once per block, after everything inserted there
+        splices.extend(tail for tail in tails.values() if tail)
+        return self._apply(splices), changed
+
+    def _apply(self, splices):
+        parts = []
+        pos = 0
+        for start, end, replacement in sorted(splices, key=lambda s: (s[0], s[1])):
+            parts.append(self.source[pos:start])
+            parts.append(replacement)
+            pos = end
+        parts.append(self.source[pos:])
+        return "".join(parts)
+
+
+def app_gradle_file(project_path):
+    """The app module's build script, preferring the Kotlin DSL; None if absent."""
+    for name in ("build.gradle.kts", "build.gradle"):
+        path = os.path.join(project_path, "android", "app", name)
+        if os.path.exists(path):
+            return path
+    return None
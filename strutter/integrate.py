@@ -0,0 +1,225 @@
+import os
+import re
+
+from . import codegen
+from .core import GENERATED_KEYS, GUARD_KEY
+from .dart import DartFile, DartError
+from . import trace
+from .fileio import FileWriter, UNCHANGED
+
+MAIN_DART = os.path.join("lib", "main.dart")
+DEFAULT_INDENT = "  "
+# Generated methods sit between these markers so a re-run can update them
+# (new mode, new signatures, regenerated plugin names) in place.
+BEGIN_MARKER = "// >>> strutter:{} (generated by STRUTTER; edits are overwritten)"
+END_MARKER = "// <<< strutter:{}"
+IMPORT_MARKER = " // strutter:{}"
+# Marks the dart:io import added for the exit reaction
+DART_IO_KEY = "io"
+
+
+def _marker_block_pattern(key):
+    return re.compile(
+        r"^[ \t]*" + re.escape(BEGIN_MARKER.format(key).split(" (")[0]) + r"[^\n]*\n"
+        r".*?^[ \t]*" + re.escape(END_MARKER.format(key)) + r"[^\n]*\n",
+        re.MULTILINE | re.DOTALL
+    )
+
+def _import_line_pattern(key):
+    return re.compile(r"^import [^\n]*;" + re.escape(IMPORT_MARKER.format(key)) + r"[ \t]*$", re.MULTILINE)
+
+def _remove_import_line(text, key):
+    """Edit removing the marked import line of ``key`` (with its newline), or None."""
+    marked = _import_line_pattern(key).search(text)
+    if not marked:
+        return None
+    # The preceding newline, so an insertion at the end of the line survives
+    if marked.start():
+        return (marked.start() - 1, marked.end(), "")
+    return (0, marked.end() + 1, "")
+
+def _indent_block(code, indent):
+    return "".join(indent + line + "\n" if line.strip() else "\n" for line in code.split("\n"))
+
+def _line_start(text, offset):
+    return text.rfind("\n", 0, offset) + 1
+
+def _line_indent(text, offset):
+    start = _line_start(text, offset)
+    line = text[start:offset]
+    return line[:len(line) - len(line.lstrip())]
+
+def _member_indent(dart, cls):
+    text = dart.text
+    if cls["first_token"] < cls["last_token"]:
+        indent = _line_indent(text, dart.tokens[cls["first_token"]][1])
+        if indent:
+            return indent
+    return _line_indent(text, cls["start"]) + DEFAULT_INDENT
+
+def guard_snippets(config, modes, signatures=()):
+    """One guard dict per generated plugin, in :data:`GENERATED_KEYS` order.
+
+    ``modes`` maps check type to exit, popup or log; the combined guard
+    plugin uses the mode of each check it covers.
+    """
+    guards = []
+    for plugin_type in GENERATED_KEYS:
+        if plugin_type not in config.get("plugins", {}):
+            continue
+        if plugin_type == GUARD_KEY:
+            mode = {key: modes.get(key, "exit") for key in codegen.guard_checks(config)}
+            dart_io = any(m in codegen.EXIT_MODES for m in mode.values())
+        else:
+            mode = modes.get(plugin_type, "exit")
+            dart_io = mode in codegen.EXIT_MODES
+        import_code, method_code, _ = codegen.generate_guard_code(config, plugin_type, mode, signatures)
+        guards.append({
+            "type": plugin_type,
+            "import": import_code,
+            "uri": import_code.split("'")[1],
+            "method": method_code,
+            "call": codegen.GUARD_METHODS[plugin_type],
+            "dart_io": dart_io,
+        })
+    return guards
+
+def patch_main_dart(text, guards, retired=()):
+    """Insert ``guards`` into the first ``State`` class of a Dart library.
+
+    Adds the plugin imports (and a marked ``dart:io`` when a guard calls
+    ``exit``, removed again once none does), the generated methods between STRUTTER markers before the end of the
+    class, and a call to each guard in ``initState`` (created if missing).
+    The marked import, method and call of each ``retired`` plugin type
+    (e.g. the separate plugins after switching to the combined guard) are
+    removed. Running it again on its own output changes nothing. Returns
+    ``(new_text, notes)``; raises :class:`DartError` if no State class exists.
+    """
+    dart = DartFile(text)
+    cls = dart.state_class()
+    if cls is None:
+        raise DartError("no class extending State<...> found")
+    notes = []
+    edits = []
+
+    # Imports
+    imported = {i["uri"] for i in dart.imports}
+    new_imports = []
+    if not any(g["dart_io"] for g in guards):
+        removal = _remove_import_line(text, DART_IO_KEY)
+        if removal:
+            edits.append(removal)
+    elif not any(i["uri"] == "dart:io" and not i["prefix"] and not i["show"] for i in dart.imports):
+        new_imports.append("import 'dart:io';" + IMPORT_MARKER.format(DART_IO_KEY))
+    for guard in guards:
+        wanted = guard["import"] + IMPORT_MARKER.format(guard["type"])
+        marked = _import_line_pattern(guard["type"]).search(text)
+        if marked:
+            if marked.group(0) != wanted:
+                edits.append((marked.start(), marked.end(), wanted))
+        elif guard["uri"] not in imported:
+            new_imports.append(wanted)
+    if new_imports:
+        if dart.imports_end is not None:
+            # After a trailing comment (e.g. an import marker), not before it
+            line_end = text.find("\n", dart.imports_end)
+            line_end = len(text) if line_end < 0 else line_end
+            at = line_end if text[dart.imports_end:line_end].strip().startswith("//") else dart.imports_end
+            edits.append((at, at, "\n" + "\n".join(new_imports)))
+        elif dart.directives_end:
+            edits.append((dart.directives_end, dart.directives_end, "\n\n" + "\n".join(new_imports)))
+        else:
+            edits.append((0, 0, "\n".join(new_imports) + "\n\n"))
+
+    # Guard methods, just before the closing brace of the State class
+    indent = _member_indent(dart, cls)
+    methods = dart.members(cls)
+    close_line = _line_start(text, cls["body_close"])
+    insert_at = close_line if not text[close_line:cls["body_close"]].strip() else cls["body_close"]
+    for guard in guards:
+        block = _indent_block(
+            "\n".join([BEGIN_MARKER.format(guard["type"]), guard["method"], END_MARKER.format(guard["type"])]),
+            indent
+        )
+        existing = _marker_block_pattern(guard["type"]).search(text)
+        if existing:
+            if existing.group(0) != block:
+                edits.append((existing.start(), existing.end(), block))
+        elif guard["call"] in methods:
+            notes.append(f"{guard['call']}() already defined by hand; left as is")
+        else:
+            edits.append((insert_at, insert_at, "\n" + block))
+
+    # initState calls
+    init = methods.get("initState")
+    if init is not None:
+        if init["body_open"] is None:
+            raise DartError("initState() has no block body")
+        start, end = init["body_open"], init["body_close"]
+        missing = [g["call"] for g in guards if not dart.calls(start, end, g["call"])]
+        if missing:
+            anchor = dart.statement_after(start, end, ["super", ".", "initState"]) or start + 1
+            statement = next((t for t in dart.tokens if start < t[1] < end), None)
+            body_indent = _line_indent(text, statement[1]) if statement else indent * 2
+            edits.append((anchor, anchor, "".join(f"\n{body_indent}{call}();" for call in missing)))
+    elif guards:
+        calls = "".join(f"{indent * 2}{g['call']}();\n" for g in guards)
+        init_code = f"{indent}@override\n{indent}void initState() {{\n{indent * 2}super.initState();\n{calls}{indent}}}\n"
+        edits.append((cls["body_open"] + 1, cls["body_open"] + 1, "\n" + init_code))
+
+    # Retired guards. Added last: at a shared offset they apply before the
+    # insertions above.
+    for key in retired:
+        removal = _remove_import_line(text, key)
+        if removal:
+            edits.append(removal)
+        existing = _marker_block_pattern(key).search(text)
+        if not existing:
+            continue
+        start = existing.start() - 1 if text[max(existing.start() - 2, 0):existing.start()] == "\n\n" else existing.start()
+        edits.append((start, existing.end(), ""))
+        if init is not None and init["body_open"] is not None:
+            call = re.compile(r"\n[ \t]*" + re.escape(codegen.GUARD_METHODS[key]) + r"\(\);[ \t]*(?=\n)")
+            found = call.search(text, init["body_open"], init["body_close"])
+            if found:
+                edits.append((found.start(), found.end(), ""))
+        notes.append(f"removed the {key} guard (plugin no longer generated)")
+
+    # Back to front; insertions at the same offset keep their order.
+    for _, (start, end, replacement) in sorted(enumerate(edits), key=lambda e: (e[1][0], e[0]), reverse=True):
+        text = text[:start] + replacement + text[end:]
+    return text, notes
+
+def integrate_main_dart(config, modes, signatures=(), writer=None):
+    """Patch the project's ``lib/main.dart`` with every generated guard.
+
+    Headless counterpart of the integration guide: see
+    :func:`patch_main_dart`. Returns ``(ok, message)``.
+    """
+    if not config or "flutter_project" not in config:
+        return False, "Flutter project not set."
+    if not config.get("plugins"):
+        return False, "No plugins generated yet."
+    main_path = os.path.join(config["flutter_project"], MAIN_DART)
+    if not os.path.exists(main_path):
+        return False, f"{MAIN_DART} not found in project."
+    if codegen.plugin_for(config, "integrity") and not any(s.strip() for s in signatures):
+        return False, "Integrity guard needs at least one APK signature."
+    guards = guard_snippets(config, modes, signatures)
+    try:
+        with trace.span("patch_main_dart", "phase"), open(main_path, "r", encoding="utf-8") as f:
+            retired = [key for key in GENERATED_KEYS if key not in config["plugins"]]
+            content, notes = patch_main_dart(f.read(), guards, retired)
+    except DartError as e:
+        return False, f"Cannot patch {MAIN_DART}: {str(e)}"
+    except Exception as e:
+        return False, f"Failed to read {MAIN_DART}: {str(e)}"
+    writer = writer or FileWriter()
+    try:
+        status = writer.write_text(main_path, content)
+    except Exception as e:
+        return False, f"Failed to write {MAIN_DART}: {str(e)}"
+    names = ", ".join(g["type"] for g in guards)
+    msg = (f"✓ Guards already integrated ({names}) in:\n  {main_path}" if status == UNCHANGED
+           else f"✓ Guards integrated ({names}) in:\n  {main_path}")
+    return True, "\n".join([msg] + [f"  Note: {note}" for note in notes])
@@ -0,0 +1,265 @@
+import os
+import struct
+import hashlib
+
+from . import asn1
+from . import pbe
+from .signing import certificate_digest_base64
+
+# JKS / JCEKS: https://github.com/openjdk/jdk/blob/master/src/java.base/share/classes/sun/security/provider/JavaKeyStore.java
+JKS_MAGIC = 0xFEEDFEED
+JCEKS_MAGIC = 0xCECECECE
+JKS_PRIVATE_KEY = 1
+JKS_TRUSTED_CERT = 2
+JKS_SECRET_KEY = 3
+JKS_DIGEST_WHITENER = b"Mighty Aphrodite"
+KEYSTORE_SUFFIXES = (".jks", ".keystore", ".p12", ".pfx")
+PASSWORD_ENV = "STRUTTER_KEYSTORE_PASSWORD"
+
+# PKCS#12 (RFC 7292)
+OID_DATA = "1.2.840.113549.1.7.1"
+OID_ENCRYPTED_DATA = "1.2.840.113549.1.7.6"
+OID_KEY_BAG = "1.2.840.113549.1.12.10.1.1"
+OID_SHROUDED_KEY_BAG = "1.2.840.113549.1.12.10.1.2"
+OID_CERT_BAG = "1.2.840.113549.1.12.10.1.3"
+OID_SAFE_CONTENTS_BAG = "1.2.840.113549.1.12.10.1.6"
+OID_X509_CERTIFICATE = "1.2.840.113549.1.9.22.1"
+OID_FRIENDLY_NAME = "1.2.840.113549.1.9.20"
+OID_LOCAL_KEY_ID = "1.2.840.113549.1.9.21"
+
+PRIVATE_KEY_ENTRY = "PrivateKeyEntry"
+TRUSTED_CERT_ENTRY = "trustedCertEntry"
+
+
+class KeystoreError(Exception):
+    pass
+
+
+def _entry(alias, entry_type, cert):
+    digest = hashlib.sha256(cert).hexdigest()
+    return {"alias": alias, "type": entry_type, "sha256": digest, "base64": certificate_digest_base64(cert)}
+
+# === JKS / JCEKS ===
+class _Reader:
+    def __init__(self, data):
+        self.data = data
+        self.offset = 0
+
+    def take(self, size):
+        if self.offset + size > len(self.data):
+            raise KeystoreError("Truncated keystore")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += size
+        return chunk
+
+    def u16(self):
+        return struct.unpack(">H", self.take(2))[0]
+
+    def u32(self):
+        return struct.unpack(">I", self.take(4))[0]
+
+    def utf(self):
+        # Java DataOutput.writeUTF: modified UTF-8 (NUL as C0 80, surrogate pairs).
+        raw = self.take(self.u16()).replace(b"\xc0\x80", b"\x00")
+        return raw.decode("utf-8", errors="surrogatepass").encode("utf-16", "surrogatepass").decode("utf-16")
+
+def parse_jks(data, password=None):
+    """Entries of a JKS or JCEKS keystore.
+
+    Certificates are stored in the clear, so no password is needed to list
+    them; when one is given the keystore's integrity digest is checked.
+    """
+    reader = _Reader(data)
+    magic = reader.u32()
+    if magic not in (JKS_MAGIC, JCEKS_MAGIC):
+        raise KeystoreError("Not a JKS/JCEKS keystore")
+    version = reader.u32()
+    if version not in (1, 2):
+        raise KeystoreError(f"Unsupported JKS version: {version}")
+
+    def certificate():
+        if version == 2:
+            cert_type = reader.utf()
+            if cert_type != "X.509":
+                raise KeystoreError(f"Unsupported certificate type: {cert_type}")
+        return reader.take(reader.u32())
+
+    entries = []
+    for _ in range(reader.u32()):
+        tag = reader.u32()
+        alias = reader.utf()
+        reader.take(8)  # creation date
+        if tag == JKS_PRIVATE_KEY:
+            reader.take(reader.u32())  # encrypted private key
+            chain = [certificate() for _ in range(reader.u32())]
+            if chain:
+                entries.append(_entry(alias, PRIVATE_KEY_ENTRY, chain[0]))
+        elif tag == JKS_TRUSTED_CERT:
+            entries.append(_entry(alias, TRUSTED_CERT_ENTRY, certificate()))
+        elif tag == JKS_SECRET_KEY:
+            # Serialized Java objects; their length is not recorded.
+            raise KeystoreError(f"JCEKS secret key entry '{alias}' is not supported")
+        else:
+            raise KeystoreError(f"Unknown keystore entry tag: {tag}")
+    if password is not None:
+        expected = reader.take(20)
+        digest = hashlib.sha1(password.encode("utf-16-be") + JKS_DIGEST_WHITENER + data[:reader.offset - 20]).digest()
+        if digest != expected:
+            raise KeystoreError("Keystore password was incorrect (integrity check failed)")
+    return entries
+
+# === PKCS#12 ===
+def _oid(buf, item):
+    return asn1.decode_oid(asn1.content(buf, item))
+
+def _content_info(buf, item, password):
+    """Bytes of a ContentInfo's payload: plain data or decrypted encryptedData."""
+    fields = asn1.children(buf, item[2], item[3])
+    content_type = _oid(buf, fields[0])
+    explicit = asn1.children(buf, fields[1][2], fields[1][3])[0]
+    if content_type == OID_DATA:
+        return asn1.content(buf, explicit)
+    if content_type != OID_ENCRYPTED_DATA:
+        raise KeystoreError(f"Unsupported PKCS#12 content type: {content_type}")
+    encrypted_content_info = asn1.children(buf, explicit[2], explicit[3])[1]
+    _, algorithm, encrypted = asn1.children(buf, encrypted_content_info[2], encrypted_content_info[3])[:3]
+    if password is None:
+        raise KeystoreError("A password is required to read the certificates of this keystore")
+    if encrypted[0] == asn1.CONTEXT_0:
+        ciphertext = b"".join(asn1.content(buf, c) for c in asn1.children(buf, encrypted[2], encrypted[3]))
+    else:
+        ciphertext = asn1.content(buf, encrypted)
+    try:
+        return pbe.decrypt(asn1.encoded(buf, algorithm), password, ciphertext)
+    except pbe.PBEError as e:
+        raise KeystoreError(str(e))
+
+def _bag_attributes(buf, item):
+    attributes = {}
+    for attribute in asn1.children(buf, item[2], item[3]):
+        oid_item, values = asn1.children(buf, attribute[2], attribute[3])[:2]
+        value = asn1.children(buf, values[2], values[3])[0]
+        oid = _oid(buf, oid_item)
+        if oid == OID_FRIENDLY_NAME and value[0] == asn1.BMP_STRING:
+            attributes["alias"] = asn1.content(buf, value).decode("utf-16-be")
+        elif oid == OID_LOCAL_KEY_ID:
+            attributes["local_key_id"] = asn1.content(buf, value)
+    return attributes
+
+def _safe_bags(buf, start, end, keys, certs):
+    for bag in asn1.children(buf, start, end):
+        fields = asn1.children(buf, bag[2], bag[3])
+        bag_id = _oid(buf, fields[0])
+        value = asn1.children(buf, fields[1][2], fields[1][3])[0]
+        attributes = _bag_attributes(buf, fields[2]) if len(fields) > 2 else {}
+        if bag_id in (OID_KEY_BAG, OID_SHROUDED_KEY_BAG):
+            keys.append(attributes)
+        elif bag_id == OID_CERT_BAG:
+            cert_fields = asn1.children(buf, value[2], value[3])
+            if _oid(buf, cert_fields[0]) == OID_X509_CERTIFICATE:
+                cert = asn1.children(buf, cert_fields[1][2], cert_fields[1][3])[0]
+                certs.append((attributes, asn1.content(buf, cert)))
+        elif bag_id == OID_SAFE_CONTENTS_BAG:
+            _safe_bags(buf, value[2], value[3], keys, certs)
+
+def _verify_mac(buf, mac_data, auth_safe, password):
+    fields = asn1.children(buf, mac_data[2], mac_data[3])
+    digest_info = asn1.children(buf, fields[0][2], fields[0][3])
+    algorithm = _oid(buf, asn1.children(buf, digest_info[0][2], digest_info[0][3])[0])
+    if algorithm not in pbe.DIGEST_OIDS:
+        raise KeystoreError(f"Unsupported PKCS#12 MAC algorithm: {algorithm}")
+    expected = asn1.content(buf, digest_info[1])
+    salt = asn1.content(buf, fields[1])
+    iterations = asn1.decode_int(asn1.content(buf, fields[2])) if len(fields) > 2 else 1
+    if pbe.pkcs12_mac(password, salt, iterations, auth_safe, pbe.DIGEST_OIDS[algorithm]) != expected:
+        raise KeystoreError("Keystore password was incorrect (MAC verification failed)")
+
+def parse_pkcs12(data, password=None):
+    """Entries of a PKCS#12 keystore (.p12/.pfx, the JDK 9+ keytool default).
+
+    Key entries are matched to their certificate through ``localKeyId`` and
+    named by ``friendlyName``. The password verifies the MAC and decrypts the
+    certificate bags; keys themselves are never decrypted.
+    """
+    try:
+        _, start, end = asn1.element(data, 0)
+        pfx = asn1.children(data, start, end)
+        auth_safe_info = asn1.children(data, pfx[1][2], pfx[1][3])
+        if _oid(data, auth_safe_info[0]) != OID_DATA:
+            raise KeystoreError("Public-key protected PKCS#12 files are not supported")
+        auth_safe = asn1.content(data, asn1.children(data, auth_safe_info[1][2], auth_safe_info[1][3])[0])
+        if password is not None and len(pfx) > 2:
+            _verify_mac(data, pfx[2], auth_safe, password)
+        keys, certs = [], []
+        _, start, end = asn1.element(auth_safe, 0)
+        for item in asn1.children(auth_safe, start, end):
+            safe_contents = _content_info(auth_safe, item, password)
+            _, bags_start, bags_end = asn1.element(safe_contents, 0)
+            _safe_bags(safe_contents, bags_start, bags_end, keys, certs)
+    except (IndexError, ValueError) as e:
+        raise KeystoreError(f"Malformed PKCS#12 keystore: {e}")
+
+    entries = []
+    used = set()
+    for number, key in enumerate(keys, start=1):
+        match = next((i for i, (attrs, _) in enumerate(certs)
+                      if "local_key_id" in key and attrs.get("local_key_id") == key["local_key_id"]), None)
+        if match is None and len(keys) == 1 and len(certs) >= 1:
+            match = 0
+        if match is not None:
+            used.add(match)
+            entries.append(_entry(key.get("alias") or str(number), PRIVATE_KEY_ENTRY, certs[match][1]))
+    for i, (attrs, cert) in enumerate(certs):
+        # Chain certificates carry no friendlyName; named ones are trusted entries.
+        if i not in used and "alias" in attrs:
+            entries.append(_entry(attrs["alias"], TRUSTED_CERT_ENTRY, cert))
+    return entries
+
+# === ENTRY POINTS ===
+def keystore_type(data):
+    if len(data) >= 4 and struct.unpack_from(">I", data)[0] in (JKS_MAGIC, JCEKS_MAGIC):
+        return "jks"
+    if data[:1] == bytes([asn1.SEQUENCE]):
+        return "pkcs12"
+    return None
+
+def is_keystore(path):
+    """True for files named like a keystore or starting with a keystore magic."""
+    if path.lower().endswith(KEYSTORE_SUFFIXES):
+        return True
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4)
+    except OSError:
+        return False
+    return len(head) == 4 and struct.unpack(">I", head)[0] in (JKS_MAGIC, JCEKS_MAGIC)
+
+def keystore_entries(path, password=None):
+    """``[{"alias", "type", "sha256", "base64"}, ...]`` for every keystore entry.
+
+    ``base64`` is the SHA-256 certificate digest in the form the integrity
+    plugin's signatures list expects. JKS, JCEKS and PKCS#12 are read
+    directly; no keytool/JDK is needed.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    kind = keystore_type(data)
+    if kind == "jks":
+        return parse_jks(data, password)
+    if kind == "pkcs12":
+        return parse_pkcs12(data, password)
+    raise KeystoreError(f"Unrecognized keystore format: {os.path.basename(path)}")
+
+def signing_digests(results):
+    """Unique Base64 digests, in order, for the integrity plugin's signatures list.
+
+    Takes :func:`keystore_entries` and/or ``scan_artifacts`` results; trusted
+    certificate entries and errors are skipped since they never sign an APK.
+    """
+    digests = []
+    for result in results:
+        if result.get("type") == TRUSTED_CERT_ENTRY or "base64" not in result:
+            continue
+        if result["base64"] not in digests:
+            digests.append(result["base64"])
+    return digests
@@ -0,0 +1,281 @@
+# Password-based decryption for PKCS#12 keystores (RFC 7292 / RFC 8018).
+# Only decryption is needed (certificates are read, never written), and it
+# runs on a few KB per keystore, so plain Python is fast enough.
+import hmac
+import hashlib
+
+from . import asn1
+
+OID_PBE_SHA1_RC2_128 = "1.2.840.113549.1.12.1.5"
+OID_PBE_SHA1_RC2_40 = "1.2.840.113549.1.12.1.6"
+OID_PBE_SHA1_3DES = "1.2.840.113549.1.12.1.3"
+OID_PBES2 = "1.2.840.113549.1.5.13"
+OID_PBKDF2 = "1.2.840.113549.1.5.12"
+PBKDF2_PRFS = {
+    "1.2.840.113549.2.7": "sha1",
+    "1.2.840.113549.2.8": "sha224",
+    "1.2.840.113549.2.9": "sha256",
+    "1.2.840.113549.2.10": "sha384",
+    "1.2.840.113549.2.11": "sha512",
+}
+AES_CBC_KEY_SIZES = {
+    "2.16.840.1.101.3.4.1.2": 16,
+    "2.16.840.1.101.3.4.1.22": 24,
+    "2.16.840.1.101.3.4.1.42": 32,
+}
+# PKCS#12 PBE: (effective key bits, key bytes)
+PKCS12_RC2 = {
+    OID_PBE_SHA1_RC2_40: 5,
+    OID_PBE_SHA1_RC2_128: 16,
+}
+DIGEST_OIDS = {
+    "1.3.14.3.2.26": "sha1",
+    "2.16.840.1.101.3.4.2.4": "sha224",
+    "2.16.840.1.101.3.4.2.1": "sha256",
+    "2.16.840.1.101.3.4.2.2": "sha384",
+    "2.16.840.1.101.3.4.2.3": "sha512",
+}
+KDF_KEY = 1
+KDF_IV = 2
+KDF_MAC = 3
+
+
+class PBEError(Exception):
+    pass
+
+
+def pkcs12_password(password):
+    """Password as PKCS#12 expects it: BMPString with a trailing NUL."""
+    return password.encode("utf-16-be") + b"\x00\x00"
+
+def pkcs12_kdf(password, salt, iterations, purpose, size, hash_name="sha1"):
+    """Key derivation of RFC 7292 appendix B.2 (``password`` already in BMP form)."""
+    digest_size = hashlib.new(hash_name).digest_size
+    v = hashlib.new(hash_name).block_size
+    D = bytes([purpose]) * v
+    def fill(data):
+        if not data:
+            return b""
+        count = -(-len(data) // v) * v
+        return (data * (count // len(data) + 1))[:count]
+    I = bytearray(fill(salt) + fill(password))
+    out = b""
+    while len(out) < size:
+        A = hashlib.new(hash_name, D + bytes(I)).digest()
+        for _ in range(iterations - 1):
+            A = hashlib.new(hash_name, A).digest()
+        out += A
+        B = int.from_bytes((A * (v // digest_size + 1))[:v], "big") + 1
+        for j in range(0, len(I), v):
+            block = (int.from_bytes(I[j:j + v], "big") + B) % (1 << (8 * v))
+            I[j:j + v] = block.to_bytes(v, "big")
+    return out[:size]
+
+def pkcs12_mac(password, salt, iterations, data, hash_name="sha1"):
+    size = hashlib.new(hash_name).digest_size
+    key = pkcs12_kdf(pkcs12_password(password), salt, iterations, KDF_MAC, size, hash_name)
+    return hmac.new(key, data, hash_name).digest()
+
+def _unpad(data, block_size):
+    if not data or len(data) % block_size:
+        raise PBEError("Ciphertext is not a whole number of blocks")
+    pad = data[-1]
+    if not 1 <= pad <= block_size or data[-pad:] != bytes([pad]) * pad:
+        raise PBEError("Bad padding (wrong password?)")
+    return data[:-pad]
+
+def _cbc_decrypt(decrypt_block, block_size, iv, data):
+    if len(data) % block_size:
+        raise PBEError("Ciphertext is not a whole number of blocks")
+    out = bytearray()
+    previous = iv
+    for i in range(0, len(data), block_size):
+        block = data[i:i + block_size]
+        out += bytes(a ^ b for a, b in zip(decrypt_block(block), previous))
+        previous = block
+    return _unpad(bytes(out), block_size)
+
+# === AES (FIPS-197), decryption only ===
+def _xtime(a):
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
+
+def _gmul(a, b):
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = _xtime(a)
+        b >>= 1
+    return result
+
+def _build_sbox():
+    sbox = [0] * 256
+    for x in range(256):
+        inv = 0
+        if x:
+            inv = next(y for y in range(1, 256) if _gmul(x, y) == 1)
+        s = inv
+        for shift in range(1, 5):
+            s ^= ((inv << shift) | (inv >> (8 - shift))) & 0xFF
+        sbox[x] = s ^ 0x63
+    inv_sbox = [0] * 256
+    for x, s in enumerate(sbox):
+        inv_sbox[s] = x
+    return sbox, inv_sbox
+
+_AES_TABLES = None
+
+def _aes_tables():
+    global _AES_TABLES
+    if _AES_TABLES is None:
+        sbox, inv_sbox = _build_sbox()
+        mul = {n: [_gmul(x, n) for x in range(256)] for n in (9, 11, 13, 14)}
+        _AES_TABLES = sbox, inv_sbox, mul
+    return _AES_TABLES
+
+def _aes_round_keys(key):
+    sbox = _aes_tables()[0]
+    nk = len(key) // 4
+    rounds = nk + 6
+    words = [list(key[4 * i:4 * i + 4]) for i in range(nk)]
+    rcon = 1
+    for i in range(nk, 4 * (rounds + 1)):
+        temp = list(words[i - 1])
+        if i % nk == 0:
+            temp = [sbox[b] for b in temp[1:] + temp[:1]]
+            temp[0] ^= rcon
+            rcon = _xtime(rcon)
+        elif nk > 6 and i % nk == 4:
+            temp = [sbox[b] for b in temp]
+        words.append([a ^ b for a, b in zip(words[i - nk], temp)])
+    return [sum(words[4 * r:4 * r + 4], []) for r in range(rounds + 1)]
+
+def _aes_block_decryptor(key):
+    """Single-block AES decryption under ``key`` (16-byte blocks in and out)."""
+    if len(key) not in (16, 24, 32):
+        raise PBEError(f"Invalid AES key length: {len(key)}")
+    _, inv_sbox, mul = _aes_tables()
+    m9, m11, m13, m14 = mul[9], mul[11], mul[13], mul[14]
+    round_keys = _aes_round_keys(key)
+    rounds = len(round_keys) - 1
+
+    def decrypt_block(block):
+        # State is column-major: s[4 * column + row].
+        s = [a ^ b for a, b in zip(block, round_keys[rounds])]
+        for r in range(rounds - 1, -1, -1):
+            # InvShiftRows + InvSubBytes
+            s = [inv_sbox[s[(4 * (c - row) + row) % 16]] for c in range(4) for row in range(4)]
+            s = [a ^ b for a, b in zip(s, round_keys[r])]
+            if r:
+                mixed = []
+                for c in range(4):
+                    a0, a1, a2, a3 = s[4 * c:4 * c + 4]
+                    mixed += [
+                        m14[a0] ^ m11[a1] ^ m13[a2] ^ m9[a3],
+                        m9[a0] ^ m14[a1] ^ m11[a2] ^ m13[a3],
+                        m13[a0] ^ m9[a1] ^ m14[a2] ^ m11[a3],
+                        m11[a0] ^ m13[a1] ^ m9[a2] ^ m14[a3],
+                    ]
+                s = mixed
+        return bytes(s)
+
+    return decrypt_block
+
+def aes_cbc_decrypt(key, iv, data):
+    return _cbc_decrypt(_aes_block_decryptor(key), 16, iv, data)
+
+# === RC2 (RFC 2268), decryption only ===
+RC2_PITABLE = bytes.fromhex(
+    "d978f9c419ddb5ed28e9fd794aa0d89dc67e37832b76538e624c6488448bfba2"
+    "179a59f587b34f1361456d8d09817d32bd8f40eb86b77b0bf09521225c6b4e82"
+    "54d66593ce60b21c7356c014a78cf1dc1275ca1f3bbee4d1423dd430a33cb626"
+    "6fbf0eda4669075727f21d9bbc944303f811c7f690ef3ee706c3d52fc8661ed7"
+    "08e8eade8052eef784aa72ac354d6a2a961ad2715a1549744b9fd05e0418a4ec"
+    "c2e0416e0f51cbcc2491af50a1f47039997c3a8523b8b47afc02365b25559731"
+    "2d5dfa98e38a92ae05df2910676cbac9d300e6cfe19ea82c6316013f58e289a9"
+    "0d38341bab33ffb0bb480c5fb9b1cd2ec5f3db47e5a59c770aa62068fe7fc1ad"
+)
+
+def _rc2_key_schedule(key, effective_bits):
+    t = len(key)
+    t8 = (effective_bits + 7) // 8
+    tm = 255 % (1 << (8 + effective_bits - 8 * t8))
+    L = bytearray(key) + bytearray(128 - t)
+    for i in range(t, 128):
+        L[i] = RC2_PITABLE[(L[i - 1] + L[i - t]) & 0xFF]
+    L[128 - t8] = RC2_PITABLE[L[128 - t8] & tm]
+    for i in range(127 - t8, -1, -1):
+        L[i] = RC2_PITABLE[L[i + 1] ^ L[i + t8]]
+    return [L[2 * i] | (L[2 * i + 1] << 8) for i in range(64)]
+
+def _rc2_block_decryptor(key, effective_bits):
+    """Single-block RC2 decryption (8-byte blocks in and out)."""
+    K = _rc2_key_schedule(key, effective_bits)
+    shifts = (1, 2, 3, 5)
+
+    def decrypt_block(block):
+        R = [block[2 * i] | (block[2 * i + 1] << 8) for i in range(4)]
+        j = 63
+        for r in range(16):
+            for i in (3, 2, 1, 0):
+                s = shifts[i]
+                R[i] = ((R[i] >> s) | (R[i] << (16 - s))) & 0xFFFF
+                R[i] = (R[i] - K[j] - (R[i - 1] & R[i - 2]) - (~R[i - 1] & R[i - 3])) & 0xFFFF
+                j -= 1
+            if r in (4, 10):
+                for i in (3, 2, 1, 0):
+                    R[i] = (R[i] - K[R[i - 1] & 63]) & 0xFFFF
+        return b"".join(w.to_bytes(2, "little") for w in R)
+
+    return decrypt_block
+
+def rc2_cbc_decrypt(key, effective_bits, iv, data):
+    return _cbc_decrypt(_rc2_block_decryptor(key, effective_bits), 8, iv, data)
+
+# === ALGORITHM DISPATCH ===
+def decrypt(algorithm, password, data):
+    """Decrypt ``data`` with a PKCS#12/PKCS#5 AlgorithmIdentifier (DER bytes).
+
+    Supports the PKCS#12 SHA-1/RC2 schemes (``openssl pkcs12 -legacy`` and
+    older Java) and PBES2 with PBKDF2 and AES-CBC (current OpenSSL and Java).
+    """
+    try:
+        _, start, end = asn1.element(algorithm, 0)
+        fields = asn1.children(algorithm, start, end)
+        oid = asn1.decode_oid(asn1.content(algorithm, fields[0]))
+        if oid in PKCS12_RC2:
+            salt_item, iterations_item = asn1.children(algorithm, fields[1][2], fields[1][3])[:2]
+            salt = asn1.content(algorithm, salt_item)
+            iterations = asn1.decode_int(asn1.content(algorithm, iterations_item))
+            secret = pkcs12_password(password)
+            key = pkcs12_kdf(secret, salt, iterations, KDF_KEY, PKCS12_RC2[oid])
+            iv = pkcs12_kdf(secret, salt, iterations, KDF_IV, 8)
+            return rc2_cbc_decrypt(key, 8 * PKCS12_RC2[oid], iv, data)
+        if oid == OID_PBES2:
+            kdf, scheme = asn1.children(algorithm, fields[1][2], fields[1][3])[:2]
+            kdf_fields = asn1.children(algorithm, kdf[2], kdf[3])
+            if asn1.decode_oid(asn1.content(algorithm, kdf_fields[0])) != OID_PBKDF2:
+                raise PBEError("Unsupported PBES2 key derivation function")
+            params = asn1.children(algorithm, kdf_fields[1][2], kdf_fields[1][3])
+            salt = asn1.content(algorithm, params[0])
+            iterations = asn1.decode_int(asn1.content(algorithm, params[1]))
+            prf = "sha1"
+            for item in params[2:]:
+                if item[0] == asn1.SEQUENCE:
+                    prf_oid = asn1.decode_oid(asn1.content(algorithm, asn1.children(algorithm, item[2], item[3])[0]))
+                    if prf_oid not in PBKDF2_PRFS:
+                        raise PBEError(f"Unsupported PBKDF2 PRF: {prf_oid}")
+                    prf = PBKDF2_PRFS[prf_oid]
+            scheme_fields = asn1.children(algorithm, scheme[2], scheme[3])
+            cipher = asn1.decode_oid(asn1.content(algorithm, scheme_fields[0]))
+            if cipher not in AES_CBC_KEY_SIZES:
+                raise PBEError(f"Unsupported PBES2 cipher: {cipher}")
+            iv = asn1.content(algorithm, scheme_fields[1])
+            key = hashlib.pbkdf2_hmac(prf, password.encode("utf-8"), salt, iterations, AES_CBC_KEY_SIZES[cipher])
+            return aes_cbc_decrypt(key, iv, data)
+    except (IndexError, ValueError) as e:
+        raise PBEError(f"Malformed encryption parameters: {e}")
+    if oid == OID_PBE_SHA1_3DES:
+        raise PBEError("3DES-encrypted keystores are not supported; re-export with AES (OpenSSL 3 default)")
+    raise PBEError(f"Unsupported encryption algorithm: {oid}")
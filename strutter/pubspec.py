@@ -0,0 +1,267 @@
+import os
+import re
+
+# Sections that map package names to version constraints or sources.
+DEPENDENCY_SECTIONS = ("dependencies", "dev_dependencies", "dependency_overrides")
+
+KEY_PATTERN = re.compile(r"""^(\s*)(?:"([^"]+)"|'([^']+)'|([A-Za-z_][\w.-]*))\s*:(?:\s+(.*?))?\s*$""")
+ITEM_PATTERN = re.compile(r"^(\s*)-\s+(.*?)\s*$")
+FLOW_PATH_PATTERN = re.compile(r"""\bpath\s*:\s*("[^"]*"|'[^']*'|[^,}\s]+)""")
+EMPTY_VALUES = ("", "{}", "~", "null")
+
+
+class PubspecError(Exception):
+    pass
+
+
+class Dependency:
+    """One entry of a dependency section, as a range of source lines."""
+
+    def __init__(self, name, section, start, end, indent, value):
+        self.name = name
+        self.section = section
+        self.start = start
+        self.end = end
+        self.indent = indent
+        self.value = value
+        self.path = None
+
+
+def _strip_comment(value):
+    # A '#' only starts a comment at the beginning or after whitespace.
+    if value is None:
+        return ""
+    quote = None
+    for i, ch in enumerate(value):
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch == "#" and (i == 0 or value[i - 1] in " \t"):
+            return value[:i].rstrip()
+    return value.strip()
+
+def _unquote(value):
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    return value
+
+def _is_content(line):
+    stripped = line.strip()
+    return bool(stripped) and not stripped.startswith("#")
+
+def _indent_of(line):
+    return len(line) - len(line.lstrip(" "))
+
+def _match_key(line):
+    match = KEY_PATTERN.match(line.rstrip("\r\n"))
+    if not match:
+        return None
+    indent, dq, sq, plain, value = match.groups()
+    return len(indent), dq or sq or plain, _strip_comment(value)
+
+
+class Pubspec:
+    """Round-trip model of a pubspec.yaml.
+
+    The file is kept as its original lines; parsing only builds an index of
+    top-level sections, dependency entries (by section and by name) and
+    workspace members. Edits replace or insert whole entry blocks, so
+    comments, blank lines, key order and formatting everywhere else are left
+    exactly as they were. Only the block-style YAML that pubspecs use in
+    practice is understood; anything else raises :class:`PubspecError` when
+    an edit would need it.
+    """
+
+    def __init__(self, text):
+        self.lines = text.splitlines(True)
+        self._index()
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(f.read())
+
+    def text(self):
+        return "".join(self.lines)
+
+    # === INDEX ===
+    def _index(self):
+        self.sections = {}
+        self.section_values = {}
+        self.entries = {section: {} for section in DEPENDENCY_SECTIONS}
+        self.by_name = {}
+        self.workspace = []
+        current = None
+        for i, line in enumerate(self.lines):
+            if not _is_content(line) or line[0] in " \t":
+                continue
+            key = _match_key(line)
+            if key is None or key[0] != 0:
+                continue
+            if current is not None:
+                self.sections[current] = (self.sections[current][0], self._content_end(i))
+            current = key[1]
+            self.sections[current] = (i, len(self.lines))
+            self.section_values[current] = key[2]
+        if current is not None:
+            self.sections[current] = (self.sections[current][0], self._content_end(len(self.lines)))
+        for section in DEPENDENCY_SECTIONS:
+            if section in self.sections:
+                self._index_dependencies(section)
+        if "workspace" in self.sections:
+            self._index_workspace()
+
+    def _content_end(self, stop):
+        # Trailing blank lines and comments belong to whatever follows.
+        while stop > 0 and not _is_content(self.lines[stop - 1]):
+            stop -= 1
+        return stop
+
+    def _index_dependencies(self, section):
+        start, end = self.sections[section]
+        child_indent = None
+        entry = None
+        field_indent = None
+        for i in range(start + 1, end):
+            line = self.lines[i]
+            if not _is_content(line):
+                continue
+            indent = _indent_of(line)
+            if child_indent is None:
+                child_indent = indent
+            if indent == child_indent:
+                key = _match_key(line)
+                if key is None:
+                    raise PubspecError(f"Unsupported syntax in '{section}' at line {i + 1}")
+                entry = Dependency(key[1], section, i, i + 1, indent, key[2])
+                field_indent = None
+                flow = FLOW_PATH_PATTERN.search(key[2]) if key[2].startswith("{") else None
+                if flow:
+                    entry.path = _unquote(flow.group(1))
+                self.entries[section][entry.name] = entry
+                self.by_name.setdefault(entry.name, []).append(entry)
+            elif indent > child_indent and entry is not None:
+                entry.end = i + 1
+                if field_indent is None:
+                    field_indent = indent
+                key = _match_key(line) if indent == field_indent else None
+                if key and key[1] == "path" and not entry.value:
+                    entry.path = _unquote(key[2])
+            else:
+                raise PubspecError(f"Unexpected indentation in '{section}' at line {i + 1}")
+
+    def _index_workspace(self):
+        start, end = self.sections["workspace"]
+        for i in range(start + 1, end):
+            match = ITEM_PATTERN.match(self.lines[i].rstrip("\r\n"))
+            if match:
+                self.workspace.append(_unquote(_strip_comment(match.group(2))))
+
+    # === LOOKUPS ===
+    def dependency(self, name, section="dependencies"):
+        """The :class:`Dependency` for ``name`` in ``section``, or None."""
+        return self.entries[section].get(name)
+
+    def sections_of(self, name):
+        """Names of every dependency section that declares ``name``."""
+        return [entry.section for entry in self.by_name.get(name, ())]
+
+    def child_keys(self, section):
+        """Keys directly under a top-level section (e.g. ``flutter``), in order."""
+        if section not in self.sections:
+            return []
+        start, end = self.sections[section]
+        keys = []
+        child_indent = None
+        for i in range(start + 1, end):
+            if not _is_content(self.lines[i]):
+                continue
+            indent = _indent_of(self.lines[i])
+            child_indent = indent if child_indent is None else child_indent
+            key = _match_key(self.lines[i]) if indent == child_indent else None
+            if key:
+                keys.append(key[1])
+        return keys
+
+    def has_path_dependency(self, name, path, section="dependencies"):
+        entry = self.entries[section].get(name)
+        return entry is not None and entry.path is not None and entry.path.rstrip("/") == path.rstrip("/")
+
+    def child_indent(self, section):
+        entries = self.entries.get(section)
+        if entries:
+            return next(iter(entries.values())).indent
+        return 2
+
+    # === EDITS ===
+    def set_path_dependencies(self, dependencies, section="dependencies"):
+        """Point every ``(name, path)`` at a local path in one batch.
+
+        Existing entries with another source are replaced in place; new ones
+        are appended to the end of the section (created if missing). Returns
+        the number of entries that changed.
+        """
+        if section in self.sections and self.section_values[section] not in EMPTY_VALUES:
+            raise PubspecError(f"'{section}' uses flow style, which is not supported")
+        indent = " " * self.child_indent(section)
+        replacements = {}
+        appended = []
+        for name, path in dependencies:
+            if self.has_path_dependency(name, path, section):
+                continue
+            block = [f"{indent}{name}:\n", f"{indent}{indent}path: {path}\n"]
+            entry = self.entries[section].get(name)
+            if entry is not None:
+                replacements[entry.start] = (entry.end, block)
+            else:
+                appended.extend(block)
+        changed = len(replacements) + len(appended) // 2
+        if not changed:
+            return 0
+        if section in self.sections:
+            start, end = self.sections[section]
+            if self.section_values[section]:
+                self.lines[start] = f"{section}:\n"
+            if appended:
+                replacements[end] = (end, appended)
+        else:
+            header = [f"{section}:\n"]
+            if self.lines and _is_content(self.lines[-1]):
+                header.insert(0, "\n")
+            replacements[len(self.lines)] = (len(self.lines), header + appended)
+        new_lines = []
+        pos = 0
+        for start in sorted(replacements):
+            end, block = replacements[start]
+            new_lines.extend(self.lines[pos:start])
+            if new_lines and not new_lines[-1].endswith("\n"):
+                new_lines[-1] += "\n"
+            new_lines.extend(block)
+            pos = end
+        new_lines.extend(self.lines[pos:])
+        self.lines = new_lines
+        self._index()
+        return changed
+
+    def remove_dependencies(self, names, section="dependencies"):
+        """Drop the given entries from ``section``; returns how many were removed."""
+        drop = [self.entries[section][name] for name in names if name in self.entries[section]]
+        if not drop:
+            return 0
+        ranges = sorted((entry.start, entry.end) for entry in drop)
+        new_lines = []
+        pos = 0
+        for start, end in ranges:
+            new_lines.extend(self.lines[pos:start])
+            pos = end
+        new_lines.extend(self.lines[pos:])
+        self.lines = new_lines
+        self._index()
+        return len(drop)
+
+
+def relative_dependency_path(path, project_path):
+    """Path of ``path`` relative to the project, with forward slashes as pub expects."""
+    return os.path.relpath(path, project_path).replace("\\", "/")
@@ -0,0 +1,229 @@
+import os
+import time
+import signal
+import shutil
+import threading
+import subprocess
+
+# Per-command timeout policies in seconds, matched on the flutter subcommand.
+# A cold pub cache can make `flutter pub get` take many minutes, so it gets a
+# much longer budget than the quick probes.
+TIMEOUT_POLICIES = {
+    "--version": 120,
+    "create": 300,
+    "pub": 1800,
+    "default": 600,
+}
+
+# How long to wait for the output after the command itself has exited. An
+# orphan it started (e.g. a Gradle daemon) can hold the pipes open for good.
+READER_GRACE = 5
+
+_listeners = []
+_which_cache = {}
+
+
+class CommandResult:
+    """Outcome of one subprocess invocation."""
+
+    def __init__(self, argv, cwd):
+        self.argv = list(argv)
+        self.cwd = cwd
+        self.returncode = None
+        self.stdout = ""
+        self.stderr = ""
+        self.started = time.time()
+        self.duration = 0.0
+        self.timed_out = False
+        self.cancelled = False
+        self.error = None
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    def to_dict(self):
+        return {
+            "argv": self.argv,
+            "cwd": self.cwd,
+            "returncode": self.returncode,
+            "duration": round(self.duration, 3),
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "error": self.error,
+        }
+
+
+def add_listener(callback):
+    """Register ``callback(result)`` to be called after every invocation."""
+    _listeners.append(callback)
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+def _notify(result):
+    for callback in list(_listeners):
+        try:
+            callback(result)
+        except Exception:
+            pass
+
+def timeout_for(argv):
+    for arg in argv[1:]:
+        if arg in TIMEOUT_POLICIES:
+            return TIMEOUT_POLICIES[arg]
+        if not arg.startswith("-"):
+            break
+    return TIMEOUT_POLICIES["default"]
+
+def which(program):
+    """``shutil.which`` memoized per PATH, so each binary is looked up once."""
+    key = (program, os.environ.get("PATH", ""))
+    if key not in _which_cache:
+        _which_cache[key] = shutil.which(program)
+    return _which_cache[key]
+
+def clear_which_cache():
+    _which_cache.clear()
+
+def resolve_argv(argv):
+    # Without a shell, Windows needs the full path to flutter.bat.
+    exe = which(argv[0])
+    return [exe or argv[0]] + list(argv[1:])
+
+def _popen_kwargs():
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def kill_process_group(proc):
+    try:
+        if os.name == "nt":
+            subprocess.run(["taskkill", "/F", "/T", "/PID", str(proc.pid)], capture_output=True)
+        else:
+            os.killpg(proc.pid, signal.SIGKILL)
+    except Exception:
+        try:
+            proc.kill()
+        except Exception:
+            pass
+
+def _pump(stream, name, sink, on_line):
+    # Only this thread closes the stream: closing it from another one while
+    # readline() blocks would deadlock on the buffer lock.
+    try:
+        for line in iter(stream.readline, ""):
+            sink.append(line)
+            if on_line is not None:
+                try:
+                    on_line(name, line)
+                except Exception:
+                    pass
+    except (OSError, ValueError):
+        pass
+    finally:
+        stream.close()
+
+def run(argv, cwd=None, timeout=None, cancel_event=None, on_line=None, poll_interval=0.1):
+    """Run ``argv`` (no shell), streaming output as it arrives.
+
+    ``on_line(stream, line)`` is called from reader threads for every line of
+    ``"stdout"`` or ``"stderr"``. ``timeout`` defaults to the policy for the
+    command. On timeout or when ``cancel_event`` is set, the whole process
+    group is killed. Returns a :class:`CommandResult`.
+    """
+    result = CommandResult(argv, cwd)
+    timeout = timeout_for(argv) if timeout is None else timeout
+    start = time.monotonic()
+    try:
+        proc = subprocess.Popen(
+            resolve_argv(argv), cwd=cwd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace", bufsize=1,
+            **_popen_kwargs()
+        )
+    except Exception as e:
+        result.returncode = -1
+        result.error = result.stderr = str(e)
+        result.duration = time.monotonic() - start
+        _notify(result)
+        return result
+    out_lines, err_lines = [], []
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, "stdout", out_lines, on_line), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, "stderr", err_lines, on_line), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    while proc.poll() is None:
+        if cancel_event is not None and cancel_event.is_set():
+            result.cancelled = True
+        elif timeout and time.monotonic() - start > timeout:
+            result.timed_out = True
+        else:
+            try:
+                proc.wait(timeout=poll_interval)
+            except subprocess.TimeoutExpired:
+                pass
+            continue
+        kill_process_group(proc)
+        proc.wait()
+        break
+    # An orphan of the command may hold a pipe open; don't hang on it. Its
+    # reader then stays behind (a daemon thread) and closes the pipe once the
+    # orphan lets go.
+    deadline = time.monotonic() + READER_GRACE
+    for reader in readers:
+        reader.join(max(0.0, deadline - time.monotonic()))
+    result.returncode = proc.returncode
+    result.stdout = "".join(out_lines)
+    result.stderr = "".join(err_lines)
+    if result.cancelled:
+        result.returncode = -1
+        result.error = "Cancelled."
+    elif result.timed_out:
+        result.returncode = -1
+        result.error = f"'{' '.join(argv)}' timed out after {timeout} seconds"
+    result.duration = time.monotonic() - start
+    _notify(result)
+    return result
+
+async def astream(argv, cwd=None, timeout=None):
+    """Async iterator over ``(stream, line)`` pairs of a running command.
+
+    The process group is killed if the consumer stops early, the task is
+    cancelled or the timeout expires (raising ``asyncio.TimeoutError``).
+    """
+    import asyncio  # only async callers pay for it; the GUI and CLI never do
+    timeout = timeout_for(argv) if timeout is None else timeout
+    proc = await asyncio.create_subprocess_exec(
+        *resolve_argv(argv), cwd=cwd, stdin=subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, **_popen_kwargs()
+    )
+    queue = asyncio.Queue()
+
+    async def pump(stream, name):
+        async for raw in stream:
+            await queue.put((name, raw.decode("utf-8", "replace")))
+        await queue.put(None)
+
+    tasks = [asyncio.ensure_future(pump(proc.stdout, "stdout")),
+             asyncio.ensure_future(pump(proc.stderr, "stderr"))]
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    open_streams = 2
+    try:
+        while open_streams:
+            remaining = None if deadline is None else max(0, deadline - loop.time())
+            item = await asyncio.wait_for(queue.get(), remaining)
+            if item is None:
+                open_streams -= 1
+            else:
+                yield item
+        await proc.wait()
+    finally:
+        if proc.returncode is None:
+            kill_process_group(proc)
+            await proc.wait()
+        for task in tasks:
+            task.cancel()
@@ -0,0 +1,44 @@
+import os
+
+from .fileio import FileWriter
+from .templates import plugin_name_to_class_name, render_plugin_templates, render_scaffold_templates
+
+
+def plugin_file_layout(plugin_name):
+    """Relative paths of the Kotlin and Dart sources inside a plugin project."""
+    kt_file = os.path.join(
+        "android", "src", "main", "kotlin", "com", "example", plugin_name,
+        f"{plugin_name_to_class_name(plugin_name)}.kt"
+    )
+    dart_file = os.path.join("lib", f"{plugin_name}.dart")
+    return kt_file, dart_file
+
+def write_plugin_scaffold(plugin_type, plugin_name, base_dir, writer=None):
+    """Write a complete plugin project without invoking ``flutter create``.
+
+    The project is generated from ``strutter_plugin_config/SCAFFOLD`` plus the
+    plugin's own Kotlin/Dart/manifest templates, so the result is already in
+    the state Step 2 would leave it in. Returns None on success or an error
+    message.
+    """
+    plugin_path = os.path.join(base_dir, plugin_name)
+    ok, files = render_scaffold_templates(plugin_name)
+    if not ok:
+        return files
+    ok, sources = render_plugin_templates(plugin_type, plugin_name, has_manifest=(plugin_type != "integrity"))
+    if not ok:
+        return sources
+    kt_file, dart_file = plugin_file_layout(plugin_name)
+    files[kt_file] = sources["kt"]
+    files[dart_file] = sources["dart"]
+    for name, source in sources["support"].items():
+        files[os.path.join(os.path.dirname(kt_file), name)] = source
+    if sources["manifest"] is not None:
+        files[os.path.join("android", "src", "main", "AndroidManifest.xml")] = sources["manifest"]
+    writer = writer or FileWriter()
+    try:
+        for rel_path, content in files.items():
+            writer.write_text(os.path.join(plugin_path, rel_path), content)
+    except Exception as e:
+        return f"Failed to write {plugin_type} scaffold: {str(e)}"
+    return None
@@ -0,0 +1,218 @@
+import os
+import mmap
+import base64
+import struct
+import hashlib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from . import asn1
+
+# APK Signing Block: https://source.android.com/docs/security/features/apksigning/v2
+EOCD_MAGIC = b"PK\x05\x06"
+EOCD_MIN_SIZE = 22
+EOCD_MAX_COMMENT = 0xFFFF
+SIGNING_BLOCK_MAGIC = b"APK Sig Block 42"
+SCHEME_IDS = {
+    0xf05368c0: "v3",
+    0x1b93ad61: "v3.1",
+    0x7109871a: "v2",
+}
+# The signer Android reports through signingInfo.apkContentsSigners on the
+# widest range of devices; v3.1 only applies from its declared minimum SDK.
+SCHEME_PREFERENCE = ("v3", "v2", "v3.1")
+V1_SIGNATURE_SUFFIXES = (".RSA", ".DSA", ".EC")
+ARTIFACT_SUFFIXES = (".apk", ".aab")
+MAX_WORKERS = 8
+
+
+class SignatureError(Exception):
+    pass
+
+
+def certificate_digest_base64(cert_der):
+    """Base64 SHA-256 of a DER certificate, as getApkSignatureBase64() returns it."""
+    return base64.b64encode(hashlib.sha256(cert_der).digest()).decode("ascii")
+
+def sha256_to_base64(sha256_input):
+    """Hex SHA-256 (plain or colon-separated) to Base64."""
+    clean_hex = "".join(ch for ch in sha256_input if ch in "0123456789abcdefABCDEF")
+    if len(clean_hex) != 64:
+        raise ValueError("Invalid SHA-256 digest length (expected 64 hex characters).")
+    return base64.b64encode(bytes.fromhex(clean_hex)).decode("utf-8")
+
+# === APK SIGNING BLOCK (v2/v3) ===
+def _length_prefixed(buf, offset, end, size=4):
+    fmt = "<I" if size == 4 else "<Q"
+    if offset + size > end:
+        raise SignatureError("Truncated length-prefixed field")
+    length = struct.unpack_from(fmt, buf, offset)[0]
+    start = offset + size
+    if start + length > end:
+        raise SignatureError("Length-prefixed field exceeds its container")
+    return start, start + length
+
+def _find_central_directory(buf):
+    size = len(buf)
+    if size < EOCD_MIN_SIZE:
+        raise SignatureError("File too small to be a ZIP archive")
+    search_from = max(0, size - EOCD_MIN_SIZE - EOCD_MAX_COMMENT)
+    eocd = buf.rfind(EOCD_MAGIC, search_from, size - EOCD_MIN_SIZE + 4)
+    while eocd != -1:
+        comment_length = struct.unpack_from("<H", buf, eocd + 20)[0]
+        if eocd + EOCD_MIN_SIZE + comment_length == size:
+            break
+        eocd = buf.rfind(EOCD_MAGIC, search_from, eocd)
+    if eocd == -1:
+        raise SignatureError("End of central directory not found (not a ZIP archive?)")
+    cd_offset = struct.unpack_from("<I", buf, eocd + 16)[0]
+    if cd_offset == 0xFFFFFFFF:
+        raise SignatureError("ZIP64 archives are not supported for v2/v3 signatures")
+    return cd_offset
+
+def signing_block_pairs(buf):
+    """``{block_id: (start, end)}`` of the APK Signing Block, or {} if absent."""
+    cd_offset = _find_central_directory(buf)
+    footer = cd_offset - 24
+    if footer < 0 or buf[footer + 8:cd_offset] != SIGNING_BLOCK_MAGIC:
+        return {}
+    block_size = struct.unpack_from("<Q", buf, footer)[0]
+    block_start = cd_offset - block_size - 8
+    if block_start < 0 or struct.unpack_from("<Q", buf, block_start)[0] != block_size:
+        raise SignatureError("Corrupt APK Signing Block size")
+    pairs = {}
+    offset = block_start + 8
+    while offset < footer:
+        start, end = _length_prefixed(buf, offset, footer, size=8)
+        if end - start < 4:
+            raise SignatureError("Corrupt APK Signing Block entry")
+        pairs[struct.unpack_from("<I", buf, start)[0]] = (start + 4, end)
+        offset = end
+    return pairs
+
+def _first_signer_certificate(buf, start, end):
+    # signers: [signer: [signed data: [digests][certificates: [cert]...]...]...]
+    signers_start, signers_end = _length_prefixed(buf, start, end)
+    signer_start, signer_end = _length_prefixed(buf, signers_start, signers_end)
+    signed_start, signed_end = _length_prefixed(buf, signer_start, signer_end)
+    _, digests_end = _length_prefixed(buf, signed_start, signed_end)
+    certs_start, certs_end = _length_prefixed(buf, digests_end, signed_end)
+    cert_start, cert_end = _length_prefixed(buf, certs_start, certs_end)
+    return bytes(buf[cert_start:cert_end])
+
+def block_certificates(buf):
+    """``{scheme: cert_der}`` for every v2/v3/v3.1 scheme present."""
+    certs = {}
+    for block_id, (start, end) in signing_block_pairs(buf).items():
+        scheme = SCHEME_IDS.get(block_id)
+        if scheme:
+            certs[scheme] = _first_signer_certificate(buf, start, end)
+    return certs
+
+# === v1 (JAR) SIGNATURES ===
+def _issuer_and_serial(buf, cert):
+    # Certificate ::= SEQUENCE { tbsCertificate, ... }
+    tbs = asn1.children(buf, cert[2], cert[3])[0]
+    fields = asn1.children(buf, tbs[2], tbs[3])
+    if fields[0][0] == asn1.CONTEXT_0:
+        fields = fields[1:]
+    return asn1.encoded(buf, fields[2]), asn1.encoded(buf, fields[0])
+
+def pkcs7_signer_certificate(data):
+    """Signer certificate (DER) of a PKCS#7 SignedData blob (META-INF/*.RSA)."""
+    try:
+        _, content_start, content_end = asn1.element(data, 0)
+        content_info = asn1.children(data, content_start, content_end)
+        _, signed_start, signed_end = asn1.element(data, content_info[1][2])
+        signed_data = asn1.children(data, signed_start, signed_end)
+        certificates = next(child for child in signed_data if child[0] == asn1.CONTEXT_0)
+        certs = [c for c in asn1.children(data, certificates[2], certificates[3]) if c[0] == asn1.SEQUENCE]
+        signer_infos = signed_data[-1]
+        signer = asn1.children(data, signer_infos[2], signer_infos[3])[0]
+        sid = asn1.children(data, signer[2], signer[3])[1]
+        sid_issuer, sid_serial = (asn1.encoded(data, c) for c in asn1.children(data, sid[2], sid[3]))
+    except (IndexError, StopIteration, ValueError) as e:
+        raise SignatureError(f"Malformed PKCS#7 signature: {e}")
+    for cert in certs:
+        if _issuer_and_serial(data, cert) == (sid_issuer, sid_serial):
+            return asn1.encoded(data, cert)
+    if certs:
+        return asn1.encoded(data, certs[0])
+    raise SignatureError("No certificate in PKCS#7 signature")
+
+def v1_certificate(path):
+    """Signer certificate from the first META-INF/*.RSA|DSA|EC entry, or None."""
+    with zipfile.ZipFile(path) as archive:
+        names = sorted(n for n in archive.namelist()
+                       if n.upper().startswith("META-INF/") and n.count("/") == 1
+                       and n.upper().endswith(V1_SIGNATURE_SUFFIXES))
+        if not names:
+            return None
+        return pkcs7_signer_certificate(archive.read(names[0]))
+
+# === ARTIFACTS ===
+def artifact_signature(path):
+    """Extract the signing certificate digest of an APK or AAB.
+
+    Only the ZIP tail and the signing block are read (through mmap), so the
+    size of the archive does not matter. Returns a dict with ``path``,
+    ``scheme`` (v3, v2, v3.1 or v1), ``sha256`` (hex), ``base64`` and, when
+    several schemes are present with different signers, ``schemes``.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            raise SignatureError("Empty file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            certs = block_certificates(buf)
+    if not certs:
+        cert = v1_certificate(path)
+        if cert is None:
+            raise SignatureError("No APK Signing Block and no META-INF signature (unsigned?)")
+        certs = {"v1": cert}
+    scheme = next((s for s in SCHEME_PREFERENCE + ("v1",) if s in certs))
+    digest = hashlib.sha256(certs[scheme]).digest()
+    result = {
+        "path": path,
+        "scheme": scheme,
+        "sha256": digest.hex(),
+        "base64": base64.b64encode(digest).decode("ascii"),
+    }
+    digests = {s: certificate_digest_base64(c) for s, c in certs.items()}
+    if len(set(digests.values())) > 1:
+        result["schemes"] = digests
+    return result
+
+def find_artifacts(root):
+    """Every .apk/.aab under ``root`` (or ``root`` itself if it is a file)."""
+    if os.path.isfile(root):
+        return [root]
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        found.extend(os.path.join(dirpath, n) for n in sorted(filenames) if n.lower().endswith(ARTIFACT_SUFFIXES))
+    return found
+
+def scan_artifacts(paths, max_workers=MAX_WORKERS):
+    """Signature info (or ``{"path", "error"}``) for every artifact, in order.
+
+    A path that does not exist, or a folder without any .apk/.aab, is
+    reported as an error too rather than skipped.
+    """
+    def one(item):
+        if isinstance(item, dict):
+            return item
+        try:
+            return artifact_signature(item)
+        except (SignatureError, OSError, zipfile.BadZipFile, ValueError) as e:
+            return {"path": item, "error": str(e)}
+
+    items = []
+    for path in paths:
+        if not os.path.exists(path):
+            items.append({"path": path, "error": "No such file or directory"})
+            continue
+        found = find_artifacts(path)
+        items.extend(found or [{"path": path, "error": "No .apk/.aab files found"}])
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(one, items))
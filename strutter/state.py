@@ -0,0 +1,231 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+STATE_FILE = "strutter_state.db"
+LEGACY_CONFIG_FILE = "hardening_config.json"
+BUSY_TIMEOUT_MS = 30000
+# Config keys stored as-is in the meta table
+CONFIG_META_KEYS = ("tool", "selected_plugins", "plugins_dir", "identity", "check_budgets")
+
+# Each entry upgrades the schema by one version (PRAGMA user_version).
+MIGRATIONS = [
+    """
+    CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    CREATE TABLE plugins (
+        type TEXT PRIMARY KEY,
+        identifier TEXT NOT NULL,
+        created REAL NOT NULL
+    );
+    CREATE TABLE projects (
+        path TEXT PRIMARY KEY,
+        added REAL NOT NULL,
+        updated REAL NOT NULL
+    );
+    CREATE TABLE steps (
+        project TEXT NOT NULL REFERENCES projects(path) ON DELETE CASCADE,
+        step TEXT NOT NULL,
+        ok INTEGER NOT NULL,
+        message TEXT NOT NULL,
+        updated REAL NOT NULL,
+        PRIMARY KEY (project, step)
+    );
+    CREATE TABLE files (
+        path TEXT PRIMARY KEY,
+        project TEXT,
+        sha256 TEXT NOT NULL,
+        updated REAL NOT NULL
+    );
+    CREATE INDEX files_by_project ON files(project);
+    """,
+]
+
+
+class StateStore:
+    """SQLite store for plugin identifiers, projects, step status and file hashes.
+
+    The database runs in WAL mode with a busy timeout, and every write is a
+    short ``BEGIN IMMEDIATE`` transaction, so parallel CI jobs sharing one
+    state file serialize their updates instead of overwriting each other.
+    Connections are per thread.
+
+    :meth:`config` and :meth:`save_config` read and write the same dict
+    shape as the old ``hardening_config.json``, with ``flutter_project``
+    being the project marked current. A JSON config found next to a new
+    database is imported once.
+    """
+
+    def __init__(self, path=STATE_FILE):
+        self.path = os.path.abspath(path)
+        self._local = threading.local()
+        fresh = not os.path.exists(self.path)
+        with self.transaction() as db:
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            for number, script in enumerate(MIGRATIONS[version:], start=version + 1):
+                for statement in script.split(";"):
+                    if statement.strip():
+                        db.execute(statement)
+                db.execute(f"PRAGMA user_version = {number}")
+        legacy = os.path.join(os.path.dirname(self.path), LEGACY_CONFIG_FILE)
+        if fresh and os.path.exists(legacy):
+            self.import_json(legacy)
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            db.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute("PRAGMA synchronous = NORMAL")
+            db.execute("PRAGMA foreign_keys = ON")
+            self._local.db = db
+        return db
+
+    @contextmanager
+    def transaction(self):
+        """``with store.transaction() as db:`` – one atomic write transaction."""
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def close(self):
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+    # === CONFIG ===
+    def config(self):
+        """The config dict (as from the old JSON file), or None before Step 1."""
+        db = self._connect()
+        meta = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM meta")}
+        plugins = dict(db.execute("SELECT type, identifier FROM plugins"))
+        if not meta and not plugins:
+            return None
+        config = {
+            "tool": meta.get("tool"),
+            "selected_plugins": meta.get("selected_plugins") or {},
+            "plugins": plugins,
+        }
+        if meta.get("plugins_dir"):
+            config["plugins_dir"] = meta["plugins_dir"]
+        if meta.get("identity"):
+            config["identity"] = meta["identity"]
+        if meta.get("check_budgets"):
+            config["check_budgets"] = meta["check_budgets"]
+        if meta.get("current_project"):
+            config["flutter_project"] = meta["current_project"]
+        return config
+
+    def save_config(self, config):
+        """Store identifiers and settings from ``config`` in one transaction.
+
+        ``config`` is the whole config: settings missing from it (e.g.
+        ``check_budgets`` after a reset) are removed. Other projects and
+        their step history are kept; ``flutter_project`` (if present) is
+        added and becomes the current project.
+        """
+        now = time.time()
+        with self.transaction() as db:
+            for key in CONFIG_META_KEYS:
+                if key in config:
+                    db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                               (key, json.dumps(config[key])))
+                else:
+                    db.execute("DELETE FROM meta WHERE key = ?", (key,))
+            plugins = config.get("plugins", {})
+            db.execute(f"DELETE FROM plugins WHERE type NOT IN ({','.join('?' * len(plugins))})", list(plugins))
+            for plugin_type, identifier in plugins.items():
+                db.execute(
+                    "INSERT INTO plugins (type, identifier, created) VALUES (?, ?, ?) "
+                    "ON CONFLICT(type) DO UPDATE SET identifier = excluded.identifier, created = excluded.created "
+                    "WHERE plugins.identifier != excluded.identifier",
+                    (plugin_type, identifier, now)
+                )
+            if config.get("flutter_project"):
+                self._add_project(db, config["flutter_project"], now)
+                db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('current_project', ?)",
+                           (json.dumps(config["flutter_project"]),))
+
+    def import_json(self, json_path):
+        """Migrate a ``hardening_config.json``; returns True if one was imported."""
+        try:
+            with open(json_path, "r") as f:
+                config = json.load(f)
+        except Exception:
+            return False
+        if "plugins_dir" not in config:
+            # Old configs always generated the plugins next to the config file.
+            config["plugins_dir"] = os.path.dirname(os.path.abspath(json_path))
+        self.save_config(config)
+        return True
+
+    # === PROJECTS AND STEPS ===
+    def _add_project(self, db, path, now):
+        db.execute(
+            "INSERT INTO projects (path, added, updated) VALUES (?, ?, ?) "
+            "ON CONFLICT(path) DO UPDATE SET updated = excluded.updated",
+            (path, now, now)
+        )
+
+    def add_project(self, path):
+        with self.transaction() as db:
+            self._add_project(db, os.path.abspath(path), time.time())
+
+    def projects(self):
+        rows = self._connect().execute("SELECT path FROM projects ORDER BY path")
+        return [row[0] for row in rows]
+
+    def record_step(self, project, step, ok, message, changes=()):
+        """Atomically store one step's outcome and the hashes of files it wrote.
+
+        ``changes`` takes :attr:`FileWriter.changes`-style dicts
+        (``path``/``sha256``); use ``project=None`` for shared plugin steps.
+        """
+        now = time.time()
+        with self.transaction() as db:
+            if project is not None:
+                self._add_project(db, project, now)
+                db.execute("INSERT OR REPLACE INTO steps (project, step, ok, message, updated) VALUES (?, ?, ?, ?, ?)",
+                           (project, step, int(bool(ok)), message, now))
+            for change in changes:
+                db.execute("INSERT OR REPLACE INTO files (path, project, sha256, updated) VALUES (?, ?, ?, ?)",
+                           (change["path"], project, change["sha256"], now))
+
+    def step_status(self, project):
+        """``{step: {"ok", "message", "updated"}}`` for one project."""
+        rows = self._connect().execute(
+            "SELECT step, ok, message, updated FROM steps WHERE project = ?", (os.path.abspath(project),)
+        )
+        return {step: {"ok": bool(ok), "message": message, "updated": updated} for step, ok, message, updated in rows}
+
+    def file_hash(self, path):
+        row = self._connect().execute("SELECT sha256 FROM files WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def file_hashes(self, project):
+        rows = self._connect().execute("SELECT path, sha256 FROM files WHERE project = ?", (os.path.abspath(project),))
+        return dict(rows)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def open_store(path=STATE_FILE):
+    """Shared :class:`StateStore` per database path (connections are per thread)."""
+    key = os.path.abspath(path)
+    with _stores_lock:
+        if key not in _stores:
+            _stores[key] = StateStore(key)
+        return _stores[key]
@@ -0,0 +1,298 @@
+import os
+import re
+import sys
+import threading
+
+from .artifacts import artifact_index, kotlin_index
+from .bundle import BUNDLE_NAME, BundleError, TemplateBundle, collect_tree, tree_digest
+
+if getattr(sys, 'frozen', False):
+    application_path = os.path.dirname(sys.executable)
+else:
+    application_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TEMPLATE_ROOT = os.path.join(application_path, "strutter_plugin_config")
+# Without the loose folder, templates come from the packed bundle next to the
+# executable (or inside a PyInstaller one-file build).
+BUNDLE_PATHS = [os.path.join(application_path, BUNDLE_NAME)]
+if hasattr(sys, "_MEIPASS"):
+    BUNDLE_PATHS.append(os.path.join(sys._MEIPASS, BUNDLE_NAME))
+
+# Every placeholder a template may use, with what it stands for. Templates
+# are validated against this list when they are compiled.
+PLACEHOLDERS = {
+    "plugin_package": "plugin name, used as Dart package, Kotlin package suffix and channel name",
+    "plugin_class": "plugin class name (see plugin_name_to_class_name)",
+    "check_budget_ms": "time budget of a detection check without its own entry in check_budgets",
+    "check_budgets": "per-check budgets as Kotlin mapOf() arguments: \"root.suCommand\" to 1500L, ...",
+    "artifact_index": "the plugin's artifact paths grouped by directory, as Kotlin mapOf() arguments "
+                      "(see strutter.artifacts)",
+}
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*([A-Za-z_][A-Za-z0-9_]*)\s*\}\}")
+
+# Milliseconds a detection check may run before it is reported inconclusive,
+# keyed "<plugin>.<check>"; "default" covers every check not listed. Checks
+# that start su, scan every process or enumerate packages get more room.
+CHECK_BUDGETS_MS = {
+    "default": 500,
+    "root.dangerousApps": 1500,
+    "root.cloakingApps": 1500,
+    "root.rootViaShell": 2000,
+    "frida.fridaPorts": 1500,
+    "frida.fridaProcesses": 1500,
+    "frida.fridaApps": 1500,
+    "frida.nativeLibraries": 1500,
+}
+CHECK_NAME_PATTERN = re.compile(r"^[A-Za-z][A-Za-z0-9_]*\.[A-Za-z][A-Za-z0-9_]*$")
+
+# Kotlin sources under SUPPORT_DIR that are rendered next to a plugin's main
+# class, in the same package.
+SUPPORT_DIR = "COMMON"
+CHECK_SUPPORT = ["StrutterChecks.kt", "StrutterProc.kt", "StrutterPaths.kt", "StrutterPackages.kt"]
+
+# "checks": the detector groups a plugin contains (the "<plugin>." prefix of
+# their check names), which selects its part of the artifact index.
+PLUGIN_TYPES = {
+    "frida": {
+        "dir": "FRIDA",
+        "kt": "FRIDA_1.kt",
+        "dart": "FRIDA_2.dart",
+        "manifest": "FRIDA_MANIFEST.xml",
+        "support": CHECK_SUPPORT + ["FridaChecks.kt"],
+        "checks": ["frida"],
+        "seed": "_frida_detection"
+    },
+    "root": {
+        "dir": "ROOT",
+        "kt": "ROOT_1.kt",
+        "dart": "ROOT_2.dart",
+        "manifest": "ROOT_MANIFEST.xml",
+        "support": CHECK_SUPPORT + ["RootChecks.kt"],
+        "checks": ["root"],
+        "seed": "_root_detection"
+    },
+    "integrity": {
+        "dir": "INTEGRITY",
+        "kt": "INTEGRITY_1.kt",
+        "dart": "INTEGRITY_2.dart",
+        "manifest": None,
+        "support": ["StrutterSignature.kt"],
+        "checks": [],
+        "seed": "_integrity_check"
+    },
+    # Combined plugin: every check above behind one channel (see
+    # core.create_plugins(combine=True)).
+    "guard": {
+        "dir": "GUARD",
+        "kt": "GUARD_1.kt",
+        "dart": "GUARD_2.dart",
+        "manifest": "GUARD_MANIFEST.xml",
+        "support": CHECK_SUPPORT + ["RootChecks.kt", "FridaChecks.kt", "StrutterSignature.kt"],
+        "checks": ["root", "frida"],
+        "seed": "_guard"
+    }
+}
+
+# Plugin project files written by the offline scaffold generator, keyed by
+# their path inside the plugin directory.
+SCAFFOLD_CONFIG = {
+    "dir": "SCAFFOLD",
+    "files": {
+        "pubspec.yaml": "pubspec.yaml",
+        os.path.join("android", "build.gradle"): "build.gradle",
+        os.path.join("android", "settings.gradle"): "settings.gradle",
+    },
+    "manifest": "MANIFEST.xml"
+}
+
+_template_cache = {}
+_template_lock = threading.Lock()
+_bundle = None
+
+
+class TemplateError(Exception):
+    pass
+
+
+class Template:
+    """A template pre-split into literal text and placeholder names.
+
+    Rendering is a single join over the parts, so the output is built in one
+    pass regardless of how many placeholders there are.
+    """
+
+    def __init__(self, text, name="<template>"):
+        self.name = name
+        self.parts = []
+        self.placeholders = set()
+        pos = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            key = match.group(1)
+            if key not in PLACEHOLDERS:
+                raise TemplateError(f"{name}: undeclared placeholder '{{{{{key}}}}}'")
+            self.parts.append((False, text[pos:match.start()]))
+            self.parts.append((True, key))
+            self.placeholders.add(key)
+            pos = match.end()
+        self.parts.append((False, text[pos:]))
+
+    def render(self, values):
+        missing = self.placeholders - set(values)
+        if missing:
+            raise TemplateError(f"{self.name}: no value for {', '.join(sorted(missing))}")
+        rendered = "".join(values[part] if is_key else part for is_key, part in self.parts)
+        leftover = PLACEHOLDER_PATTERN.search(rendered)
+        if leftover:
+            raise TemplateError(f"{self.name}: unresolved placeholder '{leftover.group(0)}' after rendering")
+        return rendered
+
+
+def plugin_name_to_class_name(plugin_name):
+    if plugin_name.endswith("_plugin"):
+        base = plugin_name[:-7]
+        return base[0].upper() + base[1:] + "Plugin"
+    return plugin_name + "Plugin"
+
+# === TEMPLATE SOURCE ===
+def template_bundle():
+    """The opened template bundle, or None while the loose folder exists.
+
+    Raises :class:`BundleError` if the bundle is damaged.
+    """
+    global _bundle
+    if os.path.isdir(TEMPLATE_ROOT):
+        return None
+    with _template_lock:
+        if _bundle is None:
+            path = next((p for p in BUNDLE_PATHS if os.path.exists(p)), None)
+            if path:
+                _bundle = TemplateBundle(path)
+        return _bundle
+
+def check_templates():
+    """``(ok, message)``: is there a template folder or a valid bundle?"""
+    if os.path.isdir(TEMPLATE_ROOT):
+        return True, f"Templates: {TEMPLATE_ROOT}"
+    try:
+        bundle = template_bundle()
+    except (OSError, BundleError) as e:
+        return False, f"Template bundle is unusable: {str(e)}"
+    if bundle is None:
+        return False, (f"Folder 'strutter_plugin_config' (or {BUNDLE_NAME}) not found.\n"
+                       f"Please place it in the same directory as strutter.exe / strutter.py")
+    return True, f"Templates: {bundle.path}"
+
+def template_exists(*parts):
+    bundle = template_bundle()
+    if bundle is not None:
+        return "/".join(parts) in bundle
+    return os.path.exists(os.path.join(TEMPLATE_ROOT, *parts))
+
+def templates_digest():
+    """Hash of every template (paths and contents), folder or bundle alike."""
+    bundle = template_bundle()
+    if bundle is not None:
+        return bundle.digest
+    return tree_digest(collect_tree(TEMPLATE_ROOT))
+
+def load_template(*parts):
+    """Return the compiled template for a file under TEMPLATE_ROOT.
+
+    Templates are read and tokenized once per process; an edited file (new
+    mtime or size) is recompiled on next use. From a bundle, the entry's
+    hash is the stamp.
+    """
+    bundle = template_bundle()
+    name = "/".join(parts)
+    if bundle is not None:
+        path = (bundle.path, name)
+        stamp = bundle.entry_hash(name)
+    else:
+        path = os.path.join(TEMPLATE_ROOT, *parts)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+    cached = _template_cache.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    if bundle is not None:
+        # Same newline translation as reading the loose file in text mode.
+        text = bundle.read(name).decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    template = Template(text, name)
+    with _template_lock:
+        _template_cache[path] = (stamp, template)
+    return template
+
+def check_budgets(overrides=None):
+    """:data:`CHECK_BUDGETS_MS` with ``overrides`` applied, validated."""
+    budgets = dict(CHECK_BUDGETS_MS)
+    for name, ms in (overrides or {}).items():
+        if name != "default" and not CHECK_NAME_PATTERN.match(name):
+            raise TemplateError(f"invalid check name '{name}' (expected <plugin>.<check>)")
+        if isinstance(ms, bool) or not isinstance(ms, int) or ms <= 0:
+            raise TemplateError(f"budget for '{name}' must be a positive number of milliseconds")
+        budgets[name] = ms
+    return budgets
+
+def template_values(plugin_name, budgets=None, plugin_type=None):
+    budgets = check_budgets(budgets)
+    return {
+        "plugin_package": plugin_name,
+        "plugin_class": plugin_name_to_class_name(plugin_name),
+        "check_budget_ms": str(budgets.pop("default")),
+        "check_budgets": ", ".join(f'"{name}" to {ms}L' for name, ms in sorted(budgets.items())),
+        "artifact_index": kotlin_index(artifact_index(PLUGIN_TYPES[plugin_type]["checks"] if plugin_type else None)),
+    }
+
+def render_plugin_templates(plugin_type, plugin_name, has_manifest=True, budgets=None):
+    """Render the Kotlin, Dart and (optionally) manifest templates for a plugin.
+
+    Returns ``(True, {"kt": ..., "dart": ..., "manifest": ..., "support":
+    {file name: source}})`` or ``(False, message)``; ``manifest`` is None
+    when not requested. ``budgets`` overrides :data:`CHECK_BUDGETS_MS`.
+    """
+    cfg = PLUGIN_TYPES[plugin_type]
+    missing = []
+    try:
+        if not template_exists(cfg["dir"], cfg["kt"]):
+            missing.append(cfg["kt"])
+        if not template_exists(cfg["dir"], cfg["dart"]):
+            missing.append(cfg["dart"])
+        if has_manifest and not template_exists(cfg["dir"], cfg["manifest"]):
+            missing.append(cfg["manifest"])
+        missing += [name for name in cfg["support"] if not template_exists(SUPPORT_DIR, name)]
+    except (OSError, BundleError) as e:
+        return False, f"Failed to read {plugin_type} templates: {str(e)}"
+    if missing:
+        return False, f"Missing {plugin_type} template(s): {', '.join(missing)}"
+    try:
+        values = template_values(plugin_name, budgets, plugin_type)
+        rendered = {
+            "kt": load_template(cfg["dir"], cfg["kt"]).render(values),
+            "dart": load_template(cfg["dir"], cfg["dart"]).render(values),
+            "manifest": None,
+            "support": {name: load_template(SUPPORT_DIR, name).render(values) for name in cfg["support"]},
+        }
+        if has_manifest:
+            rendered["manifest"] = load_template(cfg["dir"], cfg["manifest"]).render(values)
+    except TemplateError as e:
+        return False, f"Invalid {plugin_type} template: {str(e)}"
+    except Exception as e:
+        return False, f"Failed to read {plugin_type} templates: {str(e)}"
+    return True, rendered
+
+def render_scaffold_templates(plugin_name):
+    """Render the plugin project files (pubspec, Gradle, base manifest)."""
+    cfg = SCAFFOLD_CONFIG
+    values = template_values(plugin_name)
+    rendered = {}
+    try:
+        sources = dict(cfg["files"])
+        sources[os.path.join("android", "src", "main", "AndroidManifest.xml")] = cfg["manifest"]
+        for rel_path, template in sources.items():
+            rendered[rel_path] = load_template(cfg["dir"], template).render(values)
+    except Exception as e:
+        return False, f"Failed to read scaffold templates: {str(e)}"
+    return True, rendered
@@ -0,0 +1,136 @@
+import os
+import json
+import threading
+
+from . import runner
+from .cache import default_cache_dir
+
+CACHE_FILE = "toolchain.json"
+
+_probes = {}
+_probe_lock = threading.Lock()
+
+
+class ToolchainError(Exception):
+    pass
+
+
+def flutter_binary():
+    """Absolute path of the ``flutter`` on PATH, or None."""
+    path = runner.which("flutter")
+    return os.path.realpath(path) if path else None
+
+def _stamp(binary):
+    # `flutter upgrade` rewrites the SDK but usually not bin/flutter itself,
+    # so the version file next to it is part of the key as well.
+    stamp = [binary, os.stat(binary).st_mtime_ns]
+    version_file = os.path.join(os.path.dirname(binary), "cache", "flutter.version.json")
+    try:
+        stamp.append(os.stat(version_file).st_mtime_ns)
+    except OSError:
+        stamp.append(None)
+    return stamp
+
+def _cache_path():
+    return os.path.join(default_cache_dir(), CACHE_FILE)
+
+def _load_cached(stamp):
+    try:
+        with open(_cache_path(), "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return cached.get("info") if cached.get("stamp") == stamp else None
+
+def _save_cached(stamp, info):
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"stamp": stamp, "info": info}, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def parse_machine_output(out):
+    """Parse ``flutter --version --machine``; tolerates banners around the JSON."""
+    start, end = out.find("{"), out.rfind("}")
+    if start == -1 or end < start:
+        raise ToolchainError("no JSON object in output")
+    data = json.loads(out[start:end + 1])
+    if not data.get("frameworkVersion"):
+        raise ToolchainError("frameworkVersion missing")
+    return data
+
+def parse_text_output(out):
+    """Fallback for SDKs without ``--machine``: ``Flutter 3.x • channel stable • ...``."""
+    info = {}
+    for line in out.splitlines():
+        words = line.replace("•", " ").split()
+        if len(words) < 2:
+            continue
+        if words[0] == "Flutter" and "frameworkVersion" not in info:
+            info["frameworkVersion"] = words[1]
+            if "channel" in words[:-1]:
+                info["channel"] = words[words.index("channel") + 1]
+        elif words[0] == "Engine" and "revision" in words[:-1]:
+            info["engineRevision"] = words[words.index("revision") + 1]
+        if "Dart" in words[:-1] and "dartSdkVersion" not in info:
+            info["dartSdkVersion"] = words[words.index("Dart") + 1]
+    if "frameworkVersion" not in info:
+        raise ToolchainError("version line not found")
+    return info
+
+def _run_probe(binary):
+    result = runner.run([binary, "--version", "--machine"])
+    if result.ok:
+        try:
+            return parse_machine_output(result.stdout)
+        except (ToolchainError, ValueError):
+            pass
+    result = runner.run([binary, "--version"])
+    if not result.ok:
+        raise ToolchainError(f"Flutter CLI not found or failed to run.\nError: {result.error or result.stderr}")
+    if not result.stdout.strip():
+        raise ToolchainError("Flutter command returned empty output.")
+    try:
+        return parse_text_output(result.stdout)
+    except ToolchainError as e:
+        raise ToolchainError(f"Failed to parse Flutter version.\nOutput: {result.stdout}\nError: {str(e)}")
+
+def probe(refresh=False):
+    """Describe the Flutter SDK on PATH; raises :class:`ToolchainError`.
+
+    The result is cached in memory and in ``toolchain.json`` in the scaffold
+    cache directory, keyed on the binary's path and mtime, so ``flutter`` is
+    only run again after the SDK changes. Concurrent callers share one probe.
+    Returns a dict with ``path``, ``version``, ``channel``, ``dart_version``,
+    ``engine_revision``, ``framework_revision`` and ``flutter_root``.
+    """
+    binary = flutter_binary()
+    if binary is None:
+        raise ToolchainError("Flutter CLI not found on PATH.")
+    try:
+        stamp = _stamp(binary)
+    except OSError as e:
+        raise ToolchainError(f"Flutter CLI not accessible: {str(e)}")
+    key = tuple(stamp)
+    with _probe_lock:
+        if not refresh and key in _probes:
+            return dict(_probes[key])
+        info = None if refresh else _load_cached(stamp)
+        if info is None:
+            data = _run_probe(binary)
+            info = {
+                "path": binary,
+                "version": data.get("frameworkVersion"),
+                "channel": data.get("channel"),
+                "dart_version": (data.get("dartSdkVersion") or "").split(" ")[0] or None,
+                "engine_revision": data.get("engineRevision"),
+                "framework_revision": data.get("frameworkRevision"),
+                "flutter_root": data.get("flutterRoot") or os.path.dirname(os.path.dirname(binary)),
+            }
+            _save_cached(stamp, info)
+        _probes[key] = info
+        return dict(info)
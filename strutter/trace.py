@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager
+
+from . import fileio
+from . import runner
+
+_active = []
+_active_lock = threading.Lock()
+_local = threading.local()
+
+
+class Tracer:
+    """Collects spans (steps, I/O phases, subprocesses) while started.
+
+    Spans come from :func:`span` anywhere in the package and from every
+    :func:`strutter.runner.run` call. Export with :meth:`chrome_trace`
+    (``chrome://tracing`` / Perfetto ``trace_event`` JSON) or :meth:`summary`.
+    """
+
+    def __init__(self):
+        self.origin = time.time()
+        self.pid = os.getpid()
+        self.events = []
+        self.threads = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        with _active_lock:
+            if self not in _active:
+                _active.append(self)
+        runner.add_listener(self._on_command)
+        return self
+
+    def stop(self):
+        runner.remove_listener(self._on_command)
+        with _active_lock:
+            if self in _active:
+                _active.remove(self)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def add(self, name, cat, start, end, args=None):
+        thread = threading.current_thread()
+        with self._lock:
+            self.threads.setdefault(thread.ident, thread.name)
+            self.events.append({"name": name, "cat": cat, "start": start, "end": end,
+                                "tid": thread.ident, "args": dict(args or {})})
+
+    def _on_command(self, result):
+        args = result.to_dict()
+        args["stdout_bytes"] = len(result.stdout.encode("utf-8"))
+        self.add(command_name(result.argv), "subprocess", result.started, result.started + result.duration, args)
+
+    # === EXPORT ===
+    def chrome_trace(self):
+        """The spans as a Chrome ``trace_event`` document (complete events, µs)."""
+        with self._lock:
+            events = list(self.events)
+            threads = dict(self.threads)
+        trace_events = [{"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0,
+                         "args": {"name": "strutter"}}]
+        trace_events += [{"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                         for tid, name in threads.items()]
+        for event in sorted(events, key=lambda e: e["start"]):
+            trace_events.append({
+                "name": event["name"],
+                "cat": event["cat"],
+                "ph": "X",
+                "ts": round((event["start"] - self.origin) * 1e6, 1),
+                "dur": round((event["end"] - event["start"]) * 1e6, 1),
+                "pid": self.pid,
+                "tid": event["tid"],
+                "args": event["args"],
+            })
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write_chrome_trace(self, path):
+        data = json.dumps(self.chrome_trace(), ensure_ascii=False, default=str).encode("utf-8")
+        fileio.atomic_write_bytes(path, data)
+        return path
+
+    def summary(self):
+        """Per (category, name): count, total/mean/max seconds and bytes written."""
+        rows = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            row = rows.setdefault((event["cat"], event["name"]), {
+                "cat": event["cat"], "name": event["name"], "count": 0, "total": 0.0, "max": 0.0,
+                "bytes_written": 0, "failed": 0,
+            })
+            duration = event["end"] - event["start"]
+            row["count"] += 1
+            row["total"] += duration
+            row["max"] = max(row["max"], duration)
+            row["bytes_written"] += event["args"].get("bytes_written", 0)
+            if event["args"].get("ok") is False or event["args"].get("returncode") not in (None, 0):
+                row["failed"] += 1
+        result = sorted(rows.values(), key=lambda r: r["total"], reverse=True)
+        for row in result:
+            row["mean"] = row["total"] / row["count"]
+            for key in ("total", "mean", "max"):
+                row[key] = round(row[key], 6)
+        return result
+
+
+def command_name(argv):
+    """``flutter pub`` style label: the program plus its first subcommand."""
+    words = [os.path.basename(argv[0])] if argv else ["?"]
+    words += [a for a in argv[1:] if not a.startswith("-")][:1]
+    return " ".join(words)
+
+def active():
+    return bool(_active)
+
+@contextmanager
+def span(name, cat="step", **args):
+    """Record the ``with`` block as a span in every started :class:`Tracer`.
+
+    Yields the span's ``args`` dict so the block can add results (``ok``,
+    ``exit_code``...). A no-op when nothing is tracing.
+    """
+    if not _active:
+        yield args
+        return
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    stack.append(args)
+    start = time.time()
+    try:
+        yield args
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        end = time.time()
+        stack.pop()
+        for tracer in list(_active):
+            tracer.add(name, cat, start, end, args)
+
+def count(key, amount=1):
+    """Add ``amount`` to ``key`` on every span open in this thread."""
+    for args in getattr(_local, "stack", None) or ():
+        args[key] = args.get(key, 0) + amount
+
+def format_summary(rows):
+    """Plain-text table of :meth:`Tracer.summary` rows."""
+    header = ["category", "span", "count", "total ms", "mean ms", "max ms", "bytes", "failed"]
+    table = [[r["cat"], r["name"], str(r["count"]), f"{r['total'] * 1000:.1f}", f"{r['mean'] * 1000:.1f}",
+              f"{r['max'] * 1000:.1f}", str(r["bytes_written"]), str(r["failed"])] for r in rows]
+    widths = [max(len(row[i]) for row in table + [header]) for i in range(len(header))]
+    fmt = lambda row: "  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip()
+    return "\n".join([fmt(header), fmt(["-" * w for w in widths])] + [fmt(row) for row in table]) + "\n"
@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from .gradle import app_gradle_file
+from .pubspec import Pubspec
+
+# Directories never worth descending into: build output, tool caches and
+# vendored CocoaPods. PRUNE_PATHS are matched against the end of a path.
+# Callers also exclude the generated plugins' folder, and the example app of
+# any plugin package (PLUGIN_EXAMPLE_DIR) is skipped: flutter create gives it
+# an Android app module, but it is not a project to harden.
+PRUNE_DIRS = ("build", ".dart_tool", ".git", ".gradle", ".idea", ".symlinks", "node_modules")
+PRUNE_PATHS = (os.path.join("ios", "Pods"),)
+PRUNE_SUFFIXES = tuple(os.sep + rel for rel in PRUNE_PATHS)
+PLUGIN_EXAMPLE_DIR = "example"
+MAX_SCAN_WORKERS = 8
+
+KIND_APP = "app"
+KIND_PLUGIN = "plugin"
+KIND_PACKAGE = "package"
+KIND_DART = "dart"
+KIND_WORKSPACE = "workspace"
+
+
+def _is_plugin(pubspec):
+    return "plugin" in pubspec.child_keys("flutter")
+
+def _is_plugin_dir(path):
+    try:
+        return _is_plugin(Pubspec.load(os.path.join(path, "pubspec.yaml")))
+    except Exception:
+        return False
+
+def _scan_dir(path, exclude=frozenset()):
+    """List one directory: ``(subdirectories to visit, has_pubspec)``."""
+    subdirs = []
+    has_pubspec = False
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.name == "pubspec.yaml" and entry.is_file():
+                    has_pubspec = True
+                elif entry.is_dir(follow_symlinks=False) and entry.name not in PRUNE_DIRS:
+                    subdirs.append(entry.path)
+    except OSError:
+        return [], False
+    subdirs = [d for d in subdirs if not d.endswith(PRUNE_SUFFIXES) and os.path.normcase(d) not in exclude]
+    example = os.path.join(path, PLUGIN_EXAMPLE_DIR)
+    if has_pubspec and example in subdirs and _is_plugin_dir(path):
+        subdirs.remove(example)
+    return subdirs, has_pubspec
+
+def find_pubspecs(root, max_workers=MAX_SCAN_WORKERS, exclude=()):
+    """Folders under ``root`` (inclusive) that contain a pubspec.yaml.
+
+    Directories are listed in parallel, breadth-first; pruned directories,
+    the folders in ``exclude`` and the example apps of plugin packages are
+    never opened.
+    """
+    found = []
+    exclude = frozenset(os.path.normcase(os.path.abspath(d)) for d in exclude)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending = {pool.submit(_scan_dir, os.path.abspath(root), exclude): os.path.abspath(root)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                subdirs, has_pubspec = future.result()
+                if has_pubspec:
+                    found.append(path)
+                for sub in subdirs:
+                    pending[pool.submit(_scan_dir, sub, exclude)] = sub
+    return sorted(found)
+
+def classify_project(path):
+    """Describe the package at ``path``.
+
+    ``kind`` is one of app, plugin, package (Flutter library), dart (no
+    Flutter dependency) or workspace (a pub workspace root). ``android`` is
+    True for Flutter apps with an Android app module, i.e. the projects the
+    hardening steps apply to.
+    """
+    info = {"path": path, "name": os.path.basename(path), "kind": None, "android": False, "reason": ""}
+    try:
+        pubspec = Pubspec.load(os.path.join(path, "pubspec.yaml"))
+    except Exception as e:
+        info["reason"] = f"Unreadable pubspec.yaml: {str(e)}"
+        return info
+    info["name"] = pubspec.section_values.get("name") or info["name"]
+    if pubspec.workspace:
+        info["kind"] = KIND_WORKSPACE
+        info["reason"] = f"Pub workspace with {len(pubspec.workspace)} member(s)"
+    elif pubspec.dependency("flutter") is None:
+        info["kind"] = KIND_DART
+        info["reason"] = "No Flutter dependency"
+    elif _is_plugin(pubspec):
+        info["kind"] = KIND_PLUGIN
+        info["reason"] = "Flutter plugin package"
+    elif not os.path.isdir(os.path.join(path, "android")):
+        info["kind"] = KIND_PACKAGE
+        info["reason"] = "No android/ platform folder"
+    else:
+        info["kind"] = KIND_APP
+        if app_gradle_file(path) is None:
+            info["reason"] = "android/app/build.gradle(.kts) not found"
+        else:
+            info["android"] = True
+            info["reason"] = "Android-capable Flutter app"
+    return info
+
+def scan_workspace(root, max_workers=MAX_SCAN_WORKERS, exclude=()):
+    """Find and classify every Dart/Flutter package under ``root``.
+
+    ``exclude`` lists folders to skip, such as the generated plugins' folder.
+    """
+    paths = find_pubspecs(root, max_workers, exclude)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(classify_project, paths))
+
+def android_apps(projects):
+    return [p["path"] for p in projects if p["android"]]
@@ -0,0 +1,243 @@
+package com.example.{{plugin_package}}
+
+import java.io.File
+import java.net.Socket
+import java.net.ConnectException
+import java.net.SocketTimeoutException
+import java.util.*
+
+// Frida and hooking-framework checks, named "frida.<name>" (also their budget
+// keys). Used by the Frida plugin and the combined guard plugin; packages is
+// the request's shared installed-package enumeration (StrutterPackages).
+class FridaChecks(private val packages: Lazy<Set<String>>) {
+    // Every port is probed by its own check.
+    fun all(): List<Check> = listOf(
+        Check("frida.fridaFiles") { checkFridaFiles() }
+    ) + suspiciousPorts.map { port ->
+        Check("frida.fridaPorts:$port", "frida.fridaPorts") { checkFridaPort(port) }
+    } + listOf(
+        Check("frida.listeningPorts", "frida.fridaPorts") { checkListeningPorts() },
+        Check("frida.fridaProcesses") { checkFridaProcesses() },
+        Check("frida.procMaps") { checkProcMaps() },
+        Check("frida.namedPipes") { checkNamedPipes() },
+        Check("frida.threadNames") { checkThreadNames() },
+        Check("frida.environmentVars") { checkEnvironmentVars() },
+        Check("frida.fridaApps") { checkFridaApps() },
+        Check("frida.nativeLibraries") { checkNativeLibraries() },
+        Check("frida.systemProperties") { checkSystemProperties() }
+    )
+
+    // 1. Check for Frida-related files (paths in strutter/artifacts.py)
+    private fun checkFridaFiles(): Boolean = StrutterPaths.anyExists("frida.fridaFiles")
+
+    // 2. Check Frida server ports
+    private val suspiciousPorts = arrayOf(27042, 27043, 27047, 9999, 9998)
+
+    private fun checkFridaPort(port: Int): Boolean {
+        try {
+            Socket().use { socket ->
+                socket.connect(java.net.InetSocketAddress("127.0.0.1", port), 300)
+            }
+            return true
+        } catch (e: ConnectException) {
+        } catch (e: SocketTimeoutException) {
+        } catch (e: Exception) {
+        }
+        return false
+    }
+
+    // Listening sockets the connect probes may miss (e.g. bound elsewhere)
+    private fun checkListeningPorts(): Boolean = StrutterProc.anyListeningPort(suspiciousPorts.toSet())
+
+    // 3. Check Frida processes
+    private fun checkFridaProcesses(): Boolean {
+        val fridaExecutables = arrayOf(
+            "frida-server", "gum-js-loop", "gmain",
+            "frida-agent", "frida-gadget", "re.frida.server"
+        )
+
+        return StrutterProc.anyProcess { fullCommand ->
+            val executableName = fullCommand.substringAfterLast("/")
+            executableName in fridaExecutables ||
+                (executableName == "frida" &&
+                    !fullCommand.contains("/data/data/") &&
+                    !fullCommand.contains("/data/app/"))
+        }
+    }
+
+    // 4. Check /proc/self/maps for Frida libraries
+    private fun checkProcMaps(): Boolean {
+        val suspiciousKeywords = arrayOf("frida", "gum-js-loop", "libfrida", "gadget", "linjector")
+        var matchCount = 0
+
+        return StrutterProc.anyLine("/proc/self/maps") {
+            if (it.contains("r--p") || it.contains("r-xp") || it.contains("rw-p") || it.contains("rwxp")) {
+                val lowerLine = it.lowercase(Locale.getDefault())
+                for (keyword in suspiciousKeywords) {
+                    if (lowerLine.contains(keyword) && !it.contains("/data/data/") && !it.contains("/data/app/")) {
+                        matchCount++
+                    }
+                }
+            }
+            matchCount >= 2
+        }
+    }
+
+    // 5. Check named pipes / file descriptors
+    private fun checkNamedPipes(): Boolean {
+        try {
+            val pid = android.os.Process.myPid()
+            val fdDir = File("/proc/$pid/fd")
+            if (fdDir.exists() && fdDir.isDirectory) {
+                fdDir.listFiles()?.forEach { fdFile ->
+                    try {
+                        val target = fdFile.canonicalPath
+                        val isFridaSuspicious = target.matches(Regex(".*pipe.*frida.*", RegexOption.IGNORE_CASE)) ||
+                                               target.matches(Regex(".*pipe.*gum.*", RegexOption.IGNORE_CASE)) ||
+                                               target.matches(Regex(".*/frida-server.*", RegexOption.IGNORE_CASE)) ||
+                                               target.matches(Regex(".*/re\\.frida\\.server.*", RegexOption.IGNORE_CASE)) ||
+                                               (target.startsWith("/dev/socket/") && target.contains("frida", ignoreCase = true)) ||
+                                               target.contains("gmain") ||
+                                               target.contains("gdbus") ||
+                                               target.contains("gum-js-loop")
+
+                        if (isFridaSuspicious && !isAppInternalPath(target)) {
+                            return true
+                        }
+                    } catch (e: Exception) {
+                    }
+                }
+            }
+        } catch (e: Exception) {
+        }
+        return false
+    }
+
+    private fun isAppInternalPath(path: String): Boolean {
+        return path.contains("/data/data/") ||
+               path.contains("/data/app/") ||
+               path.contains("/android_asset/") ||
+               path.contains("/data/user/") ||
+               path.matches(Regex(".*/[a-zA-Z]+\\.[a-zA-Z]+\\.[a-zA-Z]+.*"))
+    }
+
+    // 6. Check thread names
+    private fun checkThreadNames(): Boolean {
+        val suspiciousThreads = arrayOf("gum-js-loop", "gmain", "frida-agent", "gadget-thread")
+        try {
+            val pid = android.os.Process.myPid()
+            val taskDir = File("/proc/$pid/task")
+            if (taskDir.exists() && taskDir.isDirectory) {
+                taskDir.listFiles()?.forEach { threadDir ->
+                    try {
+                        val commFile = File(threadDir, "comm")
+                        if (commFile.exists()) {
+                            val threadName = commFile.readText().trim()
+                            for (suspicious in suspiciousThreads) {
+                                if (threadName.equals(suspicious, ignoreCase = true)) {
+                                    return true
+                                }
+                            }
+                        }
+                    } catch (e: Exception) {
+                    }
+                }
+            }
+        } catch (e: Exception) {
+        }
+        return false
+    }
+
+    // 7. Check environment variables
+    private fun checkEnvironmentVars(): Boolean {
+        try {
+            System.getenv().forEach { (key, value) ->
+                if ("$key=$value".lowercase(Locale.getDefault()).contains("frida")) {
+                    return true
+                }
+            }
+
+            val environFile = File("/proc/self/environ")
+            if (environFile.exists()) {
+                val content = environFile.readText()
+                val envList = content.split("\u0000").filter { it.isNotEmpty() }
+                for (env in envList) {
+                    if (env.lowercase(Locale.getDefault()).contains("frida")) {
+                        return true
+                    }
+                }
+            }
+        } catch (e: Exception) {
+        }
+        return false
+    }
+
+    // 8. Check installed Frida/Xposed/LSPosed apps
+    private fun checkFridaApps(): Boolean {
+        val fridaApps = arrayOf(
+            "re.frida.server",
+            "de.robv.android.xposed.installer",
+            "org.meowcat.edxposed.manager",
+            "io.github.lsposed.manager",
+            "me.weishu.exp",
+            "com.nowsecure.frida",
+            "org.frida.fridaclient",
+            "com.github.unidbg",
+            "jackpal.androidterm",
+            "com.offsec.nethunter"
+        )
+
+        val allPackages = packages.value
+        return fridaApps.any { it in allPackages }
+    }
+
+    // 9. Check native hooks (LSPosed, Xposed, etc.)
+    private fun checkNativeLibraries(): Boolean {
+        try {
+            // Check lspd/zygisk processes
+            if (StrutterProc.anyProcess { it.contains("lspd") || it.contains("zygisk") }) {
+                return true
+            }
+
+            // Check known paths (strutter/artifacts.py)
+            if (StrutterPaths.anyExists("frida.nativeLibraries")) return true
+
+            // Check stack trace for Xposed
+            try {
+                throw Exception()
+            } catch (e: Exception) {
+                for (element in e.stackTrace) {
+                    if (element.className.contains("de.robv.android.xposed") ||
+                        element.className.contains("io.github.lsposed") ||
+                        element.className.contains("org.meowcat.edxposed")) {
+                        return true
+                    }
+                }
+            }
+
+            // Check system props
+            val xposedProps = arrayOf("ro.lsposed.enable", "persist.lsposed", "init.svc.lspd")
+            for (prop in xposedProps) {
+                if (System.getProperty(prop).let { it != null && it.isNotEmpty() }) {
+                    return true
+                }
+            }
+
+        } catch (e: Exception) {
+        }
+        return false
+    }
+
+    // 10. Check system properties
+    private fun checkSystemProperties(): Boolean {
+        val suspiciousProps = arrayOf("ro.frida.server", "ro.debuggable")
+        for (prop in suspiciousProps) {
+            val value = System.getProperty(prop)
+            if (value != null) {
+                if (prop.contains("frida") && value.isNotEmpty()) return true
+                if (prop == "ro.debuggable" && value == "1") return true
+            }
+        }
+        return false
+    }
+}
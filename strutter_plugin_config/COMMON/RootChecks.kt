@@ -0,0 +1,246 @@
+package com.example.{{plugin_package}}
+
+import android.content.Context
+import android.os.Build
+import java.io.File
+
+// Root detection checks, named "root.<name>" (also their budget keys). Used
+// by the Root plugin and the combined guard plugin; packages is the request's
+// shared installed-package enumeration (StrutterPackages).
+class RootChecks(private val context: Context, private val packages: Lazy<Set<String>>) {
+    fun all(): List<Check> = listOf(
+        Check("root.rootFiles") { checkRootFiles() },
+        Check("root.dangerousApps") { checkDangerousApps() },
+        Check("root.cloakingApps") { checkCloakingApps() },
+        Check("root.buildTags") { checkBuildTags() },
+        Check("root.suCommand") { checkSuCommand() },
+        Check("root.rootViaShell") { checkRootViaShell() },
+        Check("root.xposedFramework") { checkXposedFramework() },
+        Check("root.systemProperties") { checkSystemProperties() },
+        Check("root.nativeHooks") { checkNativeHooks() },
+        Check("root.selinuxStatus") { checkSelinuxStatus() },
+        Check("root.mountPoints") { checkMountPoints() },
+        Check("root.developerSettings") { checkDeveloperSettings() },
+        Check("root.emulator") { checkEmulator() }
+    )
+
+    // Paths are in strutter/artifacts.py; StrutterPaths has them by directory
+    private fun checkRootFiles(): Boolean = StrutterPaths.anyExists("root.rootFiles")
+
+    private fun checkDangerousApps(): Boolean {
+        val dangerousApps = arrayOf(
+            "com.topjohnwu.magisk",
+            "eu.chainfire.supersu",
+            "eu.chainfire.supersu.pro",
+            "com.noshufou.android.su",
+            "com.thirdparty.superuser",
+            "com.koushikdutta.superuser",
+            "com.yellowes.su",
+            "com.kingroot.kinguser",
+            "com.kingo.root",
+            "com.kingoapp.root",
+            "com.kingoroot.android",
+            "com.halfdroid.framaroot",
+            "com.zhiqupk.root.global",
+            "com.alephzain.framaroot",
+            "stericson.busybox",
+            "stericson.busybox.donate",
+            "ru.meefik.busybox",
+            "com.speedsoftware.rootexplorer",
+            "com.jrummy.root.browserfree",
+            "com.jrummy.liberty.toolbox",
+            "com.joeykrim.rootcheck",
+            "com.joeykrim.rootcheckpro",
+            "com.devadvance.rootchecker2",
+            "com.abcdjdj.rootverifier",
+            "jackpal.androidterm",
+            "com.spartacusrex.spartacuside",
+            "com.google.android.terminal",
+            "com.chelpus.lackypatch",
+            "com.dimonvideo.luckypatcher",
+            "com.forpda.lp",
+            "com.koushikdutta.rommanager",
+            "com.koushikdutta.rommanager.license",
+            "com.keramidas.TitaniumBackup",
+            "com.keramidas.TitaniumBackupPro",
+            "catch_.me_.if_.you_.can_",
+            "com.ramdroid.appquarantine",
+            "com.zachspong.temprootremovejb",
+            "com.tinyhack.zygiskreflutter"
+        )
+        val allPackages = packages.value
+        return dangerousApps.any { it in allPackages }
+    }
+
+    private fun checkCloakingApps(): Boolean {
+        val cloakingApps = arrayOf(
+            "com.topjohnwu.magisk",
+            "io.github.huskydg.magisk",
+            "com.github.rikka.shamiko",
+            "io.github.lsposed.manager.zygisk",
+            "org.lsposed.manager",
+            "de.robv.android.xposed.installer",
+            "org.meowcat.edxposed.manager",
+            "com.devadvance.rootcloak",
+            "com.devadvance.rootcloakplus",
+            "com.amphoras.hidemyroot",
+            "com.amphoras.hidemyrootpremium",
+            "com.tsng.hidemyapplist",
+            "com.github.megatronking.hideapplist",
+            "ru.zdevs.zygisk.detector",
+            "riru.core",
+            "com.github.rikka.riru",
+            "eu.faircode.xlua",
+            "com.oasisfeng.island",
+            "moe.shizuku.privileged.api",
+            "com.cilenco.fakeinfo",
+            "com.android.chrome.fakeinfo",
+            "app.greyshirts.sslcapturepro",
+            "com.github.fox2code.mmm",
+            "com.fox2code.mmm",
+            "com.scottyab.rootbeer.sample",
+            "com.joeykrim.rootcheck",
+            "com.saurik.substrate",
+            "com.formyhm.hideapplication",
+            "com.trianguloy.llscript"
+        )
+        val allPackages = packages.value
+        return cloakingApps.any { it in allPackages }
+    }
+
+    private fun checkBuildTags(): Boolean {
+        val buildTags = Build.TAGS
+        return buildTags != null && buildTags.contains("test-keys")
+    }
+
+    // What `which su` reports, without running it
+    private fun checkSuCommand(): Boolean = StrutterProc.onPath("su")
+
+    private fun checkRootViaShell(): Boolean {
+        // The only check that still has to start a process
+        try {
+            val process = Runtime.getRuntime().exec("su")
+            if (process.waitFor() == 0) return true
+        } catch (_: Exception) {
+            // Expected
+        }
+
+        // /data/data is only listable with elevated access
+        try {
+            val apps = File("/data/data").list()
+            if (apps != null && apps.any { it.contains("com.") } && apps.joinToString("\n").length > 50) return true
+        } catch (_: Exception) {
+            // Expected
+        }
+
+        return false
+    }
+
+    private fun checkXposedFramework(): Boolean {
+        try {
+            Class.forName("de.robv.android.xposed.XposedBridge")
+            return true
+        } catch (_: ClassNotFoundException) {
+            // Not found
+        }
+
+        // LSPosed files (strutter/artifacts.py)
+        if (StrutterPaths.anyExists("root.xposedFramework")) return true
+
+        try {
+            throw RuntimeException()
+        } catch (e: RuntimeException) {
+            for (element in e.stackTrace) {
+                if (element.className.contains("de.robv.android.xposed") ||
+                    element.className.contains("org.lsposed")) {
+                    return true
+                }
+            }
+        }
+
+        return false
+    }
+
+    private fun checkSystemProperties(): Boolean {
+        val suspiciousProps = mapOf(
+            "ro.debuggable" to "1",
+            "ro.secure" to "0",
+            "ro.build.type" to "userdebug",
+            "ro.build.tags" to "test-keys",
+            "service.adb.root" to "1",
+            "ro.kernel.qemu" to "1"
+        )
+
+        for ((prop, suspiciousValue) in suspiciousProps) {
+            if (StrutterProc.systemProperty(prop) == suspiciousValue) return true
+        }
+        return false
+    }
+
+    private fun checkNativeHooks(): Boolean {
+        val suspiciousLibs = arrayOf(
+            "libxposed", "libriru", "liblspd", "libdobby",
+            "libfrida", "libsubstrate", "libhook", "libnativehelper_compat"
+        )
+
+        return StrutterProc.anyLine("/proc/self/maps") { line ->
+            suspiciousLibs.any { line.contains(it) }
+        }
+    }
+
+    // What getenforce reports: "0" in the enforce node is Permissive, and no
+    // selinuxfs at all (no enforce node, none in /proc/filesystems) is
+    // Disabled. A node that exists but cannot be read counts as enforcing.
+    private fun checkSelinuxStatus(): Boolean {
+        val selinuxPaths = arrayOf("/sys/fs/selinux/enforce", "/selinux/enforce")
+        val enforce = selinuxPaths.firstNotNullOfOrNull { StrutterProc.firstLine(it) }
+        if (enforce != null) return enforce == "0"
+        return selinuxPaths.none { File(it).exists() } &&
+            !StrutterProc.anyLine("/proc/filesystems") { it.trimEnd().endsWith("selinuxfs") }
+    }
+
+    private fun checkMountPoints(): Boolean {
+        val suspiciousMounts = arrayOf("magisk", "xposed", "/data/adb", "tmpfs /sbin", "tmpfs /system")
+
+        return StrutterProc.anyLine("/proc/mounts") { line ->
+            suspiciousMounts.any { mount ->
+                line.contains(mount) && (line.contains("/system") || line.contains("/sbin") || line.contains("magisk"))
+            }
+        }
+    }
+
+    private fun checkDeveloperSettings(): Boolean {
+        return try {
+            val resolver = context.contentResolver
+            val adbEnabled = android.provider.Settings.Global.getInt(
+                resolver, android.provider.Settings.Global.ADB_ENABLED, 0
+            ) == 1
+
+            if (adbEnabled) {
+                // USB debugging is currently treated as a root indicator; change return true to return false if you want it as a warning only.
+                true
+            } else {
+                false
+            }
+        } catch (_: Exception) {
+            false
+        }
+    }
+
+    private fun checkEmulator(): Boolean {
+        val indicators = arrayOf(
+            Build.FINGERPRINT.contains("generic"),
+            Build.FINGERPRINT.contains("unknown"),
+            Build.MODEL.contains("google_sdk"),
+            Build.MODEL.contains("Emulator") || Build.MODEL.contains("Android SDK"),
+            Build.MANUFACTURER.contains("Genymotion"),
+            Build.BRAND.startsWith("generic", ignoreCase = true),
+            Build.DEVICE.startsWith("generic", ignoreCase = true),
+            Build.PRODUCT.contains("sdk") ||
+            Build.PRODUCT.contains("emulator") ||
+            Build.PRODUCT.contains("simulator")
+        )
+        // Emulator detection is generally not considered “rooted,” so it does not return true by default and is only a reference for additional risk.
+        return false
+    }
+}
@@ -0,0 +1,165 @@
+package com.example.{{plugin_package}}
+
+import android.os.Handler
+import android.os.Looper
+import java.util.concurrent.CancellationException
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.ExecutionException
+import java.util.concurrent.ExecutorCompletionService
+import java.util.concurrent.Executors
+import java.util.concurrent.Future
+import java.util.concurrent.LinkedBlockingQueue
+import java.util.concurrent.RejectedExecutionException
+import java.util.concurrent.ThreadPoolExecutor
+import java.util.concurrent.TimeUnit
+import java.util.concurrent.atomic.AtomicInteger
+
+enum class CheckStatus { CLEAN, DETECTED, INCONCLUSIVE, ERROR }
+
+// budgetKey lets several checks (e.g. one per port) share one budget entry.
+class Check(val name: String, val budgetKey: String = name, val run: () -> Boolean)
+
+// Runs detection checks away from the platform thread. The checks of one
+// request run concurrently on a shared bounded pool, each with a time budget
+// (generated by STRUTTER) counted from when it starts running: a check that
+// overruns is cancelled and reported INCONCLUSIVE instead of holding up the
+// method channel, and the first DETECTED cancels the rest. A clean device
+// therefore waits for the slowest check, not for the sum of all of them.
+object StrutterChecks {
+    const val DEFAULT_BUDGET_MS = {{check_budget_ms}}L
+    private val BUDGETS: Map<String, Long> = mapOf({{check_budgets}})
+    // The pool grows (up to MAX_THREADS) so that every check of a request
+    // can start at once, on top of threads still stuck in a cancelled check:
+    // an interrupted su or socket call may not return right away. Threads
+    // are mostly blocked on I/O and time out when idle.
+    private const val MIN_THREADS = 16
+    private const val MAX_THREADS = 64
+    private const val POOL_QUEUE = 64
+    // How long past its budget a check may wait for a thread (only when
+    // MAX_THREADS are busy) before it is reported INCONCLUSIVE unstarted.
+    private const val MAX_QUEUE_WAIT_MS = 2000L
+    // Deadlines of checks that start later are picked up within this.
+    private const val QUEUED_POLL_MS = 50L
+
+    private val threadIds = AtomicInteger()
+    private val pool = ThreadPoolExecutor(
+        MIN_THREADS, MIN_THREADS, 30L, TimeUnit.SECONDS, LinkedBlockingQueue(POOL_QUEUE)
+    ) { task ->
+        Thread(task, "strutter-check-${threadIds.incrementAndGet()}").apply { isDaemon = true }
+    }.apply { allowCoreThreadTimeOut(true) }
+
+    // Collects each request's results, one request at a time, so waiting
+    // never takes a pool thread away from the checks themselves.
+    private val dispatcher = Executors.newSingleThreadExecutor { task ->
+        Thread(task, "strutter-dispatch").apply { isDaemon = true }
+    }
+    private val mainHandler = Handler(Looper.getMainLooper())
+
+    fun budgetFor(name: String): Long = BUDGETS[name] ?: DEFAULT_BUDGET_MS
+
+    @Synchronized
+    private fun reserveThreads(count: Int) {
+        val wanted = (pool.activeCount + count).coerceIn(MIN_THREADS, MAX_THREADS)
+        if (wanted > pool.corePoolSize) {
+            pool.maximumPoolSize = wanted
+            pool.corePoolSize = wanted
+        }
+    }
+
+    // Groups checks by plugin ("root", "frida"): the part of the name before
+    // the first dot.
+    val byPlugin: (Check) -> String = { it.name.substringBefore('.') }
+
+    // Starts every check at once and collects them as they finish; each is
+    // cancelled when its budget (counted from when it began running) runs
+    // out. With
+    // stopOnDetection the first DETECTED cancels the checks still running in
+    // its group (all of them by default), which are then missing from the
+    // result; other groups run on. The result keeps check order.
+    fun runAll(
+        checks: List<Check>,
+        stopOnDetection: Boolean = true,
+        group: (Check) -> String = { "" }
+    ): Map<String, CheckStatus> {
+        val statuses = HashMap<String, CheckStatus>()
+        val completion = ExecutorCompletionService<Boolean>(pool)
+        val pending = HashMap<Future<Boolean>, Check>()
+        val started = System.nanoTime()
+        val runningSince = ConcurrentHashMap<Check, Long>()
+        fun deadline(check: Check): Long {
+            val budget = TimeUnit.MILLISECONDS.toNanos(budgetFor(check.budgetKey))
+            return runningSince[check]?.let { it + budget }
+                ?: (started + budget + TimeUnit.MILLISECONDS.toNanos(MAX_QUEUE_WAIT_MS))
+        }
+
+        reserveThreads(checks.size)
+        for (check in checks) {
+            try {
+                pending[completion.submit { runningSince[check] = System.nanoTime(); check.run() }] = check
+            } catch (_: RejectedExecutionException) {
+                statuses[check.name] = CheckStatus.INCONCLUSIVE
+            }
+        }
+        try {
+            while (pending.isNotEmpty()) {
+                val now = System.nanoTime()
+                val expired = pending.filterValues { deadline(it) <= now }
+                for ((future, check) in expired) {
+                    future.cancel(true)
+                    pending.remove(future)
+                    statuses[check.name] = CheckStatus.INCONCLUSIVE
+                }
+                if (pending.isEmpty()) break
+                var wait = pending.values.minOf { deadline(it) } - now
+                if (pending.values.any { it !in runningSince }) {
+                    wait = minOf(wait, TimeUnit.MILLISECONDS.toNanos(QUEUED_POLL_MS))
+                }
+                val done = completion.poll(wait, TimeUnit.NANOSECONDS) ?: continue
+                val check = pending.remove(done) ?: continue
+                val status = statusOf(done)
+                statuses[check.name] = status
+                if (stopOnDetection && status == CheckStatus.DETECTED) {
+                    val stopped = group(check)
+                    for (future in pending.filterValues { group(it) == stopped }.keys) {
+                        future.cancel(true)
+                        pending.remove(future)
+                    }
+                }
+            }
+        } catch (_: InterruptedException) {
+            Thread.currentThread().interrupt()
+        } finally {
+            for (future in pending.keys) future.cancel(true)
+        }
+        val report = LinkedHashMap<String, CheckStatus>()
+        for (check in checks) statuses[check.name]?.let { report[check.name] = it }
+        return report
+    }
+
+    private fun statusOf(future: Future<Boolean>): CheckStatus = try {
+        if (future.get()) CheckStatus.DETECTED else CheckStatus.CLEAN
+    } catch (_: CancellationException) {
+        CheckStatus.INCONCLUSIVE
+    } catch (_: ExecutionException) {
+        CheckStatus.ERROR
+    }
+
+    // runAll off the calling thread; the callback runs on the main (platform)
+    // thread, where MethodChannel results must be delivered.
+    fun runAsync(
+        checks: List<Check>,
+        stopOnDetection: Boolean = true,
+        group: (Check) -> String = { "" },
+        callback: (Map<String, CheckStatus>) -> Unit
+    ) {
+        dispatcher.execute {
+            val report = runAll(checks, stopOnDetection, group)
+            mainHandler.post { callback(report) }
+        }
+    }
+
+    fun detected(report: Map<String, CheckStatus>): Boolean = report.values.any { it == CheckStatus.DETECTED }
+
+    fun describe(report: Map<String, CheckStatus>): Map<String, String> =
+        report.mapValues { it.value.name.lowercase() }
+}
@@ -0,0 +1,34 @@
+package com.example.{{plugin_package}}
+
+import android.content.Context
+import android.content.pm.PackageManager
+import android.os.Build
+
+// Installed package names, for the checks that look for known apps. A
+// plugin enumerates them at most once per request (lazily, shared by every
+// check of the request), not once per check.
+object StrutterPackages {
+    fun installed(context: Context): Set<String> {
+        val packageManager = context.packageManager
+        val allPackages = mutableSetOf<String>()
+
+        try {
+            if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.TIRAMISU) {
+                val packages = packageManager.getInstalledPackages(
+                    PackageManager.PackageInfoFlags.of(0)
+                )
+                packages.forEach { allPackages.add(it.packageName) }
+            } else {
+                @Suppress("DEPRECATION")
+                val packages = packageManager.getInstalledPackages(0)
+                packages.forEach { allPackages.add(it.packageName) }
+            }
+        } catch (e: Exception) {
+            // Silent
+        }
+
+        return allPackages
+    }
+
+    fun shared(context: Context): Lazy<Set<String>> = lazy { installed(context) }
+}
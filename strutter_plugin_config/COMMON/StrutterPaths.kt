@@ -0,0 +1,61 @@
+package com.example.{{plugin_package}}
+
+import java.io.File
+import java.util.concurrent.ConcurrentHashMap
+import java.util.concurrent.TimeUnit
+
+// Root/Frida artifact paths, grouped by parent directory when STRUTTER
+// rendered this file: check -> directory -> entry names. A check lists each
+// directory once and looks its names up in the listing instead of calling
+// File.exists() per path. Directories the app may search but not read (e.g.
+// /data/local/tmp) fall back to exists() for their names.
+object StrutterPaths {
+    private val INDEX: Map<String, Map<String, Set<String>>> = mapOf(
+        {{artifact_index}}
+    )
+
+    // Listings are shared by the checks of one request and refreshed after
+    // LISTING_TTL_NS. A missing directory is remembered for the life of the
+    // process: these only appear when a root solution is installed, which
+    // takes a reboot.
+    private val LISTING_TTL_NS = TimeUnit.SECONDS.toNanos(10)
+
+    // names == null: the directory exists but cannot be listed
+    private class Listing(val exists: Boolean, val names: Set<String>?, val listedAt: Long)
+
+    private val listings = ConcurrentHashMap<String, Listing>()
+
+    private fun listing(dir: String): Listing {
+        val now = System.nanoTime()
+        listings[dir]?.let { if (!it.exists || now - it.listedAt < LISTING_TTL_NS) return it }
+        val file = File(dir)
+        val names = try { file.list() } catch (_: SecurityException) { null }
+        val listing = Listing(names != null || file.isDirectory, names?.toHashSet(), now)
+        listings[dir] = listing
+        return listing
+    }
+
+    private fun present(dir: String, listing: Listing, name: String): Boolean {
+        val names = listing.names
+        return when {
+            name.contains('*') -> {
+                val part = name.replace("*", "")
+                names?.any { it.contains(part) } ?: false
+            }
+            names != null -> name in names
+            else -> File(dir, name).exists()
+        }
+    }
+
+    // Whether any artifact of check (e.g. "root.rootFiles") exists.
+    fun anyExists(check: String): Boolean {
+        val dirs = INDEX[check] ?: return false
+        for ((dir, names) in dirs) {
+            if (Thread.currentThread().isInterrupted) break
+            val listing = try { listing(dir) } catch (_: Exception) { continue }
+            if (!listing.exists) continue
+            if (names.any { present(dir, listing, it) }) return true
+        }
+        return false
+    }
+}
@@ -0,0 +1,119 @@
+package com.example.{{plugin_package}}
+
+import java.io.File
+import java.io.FileInputStream
+import java.lang.reflect.Method
+
+// Reads /proc, /sys and system properties directly instead of forking
+// cat/ps/netstat/getprop/getenforce/which: every process spawn costs tens of
+// milliseconds on Android. Files are streamed through one fixed buffer and
+// every read is capped, so a huge or endless file cannot stall a check, and
+// a cancelled check (interrupted by StrutterChecks) stops at the next chunk.
+// Anything hidden or denied reads as empty, never as an error.
+object StrutterProc {
+    private const val BUFFER_SIZE = 8192
+    private const val MAX_BYTES = 4L shl 20
+    private const val CMDLINE_MAX = 4096
+    private const val NEWLINE: Byte = 10  // '\n'
+    private const val TCP_LISTEN = "0A"
+    private val TCP_TABLES = arrayOf("/proc/net/tcp", "/proc/net/tcp6")
+    private val WHITESPACE = Regex("\\s+")
+
+    // Calls onLine for each line of path until it returns true. Lines longer
+    // than the buffer are cut; reading stops after maxBytes.
+    fun anyLine(path: String, maxBytes: Long = MAX_BYTES, onLine: (String) -> Boolean): Boolean {
+        try {
+            FileInputStream(path).use { input ->
+                val chunk = ByteArray(BUFFER_SIZE)
+                val line = ByteArray(BUFFER_SIZE)
+                var length = 0
+                var total = 0L
+                while (total < maxBytes && !Thread.currentThread().isInterrupted) {
+                    val read = input.read(chunk)
+                    if (read < 0) break
+                    total += read
+                    for (i in 0 until read) {
+                        val b = chunk[i]
+                        if (b == NEWLINE) {
+                            if (onLine(String(line, 0, length, Charsets.UTF_8))) return true
+                            length = 0
+                        } else if (length < line.size) {
+                            line[length++] = b
+                        }
+                    }
+                }
+                if (length > 0 && onLine(String(line, 0, length, Charsets.UTF_8))) return true
+            }
+        } catch (_: Exception) {
+            // Unreadable
+        }
+        return false
+    }
+
+    fun firstLine(path: String): String? {
+        var first: String? = null
+        anyLine(path, BUFFER_SIZE.toLong()) { first = it; true }
+        return first?.trim()
+    }
+
+    // Arguments of a process from /proc/<pid>/cmdline (NUL separated).
+    fun commandLine(pid: String): List<String> = try {
+        FileInputStream("/proc/$pid/cmdline").use { input ->
+            val buffer = ByteArray(CMDLINE_MAX)
+            var size = 0
+            while (size < buffer.size) {
+                val read = input.read(buffer, size, buffer.size - size)
+                if (read < 0) break
+                size += read
+            }
+            String(buffer, 0, size, Charsets.UTF_8).split('\u0000').filter { it.isNotEmpty() }
+        }
+    } catch (_: Exception) {
+        emptyList()
+    }
+
+    // Calls onProcess with the name of each visible process (argv[0], or
+    // /proc/<pid>/comm for kernel threads) until it returns true.
+    fun anyProcess(onProcess: (String) -> Boolean): Boolean {
+        val pids = File("/proc").list() ?: return false
+        for (pid in pids) {
+            if (Thread.currentThread().isInterrupted) break
+            if (pid.isEmpty() || !pid.all { it.isDigit() }) continue
+            val name = commandLine(pid).firstOrNull() ?: firstLine("/proc/$pid/comm") ?: continue
+            if (onProcess(name)) return true
+        }
+        return false
+    }
+
+    // Whether a TCP socket is listening on one of ports. /proc/net/tcp{,6}
+    // rows read "sl local_address rem_address st ...", addresses as
+    // "0100007F:69A2" (hex port); the header row never matches.
+    fun anyListeningPort(ports: Set<Int>): Boolean = TCP_TABLES.any { path ->
+        anyLine(path) { line ->
+            val fields = line.trim().split(WHITESPACE)
+            fields.size > 3 && fields[3] == TCP_LISTEN &&
+                fields[1].substringAfterLast(':').toIntOrNull(16)?.let { it in ports } == true
+        }
+    }
+
+    // Whether an executable called name is in one of the PATH directories.
+    fun onPath(name: String): Boolean {
+        val dirs = System.getenv("PATH")?.split(':') ?: return false
+        return dirs.any { it.isNotEmpty() && File(it, name).exists() }
+    }
+
+    private val getProperty: Method? by lazy {
+        try {
+            Class.forName("android.os.SystemProperties").getMethod("get", String::class.java)
+        } catch (_: Exception) {
+            null
+        }
+    }
+
+    // Android system property (what getprop prints), or null when unset.
+    fun systemProperty(name: String): String? = try {
+        (getProperty?.invoke(null, name) as? String)?.trim()?.takeIf { it.isNotEmpty() }
+    } catch (_: Exception) {
+        null
+    }
+}
@@ -0,0 +1,37 @@
+package com.example.{{plugin_package}}
+
+import android.content.Context
+import android.content.pm.PackageManager
+import android.os.Build
+import android.util.Base64
+import java.security.MessageDigest
+
+// Base64 SHA-256 of the app's first signing certificate, the value the
+// integrity guard compares against its list of valid signatures.
+object StrutterSignature {
+    fun sha256Base64(context: Context): String {
+        return try {
+            val pm = context.packageManager
+            val packageName = context.packageName
+
+            val signatures = if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.P) {
+                pm.getPackageInfo(packageName, PackageManager.GET_SIGNING_CERTIFICATES)
+                    .signingInfo?.apkContentsSigners
+            } else {
+                @Suppress("DEPRECATION")
+                pm.getPackageInfo(packageName, PackageManager.GET_SIGNATURES).signatures
+            }
+
+            if (signatures != null && signatures.isNotEmpty()) {
+                val cert = signatures[0].toByteArray()
+                val md = MessageDigest.getInstance("SHA-256")
+                val digest = md.digest(cert)
+                Base64.encodeToString(digest, Base64.NO_WRAP)
+            } else {
+                "No signature found"
+            }
+        } catch (e: Exception) {
+            "Error: ${e.message}"
+        }
+    }
+}
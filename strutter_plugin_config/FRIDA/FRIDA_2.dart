@@ -1,11 +1,17 @@
 import 'dart:async';
 import 'package:flutter/services.dart';
 
-class FridaDetectionNodbgV1Plugin {
-  static const MethodChannel _channel = MethodChannel('frida_detection_nodbg_v1_plugin');
+class {{plugin_class}} {
+  static const MethodChannel _channel = MethodChannel('{{plugin_package}}');
 
   static Future<bool> get isFridaDetected async {
     final bool result = await _channel.invokeMethod('isFridaDetected');
     return result;
   }
+
+  /// Status of every check: clean, detected, inconclusive (over its time budget) or error.
+  static Future<Map<String, String>> get fridaCheckReport async {
+    final result = await _channel.invokeMapMethod<String, String>('fridaCheckReport');
+    return result ?? const {};
+  }
 }
\ No newline at end of file
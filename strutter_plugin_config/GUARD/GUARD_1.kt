@@ -0,0 +1,74 @@
+package com.example.{{plugin_package}}
+
+import android.content.Context
+import io.flutter.embedding.engine.plugins.FlutterPlugin
+import io.flutter.plugin.common.MethodCall
+import io.flutter.plugin.common.MethodChannel
+
+// Root, Frida and integrity checks behind one MethodChannel. runAll answers
+// every requested verdict in one round trip: the detectors run as a single
+// StrutterChecks request sharing one installed-package enumeration, and the
+// result is a bitmask plus the APK signature. A positive only stops the
+// remaining checks of its own plugin, so each requested bit is as complete
+// as the separate plugin's answer. The single-purpose methods of
+// the separate plugins are kept so their guard snippets work unchanged.
+class {{plugin_class}} : FlutterPlugin, MethodChannel.MethodCallHandler {
+    private lateinit var channel: MethodChannel
+    private lateinit var context: Context
+
+    override fun onAttachedToEngine(binding: FlutterPlugin.FlutterPluginBinding) {
+        channel = MethodChannel(binding.binaryMessenger, "{{plugin_package}}")
+        channel.setMethodCallHandler(this)
+        context = binding.applicationContext
+    }
+
+    override fun onMethodCall(call: MethodCall, result: MethodChannel.Result) {
+        when (call.method) {
+            "runAll" -> {
+                val mask = call.argument<Int>("checks") ?: (ROOT or FRIDA)
+                val withSignature = call.argument<Boolean>("signature") ?: true
+                StrutterChecks.runAsync(checks(mask), group = StrutterChecks.byPlugin) { report ->
+                    var detected = 0
+                    if (detectedIn(report, "root.")) detected = detected or ROOT
+                    if (detectedIn(report, "frida.")) detected = detected or FRIDA
+                    result.success(mapOf(
+                        "detected" to detected,
+                        "signature" to if (withSignature) StrutterSignature.sha256Base64(context) else null
+                    ))
+                }
+            }
+            "guardCheckReport" -> StrutterChecks.runAsync(checks(ROOT or FRIDA), stopOnDetection = false) { report ->
+                result.success(StrutterChecks.describe(report))
+            }
+            "isDeviceRooted" -> StrutterChecks.runAsync(checks(ROOT)) { report ->
+                result.success(StrutterChecks.detected(report))
+            }
+            "isFridaDetected" -> StrutterChecks.runAsync(checks(FRIDA)) { report ->
+                result.success(StrutterChecks.detected(report))
+            }
+            "getApkSignature" -> result.success(StrutterSignature.sha256Base64(context))
+            else -> result.notImplemented()
+        }
+    }
+
+    override fun onDetachedFromEngine(binding: FlutterPlugin.FlutterPluginBinding) {
+        channel.setMethodCallHandler(null)
+    }
+
+    private fun detectedIn(report: Map<String, CheckStatus>, prefix: String): Boolean =
+        report.any { it.key.startsWith(prefix) && it.value == CheckStatus.DETECTED }
+
+    private fun checks(mask: Int): List<Check> {
+        val packages = StrutterPackages.shared(context)
+        val checks = ArrayList<Check>()
+        if ((mask and ROOT) != 0) checks += RootChecks(context, packages).all()
+        if ((mask and FRIDA) != 0) checks += FridaChecks(packages).all()
+        return checks
+    }
+
+    companion object {
+        // Bits of runAll's "checks" argument and "detected" result
+        const val ROOT = 1
+        const val FRIDA = 2
+    }
+}
@@ -0,0 +1,54 @@
+import 'dart:async';
+import 'package:flutter/services.dart';
+
+/// Result of [{{plugin_class}}.runAll].
+class {{plugin_class}}Verdicts {
+  static const int root = 1;
+  static const int frida = 2;
+
+  /// Bitmask of [root] and [frida] detections.
+  final int detected;
+
+  /// Base64 SHA-256 of the APK signing certificate, if requested.
+  final String? signature;
+
+  const {{plugin_class}}Verdicts(this.detected, this.signature);
+
+  bool get rooted => (detected & root) != 0;
+  bool get fridaDetected => (detected & frida) != 0;
+}
+
+class {{plugin_class}} {
+  static const MethodChannel _channel = MethodChannel('{{plugin_package}}');
+
+  /// Every requested check in one call. A detection only stops the remaining
+  /// checks of its own kind, so each requested verdict is complete.
+  static Future<{{plugin_class}}Verdicts> runAll({bool root = true, bool frida = true, bool integrity = true}) async {
+    final result = await _channel.invokeMapMethod<String, dynamic>('runAll', {
+      'checks': (root ? {{plugin_class}}Verdicts.root : 0) | (frida ? {{plugin_class}}Verdicts.frida : 0),
+      'signature': integrity,
+    });
+    return {{plugin_class}}Verdicts(result?['detected'] as int? ?? 0, result?['signature'] as String?);
+  }
+
+  /// Status of every root and Frida check: clean, detected, inconclusive (over its time budget) or error.
+  static Future<Map<String, String>> get guardCheckReport async {
+    final result = await _channel.invokeMapMethod<String, String>('guardCheckReport');
+    return result ?? const {};
+  }
+
+  static Future<bool> get isDeviceRooted async {
+    final bool result = await _channel.invokeMethod('isDeviceRooted');
+    return result;
+  }
+
+  static Future<bool> get isFridaDetected async {
+    final bool result = await _channel.invokeMethod('isFridaDetected');
+    return result;
+  }
+
+  static Future<String> getApkSignature() async {
+    final String signature = await _channel.invokeMethod('getApkSignature');
+    return signature;
+  }
+}
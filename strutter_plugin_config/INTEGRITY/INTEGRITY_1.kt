@@ -1,57 +1,27 @@
-package com.example.integrity_check_nodbg_v1_plugin
+package com.example.{{plugin_package}}
 
-import android.content.pm.PackageManager
-import android.os.Build
 import io.flutter.embedding.engine.plugins.FlutterPlugin
 import io.flutter.plugin.common.MethodCall
 import io.flutter.plugin.common.MethodChannel
-import java.security.MessageDigest
-import android.util.Base64
 
-class IntegrityCheckNodbgV1Plugin : FlutterPlugin, MethodChannel.MethodCallHandler {
+class {{plugin_class}} : FlutterPlugin, MethodChannel.MethodCallHandler {
     private lateinit var channel: MethodChannel
     private lateinit var context: android.content.Context
 
     override fun onAttachedToEngine(binding: FlutterPlugin.FlutterPluginBinding) {
         context = binding.applicationContext
-        channel = MethodChannel(binding.binaryMessenger, "integrity_check_nodbg_v1_plugin")
+        channel = MethodChannel(binding.binaryMessenger, "{{plugin_package}}")
         channel.setMethodCallHandler(this)
     }
 
     override fun onMethodCall(call: MethodCall, result: MethodChannel.Result) {
         if (call.method == "getApkSignature") {
-            result.success(getApkSignatureBase64())
+            result.success(StrutterSignature.sha256Base64(context))
         } else {
             result.notImplemented()
         }
     }
 
-    private fun getApkSignatureBase64(): String {
-        return try {
-            val pm = context.packageManager
-            val packageName = context.packageName
-
-            val signatures = if (Build.VERSION.SDK_INT >= Build.VERSION_CODES.P) {
-                pm.getPackageInfo(packageName, PackageManager.GET_SIGNING_CERTIFICATES)
-                    .signingInfo?.apkContentsSigners
-            } else {
-                @Suppress("DEPRECATION")
-                pm.getPackageInfo(packageName, PackageManager.GET_SIGNATURES).signatures
-            }
-
-            if (signatures != null && signatures.isNotEmpty()) {
-                val cert = signatures[0].toByteArray()
-                val md = MessageDigest.getInstance("SHA-256")
-                val digest = md.digest(cert)
-                Base64.encodeToString(digest, Base64.NO_WRAP)
-            } else {
-                "No signature found"
-            }
-        } catch (e: Exception) {
-            "Error: ${e.message}"
-        }
-    }
-
     override fun onDetachedFromEngine(binding: FlutterPlugin.FlutterPluginBinding) {
         channel.setMethodCallHandler(null)
     }
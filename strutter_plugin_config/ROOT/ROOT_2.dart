@@ -1,8 +1,8 @@
 import 'dart:async';
 import 'package:flutter/services.dart';
 
-class RootDetectionNodbgV1Plugin {
-  static const MethodChannel _channel = MethodChannel('root_detection_nodbg_v1_plugin');
+class {{plugin_class}} {
+  static const MethodChannel _channel = MethodChannel('{{plugin_package}}');
 
   /// Mengecek apakah device rooted
   static Future<bool> get isDeviceRooted async {
@@ -10,5 +10,11 @@ class RootDetectionNodbgV1Plugin {
     return result;
   }
 
+  /// Hasil tiap pengecekan: clean, detected, inconclusive (melewati batas waktu) atau error
+  static Future<Map<String, String>> get rootCheckReport async {
+    final result = await _channel.invokeMapMethod<String, String>('rootCheckReport');
+    return result ?? const {};
+  }
+
   /// Bisa tambahkan method lain (contoh: cek emulator, dll)
 }
\ No newline at end of file
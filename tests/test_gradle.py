@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from strutter import core
+from strutter.fileio import FileWriter
+from strutter.gradle import GradleScript
+
+NDK = (("android",), "ndkVersion", '"27.0.12077973"')
+TARGET_SDK = (("android", "defaultConfig"), "targetSdk", "34")
+
+
+class OneLineBlockTest(unittest.TestCase):
+    """Inserts into ``android { ... }`` written on a single line."""
+
+    def edit(self, text, dialect, settings):
+        return GradleScript(text, dialect).set_properties(settings)
+
+    def test_kotlin_dsl(self):
+        out, changed = self.edit("android { compileSdk = 34 }\n", "kts", [NDK])
+        self.assertEqual(changed, 1)
+        self.assertEqual(out, 'android {\n    ndkVersion = "27.0.12077973"\n    compileSdk = 34 }\n')
+
+    def test_groovy(self):
+        out, changed = self.edit("android { compileSdk 34 }\n", "groovy", [NDK])
+        self.assertEqual(changed, 1)
+        self.assertEqual(out, 'android {\n    ndkVersion = "27.0.12077973"\n    compileSdk 34 }\n')
+
+    def test_missing_nested_block(self):
+        for dialect, body in (("kts", "compileSdk = 34"), ("groovy", "compileSdk 34")):
+            with self.subTest(dialect=dialect):
+                out, changed = self.edit(f"android {{ {body} }}\n", dialect, [NDK, TARGET_SDK])
+                self.assertEqual(changed, 2)
+                self.assertEqual(out, (
+                    "android {\n"
+                    '    ndkVersion = "27.0.12077973"\n'
+                    "    defaultConfig {\n"
+                    "        targetSdk = 34\n"
+                    "    }\n"
+                    f"    {body} }}\n"
+                ))
+
+    def test_empty_block(self):
+        out, _ = self.edit("android { }\n", "kts", [NDK])
+        self.assertEqual(out, 'android {\n    ndkVersion = "27.0.12077973"\n}\n')
+
+    def test_rerun_is_unchanged(self):
+        out, _ = self.edit("android { compileSdk = 34 }\n", "kts", [NDK, TARGET_SDK])
+        again, changed = self.edit(out, "kts", [NDK, TARGET_SDK])
+        self.assertEqual(changed, 0)
+        self.assertEqual(again, out)
+
+    def test_multi_line_block_untouched(self):
+        text = "android {\n    compileSdk = 34\n}\n"
+        out, _ = self.edit(text, "kts", [NDK])
+        self.assertEqual(out, 'android {\n    ndkVersion = "27.0.12077973"\n    compileSdk = 34\n}\n')
+
+
+class NdkVersionTest(unittest.TestCase):
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.project)
+        os.makedirs(os.path.join(self.project, "android", "app"))
+        self.gradle = os.path.join(self.project, "android", "app", "build.gradle.kts")
+
+    def update(self, text):
+        with open(self.gradle, "w") as f:
+            f.write(text)
+        with mock.patch.object(GradleScript, "load", wraps=GradleScript.load) as load:
+            result = core.update_ndk_version({"flutter_project": self.project}, writer=FileWriter())
+        self.assertEqual(load.call_count, 1)
+        return result
+
+    def test_added_updated_unchanged(self):
+        self.assertEqual(self.update("android {\n}\n"), (True, "✓ NDK version added."))
+        self.assertEqual(self.update('android {\n    ndkVersion = "25.1"\n}\n'), (True, "✓ NDK version updated."))
+        self.assertEqual(self.update(f'android {{\n    ndkVersion = "{core.NDK_VERSION}"\n}}\n'),
+                         (True, "✓ NDK version already set."))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from strutter import integrate
+from strutter.core import GUARD_KEY
+from strutter.dart import DartError
+from strutter.fileio import FileWriter
+
+MAIN = """\
+import 'package:flutter/material.dart';
+
+void main() => runApp(const App());
+
+class App extends StatefulWidget {
+  const App({super.key});
+
+  @override
+  State<App> createState() => _AppState();
+}
+
+class _AppState extends State<App> {
+  @override
+  void initState() {
+    super.initState();
+    debugPrint('ready');
+  }
+
+  @override
+  Widget build(BuildContext context) => const MaterialApp();
+}
+"""
+
+SEPARATE = {
+    "selected_plugins": {"root": True, "frida": True, "integrity": False},
+    "plugins": {"root": "r" * 33, "frida": "f" * 33},
+}
+COMBINED = {
+    "selected_plugins": {"root": True, "frida": True, "integrity": False},
+    "plugins": {GUARD_KEY: "g" * 33},
+}
+
+
+def patch(text, config, mode="exit"):
+    guards = integrate.guard_snippets(config, {key: mode for key in ("root", "frida", "integrity")})
+    retired = [key for key in integrate.GENERATED_KEYS if key not in config["plugins"]]
+    return integrate.patch_main_dart(text, guards, retired)[0]
+
+
+class PatchTest(unittest.TestCase):
+    def test_inserts_once(self):
+        once = patch(MAIN, SEPARATE)
+        for key in ("root", "frida"):
+            self.assertEqual(once.count(integrate.BEGIN_MARKER.format(key)), 1)
+            self.assertIn(integrate.IMPORT_MARKER.format(key), once)
+        self.assertEqual(once.count("_checkRoot();"), 1)
+        self.assertIn("import 'dart:io';" + integrate.IMPORT_MARKER.format(integrate.DART_IO_KEY), once)
+        # The existing initState keeps its statements, after the calls
+        self.assertLess(once.index("_checkFrida();"), once.index("debugPrint('ready');"))
+        self.assertEqual(patch(once, SEPARATE), once)
+
+    def test_creates_init_state(self):
+        text = MAIN.replace(
+            "  @override\n  void initState() {\n    super.initState();\n    debugPrint('ready');\n  }\n\n", "")
+        once = patch(text, SEPARATE)
+        self.assertIn("  void initState() {\n    super.initState();\n    _checkFrida();\n    _checkRoot();\n  }\n",
+                      once)
+        self.assertEqual(patch(once, SEPARATE), once)
+
+    def test_mode_change_updates_in_place(self):
+        exit_text = patch(MAIN, SEPARATE)
+        popup = patch(exit_text, SEPARATE, "popup")
+        self.assertNotEqual(popup, exit_text)
+        self.assertEqual(popup, patch(MAIN, SEPARATE, "popup"))
+        self.assertEqual(patch(popup, SEPARATE), exit_text)
+
+    def test_separate_to_combined(self):
+        combined = patch(patch(MAIN, SEPARATE), COMBINED)
+        self.assertEqual(combined, patch(MAIN, COMBINED))
+        for leftover in ("_checkRoot", "_checkFrida", "strutter:root", "strutter:frida", "r" * 33, "f" * 33):
+            self.assertNotIn(leftover, combined)
+        self.assertEqual(combined.count("_checkGuard();"), 1)
+        # And back
+        self.assertEqual(patch(combined, SEPARATE), patch(MAIN, SEPARATE))
+
+    def test_log_mode_drops_dart_io(self):
+        logged = patch(patch(MAIN, SEPARATE), SEPARATE, "log")
+        self.assertNotIn("dart:io", logged)
+        self.assertEqual(logged, patch(MAIN, SEPARATE, "log"))
+        combined = patch(patch(MAIN, COMBINED), COMBINED, "log")
+        self.assertNotIn("dart:io", combined)
+
+    def test_keeps_own_dart_io(self):
+        text = "import 'dart:io';\n" + MAIN
+        once = patch(text, SEPARATE)
+        self.assertEqual(once.count("dart:io"), 1)
+        self.assertIn("import 'dart:io';\n", patch(once, SEPARATE, "log"))
+
+    def test_no_state_class(self):
+        with self.assertRaises(DartError):
+            patch("void main() {}\n", SEPARATE)
+
+
+class IntegrateMainDartTest(unittest.TestCase):
+    def setUp(self):
+        self.project = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.project)
+        os.makedirs(os.path.join(self.project, "lib"))
+        self.main = os.path.join(self.project, integrate.MAIN_DART)
+        with open(self.main, "w") as f:
+            f.write(MAIN)
+
+    def integrate(self, config, mode="exit"):
+        config = dict(config, flutter_project=self.project)
+        modes = {key: mode for key in ("root", "frida", "integrity")}
+        ok, msg = integrate.integrate_main_dart(config, modes, writer=FileWriter())
+        self.assertTrue(ok, msg)
+        with open(self.main) as f:
+            return msg, f.read()
+
+    def test_rerun_and_switch(self):
+        msg, separate = self.integrate(SEPARATE)
+        self.assertTrue(msg.startswith("✓ Guards integrated"))
+        msg, again = self.integrate(SEPARATE)
+        self.assertTrue(msg.startswith("✓ Guards already integrated"))
+        self.assertEqual(again, separate)
+        msg, combined = self.integrate(COMBINED, "log")
+        self.assertIn("removed the root guard", msg)
+        self.assertEqual(combined, patch(MAIN, COMBINED, "log"))
+        self.assertNotIn("dart:io", combined)
+
+    def test_requires_signature_for_integrity(self):
+        config = dict(SEPARATE, plugins={"integrity": "i" * 33}, flutter_project=self.project)
+        ok, msg = integrate.integrate_main_dart(config, {}, writer=FileWriter())
+        self.assertFalse(ok)
+        self.assertIn("signature", msg)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+from strutter import keystore
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+PASSWORD = "changeit"
+# SHA-256 of fixtures/upload_cert.der, as `openssl dgst -sha256 -binary | base64` prints it
+UPLOAD_DIGEST = "Xj2LaVGlyvXU6xU2ykBZGrs2n3sxDAZOY178z2UQ7ZQ="
+
+# `openssl pkcs12 -export -name upload -passout pass:changeit`, with the
+# certificate bag encrypted as named
+PKCS12_FIXTURES = {
+    "pbes2_aes256.p12": "PBES2/PBKDF2-HMAC-SHA256/AES-256-CBC, SHA-256 MAC",
+    "legacy_rc2_40.p12": "-legacy: pbeWithSHA1And40BitRC2-CBC, SHA-1 MAC",
+    "legacy_rc2_128.p12": "-legacy -certpbe PBE-SHA1-RC2-128, SHA-1 MAC",
+}
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+def _utf(text):
+    raw = text.encode("utf-8")
+    return struct.pack(">H", len(raw)) + raw
+
+def build_jks(cert, password, magic=keystore.JKS_MAGIC):
+    """A version 2 JKS/JCEKS file (the layout keytool writes) holding one key
+    entry and one trusted certificate entry for ``cert``.
+
+    There is no JDK here to produce a fixture, and certificates are stored
+    in the clear, so the key entry's protected key is a placeholder.
+    """
+    cert_field = _utf("X.509") + struct.pack(">I", len(cert)) + cert
+    body = struct.pack(">III", magic, 2, 2)
+    protected_key = b"\x30\x03\x02\x01\x00"
+    body += struct.pack(">I", keystore.JKS_PRIVATE_KEY) + _utf("upload") + bytes(8)
+    body += struct.pack(">I", len(protected_key)) + protected_key + struct.pack(">I", 1) + cert_field
+    body += struct.pack(">I", keystore.JKS_TRUSTED_CERT) + _utf("ca") + bytes(8) + cert_field
+    digest = hashlib.sha1(password.encode("utf-16-be") + keystore.JKS_DIGEST_WHITENER + body).digest()
+    return body + digest
+
+
+class PKCS12Test(unittest.TestCase):
+    def test_fixtures(self):
+        for name, scheme in PKCS12_FIXTURES.items():
+            with self.subTest(name, scheme=scheme):
+                entries = keystore.parse_pkcs12(_fixture(name), PASSWORD)
+                self.assertEqual([(e["alias"], e["type"], e["base64"]) for e in entries],
+                                 [("upload", keystore.PRIVATE_KEY_ENTRY, UPLOAD_DIGEST)])
+
+    def test_wrong_password(self):
+        for name in PKCS12_FIXTURES:
+            with self.subTest(name):
+                with self.assertRaisesRegex(keystore.KeystoreError, "incorrect"):
+                    keystore.parse_pkcs12(_fixture(name), "wrong")
+
+    def test_truncated(self):
+        with self.assertRaises(keystore.KeystoreError):
+            keystore.parse_pkcs12(_fixture("pbes2_aes256.p12")[:200], PASSWORD)
+
+
+class JKSTest(unittest.TestCase):
+    def setUp(self):
+        self.cert = _fixture("upload_cert.der")
+
+    def test_jks_and_jceks(self):
+        for magic in (keystore.JKS_MAGIC, keystore.JCEKS_MAGIC):
+            with self.subTest(magic=hex(magic)):
+                data = build_jks(self.cert, PASSWORD, magic)
+                for password in (PASSWORD, None):
+                    entries = keystore.parse_jks(data, password)
+                    self.assertEqual([(e["alias"], e["type"], e["base64"]) for e in entries], [
+                        ("upload", keystore.PRIVATE_KEY_ENTRY, UPLOAD_DIGEST),
+                        ("ca", keystore.TRUSTED_CERT_ENTRY, UPLOAD_DIGEST),
+                    ])
+
+    def test_wrong_password(self):
+        with self.assertRaisesRegex(keystore.KeystoreError, "incorrect"):
+            keystore.parse_jks(build_jks(self.cert, PASSWORD), "wrong")
+
+
+class KeystoreFileTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def test_detects_format(self):
+        jks = os.path.join(self.dir, "upload.keystore")
+        with open(jks, "wb") as f:
+            f.write(build_jks(_fixture("upload_cert.der"), PASSWORD))
+        for path in (jks, os.path.join(FIXTURES, "pbes2_aes256.p12")):
+            with self.subTest(os.path.basename(path)):
+                entries = keystore.keystore_entries(path, PASSWORD)
+                self.assertEqual(keystore.signing_digests(entries), [UPLOAD_DIGEST])
+
+
+if __name__ == "__main__":
+    unittest.main()
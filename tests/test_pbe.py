@@ -0,0 +1,98 @@
+import unittest
+
+from strutter import pbe
+
+# FIPS-197 appendices B and C: (key, plaintext, ciphertext)
+AES_VECTORS = [
+    ("2b7e151628aed2a6abf7158809cf4f3c", "3243f6a8885a308d313198a2e0370734", "3925841d02dc09fbdc118597196a0b32"),
+    ("000102030405060708090a0b0c0d0e0f", "00112233445566778899aabbccddeeff", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    ("000102030405060708090a0b0c0d0e0f1011121314151617",
+     "00112233445566778899aabbccddeeff", "dda97ca4864cdfe06eaf70a0ec0d7191"),
+    ("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+     "00112233445566778899aabbccddeeff", "8ea2b7ca516745bfeafc49904b496089"),
+]
+
+# RFC 2268 section 5: (key, effective key bits, plaintext, ciphertext)
+RC2_VECTORS = [
+    ("0000000000000000", 63, "0000000000000000", "ebb773f993278eff"),
+    ("ffffffffffffffff", 64, "ffffffffffffffff", "278b27e42e2f0d49"),
+    ("3000000000000000", 64, "1000000000000001", "30649edf9be7d2c2"),
+    ("88", 64, "0000000000000000", "61a8a244adacccf0"),
+    ("88bca90e90875a", 64, "0000000000000000", "6ccf4308974c267f"),
+    ("88bca90e90875a7f0f79c384627bafb2", 64, "0000000000000000", "1a807d272bbe5db1"),
+    ("88bca90e90875a7f0f79c384627bafb2", 128, "0000000000000000", "2269552ab0f85ca6"),
+    ("88bca90e90875a7f0f79c384627bafb216f80a6f85920584c42fceb0be255daf1e", 129,
+     "0000000000000000", "5b78d3a43dfff1f1"),
+]
+
+# CBC with PKCS#7 padding, from `openssl enc` (RC2 with -provider legacy)
+CBC_PLAINTEXT = b"STRUTTER cbc known answer"
+AES_IV = "0f0e0d0c0b0a09080706050403020100"
+AES_CBC_VECTORS = [
+    ("000102030405060708090a0b0c0d0e0f",
+     "0db6dd46fed8d2ad004cfb8ffb59c738fe224a17bce1cb9fd0e1daaeb0911bf9"),
+    ("000102030405060708090a0b0c0d0e0f1011121314151617",
+     "7240623c3ddf472f6c57ccf99d1c484dd3a866378e1ac40c478ae3b898eef8bc"),
+    ("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+     "35ca3a4b418b70f7ea4066b4204b1f7462c75ac9c34adfa132ac4aa9915f2b42"),
+]
+RC2_IV = "0001020304050607"
+RC2_CBC_VECTORS = [
+    ("88bca90e90875a7f0f79c384627bafb2", 128,
+     "dc764ffdf65e50453d01780a88107be5057882fde92f6f95a35bae550d917b52"),
+    ("88bca90e90", 40, "befaf1964d85a4db63d8292c6aa8a7b227289f68806190aaf9e486b9b8e73b7d"),
+]
+
+
+class AESTest(unittest.TestCase):
+    def test_fips197_blocks(self):
+        for key, plaintext, ciphertext in AES_VECTORS:
+            with self.subTest(key=key):
+                decrypt = pbe._aes_block_decryptor(bytes.fromhex(key))
+                self.assertEqual(decrypt(bytes.fromhex(ciphertext)).hex(), plaintext)
+
+    def test_cbc(self):
+        for key, ciphertext in AES_CBC_VECTORS:
+            with self.subTest(bits=len(key) * 4):
+                out = pbe.aes_cbc_decrypt(bytes.fromhex(key), bytes.fromhex(AES_IV), bytes.fromhex(ciphertext))
+                self.assertEqual(out, CBC_PLAINTEXT)
+
+    def test_wrong_key_fails_padding(self):
+        key, ciphertext = AES_CBC_VECTORS[0]
+        with self.assertRaises(pbe.PBEError):
+            pbe.aes_cbc_decrypt(bytes(16), bytes.fromhex(AES_IV), bytes.fromhex(ciphertext))
+
+    def test_invalid_key_length(self):
+        with self.assertRaises(pbe.PBEError):
+            pbe.aes_cbc_decrypt(bytes(15), bytes(16), bytes(16))
+
+
+class RC2Test(unittest.TestCase):
+    def test_rfc2268_blocks(self):
+        for key, bits, plaintext, ciphertext in RC2_VECTORS:
+            with self.subTest(key=key, bits=bits):
+                decrypt = pbe._rc2_block_decryptor(bytes.fromhex(key), bits)
+                self.assertEqual(decrypt(bytes.fromhex(ciphertext)).hex(), plaintext)
+
+    def test_cbc(self):
+        for key, bits, ciphertext in RC2_CBC_VECTORS:
+            with self.subTest(bits=bits):
+                out = pbe.rc2_cbc_decrypt(bytes.fromhex(key), bits, bytes.fromhex(RC2_IV), bytes.fromhex(ciphertext))
+                self.assertEqual(out, CBC_PLAINTEXT)
+
+
+class PKCS12KDFTest(unittest.TestCase):
+    def test_password_encoding(self):
+        self.assertEqual(pbe.pkcs12_password("ab"), b"\x00a\x00b\x00\x00")
+
+    def test_lengths_and_purposes(self):
+        secret = pbe.pkcs12_password("changeit")
+        key = pbe.pkcs12_kdf(secret, b"saltsalt", 3, pbe.KDF_KEY, 45, "sha1")
+        self.assertEqual(len(key), 45)
+        # A shorter request is a prefix of a longer one
+        self.assertEqual(pbe.pkcs12_kdf(secret, b"saltsalt", 3, pbe.KDF_KEY, 20, "sha1"), key[:20])
+        self.assertNotEqual(pbe.pkcs12_kdf(secret, b"saltsalt", 3, pbe.KDF_IV, 45, "sha1"), key)
+
+
+if __name__ == "__main__":
+    unittest.main()
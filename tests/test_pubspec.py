@@ -0,0 +1,127 @@
+import unittest
+
+from strutter.pubspec import DEPENDENCY_SECTIONS, Pubspec, PubspecError, relative_dependency_path
+
+PUBSPEC = """\
+# An app pubspec with the things real ones carry
+name: app
+description: "A: quoted description"
+publish_to: 'none'
+version: 1.0.0+1
+
+environment:
+  sdk: ^3.5.0
+
+dependencies:
+  flutter:
+    sdk: flutter
+  http: ^1.2.0   # pinned for now
+  "quoted_pkg": any
+  git_dep:
+    git:
+      url: https://example.com/dep.git
+      ref: main
+  local: {path: ../local}
+
+  # trailing comment of the section
+
+dev_dependencies:
+  flutter_test:
+    sdk: flutter
+  lints: ^4.0.0
+
+dependency_overrides:
+  http:
+    path: ../http
+
+flutter:
+  uses-material-design: true
+  assets:
+    - assets/
+workspace:
+  - packages/a
+  - packages/b
+"""
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_byte_identical(self):
+        for text in (PUBSPEC, PUBSPEC.replace("\n", "\r\n"), PUBSPEC.rstrip("\n"), ""):
+            with self.subTest(repr(text[-3:])):
+                self.assertEqual(Pubspec(text).text(), text)
+
+    def test_index(self):
+        pubspec = Pubspec(PUBSPEC)
+        self.assertEqual(list(pubspec.entries["dependencies"]),
+                         ["flutter", "http", "quoted_pkg", "git_dep", "local"])
+        self.assertEqual(pubspec.dependency("local").path, "../local")
+        self.assertIsNone(pubspec.dependency("git_dep").path)
+        self.assertEqual(pubspec.sections_of("http"), ["dependencies", "dependency_overrides"])
+        self.assertEqual(pubspec.workspace, ["packages/a", "packages/b"])
+        self.assertIn("uses-material-design", pubspec.child_keys("flutter"))
+
+    def test_noop_edit_keeps_bytes(self):
+        pubspec = Pubspec(PUBSPEC)
+        self.assertEqual(pubspec.set_path_dependencies([("local", "../local")]), 0)
+        self.assertEqual(pubspec.remove_dependencies(["absent"]), 0)
+        self.assertEqual(pubspec.text(), PUBSPEC)
+
+
+class EditTest(unittest.TestCase):
+    def test_set_in_every_section(self):
+        for section in DEPENDENCY_SECTIONS:
+            with self.subTest(section):
+                pubspec = Pubspec(PUBSPEC)
+                self.assertEqual(pubspec.set_path_dependencies(
+                    [("x_plugin", "../STRUTTER/x_plugin"), ("http", "../fork/http")], section), 2)
+                again = Pubspec(pubspec.text())
+                self.assertTrue(again.has_path_dependency("x_plugin", "../STRUTTER/x_plugin", section))
+                self.assertTrue(again.has_path_dependency("http", "../fork/http", section))
+                self.assertEqual(again.set_path_dependencies(
+                    [("x_plugin", "../STRUTTER/x_plugin"), ("http", "../fork/http")], section), 0)
+                # Every other section is untouched
+                for other in DEPENDENCY_SECTIONS:
+                    if other != section:
+                        self.assertEqual(
+                            {n: e.path for n, e in again.entries[other].items()},
+                            {n: e.path for n, e in Pubspec(PUBSPEC).entries[other].items()})
+
+    def test_set_then_remove_in_every_section(self):
+        for section in DEPENDENCY_SECTIONS:
+            with self.subTest(section):
+                pubspec = Pubspec(PUBSPEC)
+                pubspec.set_path_dependencies([("x_plugin", "../STRUTTER/x_plugin")], section)
+                self.assertEqual(pubspec.remove_dependencies(["x_plugin", "absent"], section), 1)
+                self.assertEqual(pubspec.text(), PUBSPEC)
+
+    def test_remove_multi_line_entry(self):
+        pubspec = Pubspec(PUBSPEC)
+        self.assertEqual(pubspec.remove_dependencies(["git_dep", "http"]), 2)
+        self.assertEqual(list(pubspec.entries["dependencies"]), ["flutter", "quoted_pkg", "local"])
+        self.assertNotIn("url:", pubspec.text())
+        # Only the dependencies section: the override of http stays
+        self.assertEqual(pubspec.sections_of("http"), ["dependency_overrides"])
+
+    def test_replaces_other_source_in_place(self):
+        pubspec = Pubspec(PUBSPEC)
+        pubspec.set_path_dependencies([("git_dep", "../git_dep")])
+        lines = pubspec.text().splitlines()
+        at = lines.index("  git_dep:")
+        self.assertEqual(lines[at + 1], "    path: ../git_dep")
+        self.assertEqual(lines[at + 2], "  local: {path: ../local}")
+
+    def test_creates_missing_section(self):
+        pubspec = Pubspec("name: app\n")
+        pubspec.set_path_dependencies([("x_plugin", "../x")], "dependency_overrides")
+        self.assertEqual(pubspec.text(), "name: app\n\ndependency_overrides:\n  x_plugin:\n    path: ../x\n")
+
+    def test_flow_style_section_is_refused(self):
+        with self.assertRaises(PubspecError):
+            Pubspec("name: app\ndependencies: {http: any}\n").set_path_dependencies([("x", "../x")])
+
+    def test_relative_path(self):
+        self.assertEqual(relative_dependency_path("/w/STRUTTER/x_plugin", "/w/app"), "../STRUTTER/x_plugin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+
+from strutter import signing
+
+
+class ScanArtifactsTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+
+    def path(self, *parts):
+        return os.path.join(self.dir, *parts)
+
+    def test_missing_and_empty_paths_are_errors(self):
+        os.mkdir(self.path("empty"))
+        results = signing.scan_artifacts([self.path("missing.apk"), self.path("empty")])
+        self.assertEqual(results, [
+            {"path": self.path("missing.apk"), "error": "No such file or directory"},
+            {"path": self.path("empty"), "error": "No .apk/.aab files found"},
+        ])
+
+    def test_folder_is_scanned_in_order(self):
+        os.makedirs(self.path("out", "b"))
+        for name in ("out/b/app.aab", "out/a.apk", "out/notes.txt"):
+            with zipfile.ZipFile(self.path(*name.split("/")), "w") as z:
+                z.writestr("AndroidManifest.xml", b"")
+        results = signing.scan_artifacts([self.path("out")])
+        self.assertEqual([r["path"] for r in results], [self.path("out", "a.apk"), self.path("out", "b", "app.aab")])
+        # Unsigned archives are reported, not skipped
+        self.assertTrue(all("error" in r for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
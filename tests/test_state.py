@@ -0,0 +1,122 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from strutter import state
+
+
+class StateTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.db_path = os.path.join(self.dir, state.STATE_FILE)
+
+    def store(self):
+        store = state.StateStore(self.db_path)
+        self.addCleanup(store.close)
+        return store
+
+    def test_fresh_store_has_no_config(self):
+        self.assertIsNone(self.store().config())
+
+    def test_imports_legacy_json_once(self):
+        legacy = {
+            "tool": "Strutter v0.1",
+            "selected_plugins": {"frida": True, "root": True, "integrity": False},
+            "plugins": {"frida": "a" * 33, "root": "b" * 33},
+            "flutter_project": os.path.join(self.dir, "App"),
+        }
+        with open(os.path.join(self.dir, state.LEGACY_CONFIG_FILE), "w") as f:
+            json.dump(legacy, f)
+        store = self.store()
+        config = store.config()
+        # Old configs generated their plugins next to the config file
+        self.assertEqual(config, dict(legacy, plugins_dir=self.dir))
+        self.assertEqual(store.projects(), [legacy["flutter_project"]])
+        # Only a new database imports it: later edits to the JSON are ignored
+        with open(os.path.join(self.dir, state.LEGACY_CONFIG_FILE), "w") as f:
+            json.dump(dict(legacy, plugins={}), f)
+        store.close()
+        self.assertEqual(self.store().config()["plugins"], legacy["plugins"])
+
+    def test_unreadable_legacy_json_is_skipped(self):
+        with open(os.path.join(self.dir, state.LEGACY_CONFIG_FILE), "w") as f:
+            f.write("{not json")
+        self.assertIsNone(self.store().config())
+
+    def test_save_config_round_trip(self):
+        store = self.store()
+        config = {
+            "tool": "Strutter v0.1",
+            "selected_plugins": {"root": True},
+            "plugins": {"root": "c" * 33, "guard": "d" * 33},
+            "plugins_dir": self.dir,
+            "identity": {"app_id": "com.example.app", "rotation": 2},
+            "check_budgets": {"default": 700},
+            "flutter_project": os.path.join(self.dir, "App"),
+        }
+        store.save_config(config)
+        self.assertEqual(store.config(), config)
+
+    def test_save_config_drops_removed_settings(self):
+        store = self.store()
+        config = {"tool": "t", "selected_plugins": {}, "plugins": {"root": "c" * 33, "frida": "e" * 33},
+                  "plugins_dir": self.dir, "identity": {"app_id": "x", "rotation": 0},
+                  "check_budgets": {"root.rootViaShell": 3000}}
+        store.save_config(config)
+        del config["check_budgets"], config["identity"]
+        del config["plugins"]["frida"]
+        store.save_config(config)
+        saved = store.config()
+        self.assertNotIn("check_budgets", saved)
+        self.assertNotIn("identity", saved)
+        self.assertEqual(saved["plugins"], {"root": "c" * 33})
+
+    def test_current_project_keeps_others(self):
+        store = self.store()
+        base = {"tool": "t", "selected_plugins": {}, "plugins": {}}
+        for name in ("A", "B"):
+            store.save_config(dict(base, flutter_project=os.path.join(self.dir, name)))
+        self.assertEqual(store.config()["flutter_project"], os.path.join(self.dir, "B"))
+        self.assertEqual(store.projects(), [os.path.join(self.dir, "A"), os.path.join(self.dir, "B")])
+
+    def test_steps_and_file_hashes(self):
+        store = self.store()
+        project = os.path.join(self.dir, "App")
+        pubspec = os.path.join(project, "pubspec.yaml")
+        store.record_step(project, "dependencies", True, "ok", [{"path": pubspec, "sha256": "00" * 32}])
+        store.record_step(project, "dependencies", False, "failed")
+        status = store.step_status(project)
+        self.assertEqual((status["dependencies"]["ok"], status["dependencies"]["message"]), (False, "failed"))
+        self.assertEqual(store.file_hashes(project), {pubspec: "00" * 32})
+
+    def test_migrations_recorded(self):
+        store = self.store()
+        version = store._connect().execute("PRAGMA user_version").fetchone()[0]
+        self.assertEqual(version, len(state.MIGRATIONS))
+        store.close()
+        # Reopening an up-to-date database runs nothing again
+        self.assertIsNone(self.store().config())
+
+    def test_parallel_writers(self):
+        store = self.store()
+        project = os.path.join(self.dir, "App")
+
+        def write(i):
+            for n in range(20):
+                store.record_step(project, f"step{i}", True, str(n))
+            store.close()
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(store.step_status(project)), [f"step{i}" for i in range(4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
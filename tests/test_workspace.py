@@ -0,0 +1,68 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from strutter import cli, workspace
+from strutter.core import save_config
+
+APP_PUBSPEC = "name: {}\n\ndependencies:\n  flutter:\n    sdk: flutter\n"
+PLUGIN_PUBSPEC = APP_PUBSPEC + "\nflutter:\n  plugin:\n    platforms:\n      android:\n        pluginClass: Plugin\n"
+
+
+class ScanTest(unittest.TestCase):
+    """A monorepo with the STRUTTER folder next to the apps."""
+
+    def setUp(self):
+        self.root = os.path.realpath(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.root)
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        for app in ("apps/a1", "apps/a2", "other"):
+            self.app(app)
+        self.package("plug", PLUGIN_PUBSPEC)
+        self.app("plug/example")
+        # A generated plugin and its flutter-create example app
+        self.package("STRUTTER/k0123456789abcdef0123456789abcdef_plugin", PLUGIN_PUBSPEC)
+        self.app("STRUTTER/k0123456789abcdef0123456789abcdef_plugin/example")
+        self.config = os.path.join(self.root, "STRUTTER", "hardening_config.json")
+        save_config({"plugins": {}, "plugins_dir": os.path.join(self.root, "STRUTTER")}, self.config)
+
+    def package(self, rel, pubspec):
+        path = os.path.join(self.root, rel)
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "pubspec.yaml"), "w") as f:
+            f.write(pubspec.format(os.path.basename(path)))
+        return path
+
+    def app(self, rel):
+        path = self.package(rel, APP_PUBSPEC)
+        os.makedirs(os.path.join(path, "android", "app"))
+        open(os.path.join(path, "android", "app", "build.gradle"), "w").close()
+
+    def apps(self, exclude):
+        found = workspace.scan_workspace(self.root, exclude=exclude)
+        return sorted(os.path.relpath(path, self.root) for path in workspace.android_apps(found))
+
+    def test_skips_plugin_example_apps(self):
+        self.assertEqual(self.apps(()), [os.path.join("apps", "a1"), os.path.join("apps", "a2"), "other"])
+
+    def test_run_from_inside_the_workspace(self):
+        os.chdir(os.path.join(self.root, "apps"))
+        exclude = cli.plugin_dirs(self.config)
+        self.assertEqual(exclude, [os.path.join(self.root, "STRUTTER")])
+        self.assertEqual(self.apps(exclude), [os.path.join("apps", "a1"), os.path.join("apps", "a2"), "other"])
+
+    def test_without_config(self):
+        os.chdir(os.path.join(self.root, "apps"))
+        self.assertEqual(cli.plugin_dirs(os.path.join(self.root, "missing.json")), [])
+
+    def test_classifies_plugins(self):
+        kinds = {os.path.relpath(p["path"], self.root): p["kind"]
+                 for p in workspace.scan_workspace(self.root, exclude=cli.plugin_dirs(self.config))}
+        self.assertEqual(kinds["plug"], workspace.KIND_PLUGIN)
+        self.assertNotIn(os.path.join("plug", "example"), kinds)
+
+
+if __name__ == "__main__":
+    unittest.main()